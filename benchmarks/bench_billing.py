@@ -0,0 +1,43 @@
+"""
+Monthly billing run over generated visit history
+"""
+
+import datetime
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from daycare_billing import compute_invoices, month_bounds
+from dog_daycare_management_system import Daycare, LargeDog, Owner, SmallDog, Visit
+
+
+def main(dogs=100000, visits_per_dog=20, dogs_per_owner=2):
+    random.seed(0)
+    daycare = Daycare("Bench Daycare", "1 Bench St")
+    daycare.add_dogs(LargeDog(f"D{i:07d}", "Dog", "Mixed", 3, 60.0, False, "High") if i % 3 == 0 else
+                     SmallDog(f"D{i:07d}", "Dog", "Mixed", 3, 12.0) for i in range(dogs))
+    daycare.add_owners(Owner(f"O{i:07d}", "Owner", "owner@example.com", "555-000-0000",
+                             [f"D{j:07d}" for j in range(i, min(i + dogs_per_owner, dogs))])
+                       for i in range(0, dogs, dogs_per_owner))
+
+    start, end = month_bounds(2024, 3)
+    visits = []
+    for i in range(dogs):
+        dog_id = f"D{i:07d}"
+        owner_id = f"O{i - i % dogs_per_owner:07d}"
+        for day in random.sample(range(31), visits_per_dog):
+            opened = start + datetime.timedelta(days=day, hours=7)
+            visits.append(Visit(dog_id, opened, owner_id, opened + datetime.timedelta(hours=random.choice((4, 9)))))
+
+    began = time.perf_counter()
+    invoices = compute_invoices(daycare, start, end, visits=visits)
+    elapsed = time.perf_counter() - began
+    print(f"{len(visits):,} visits -> {len(invoices):,} invoices in {elapsed:.2f}s "
+          f"({len(visits) / elapsed:,.0f} visits/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,35 @@
+"""
+Bulk check-in/check-out throughput
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dog_daycare_management_system import Dog, Owner, Daycare
+
+
+def main(dogs=200000, dogs_per_owner=4):
+    daycare = Daycare("Bench Daycare", "1 Bench St")
+    pairs = []
+    for i in range(0, dogs, dogs_per_owner):
+        owner = Owner(f"O{i:07d}", "Owner", "owner@example.com", "555-000-0000")
+        for j in range(i, min(i + dogs_per_owner, dogs)):
+            dog = Dog(f"D{j:07d}", f"Dog {j}", "Mixed Breed", 3, 25.0)
+            daycare.add_dog(dog)
+            owner.register_dog(dog)
+            pairs.append((dog.dog_id, owner.owner_id))
+        daycare.add_owner(owner)
+
+    for label, method in (("check_in_many", daycare.check_in_many), ("check_out_many", daycare.check_out_many)):
+        start = time.perf_counter()
+        results = method(pairs)
+        elapsed = time.perf_counter() - start
+        assert not any(results)
+        print(f"{label:>15}: {len(pairs) / elapsed:,.0f} transitions/s")
+
+
+if __name__ == "__main__":
+    main()
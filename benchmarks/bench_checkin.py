@@ -0,0 +1,45 @@
+"""
+Check-in cost as an owner's registered dog count grows
+"""
+
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dog_daycare_management_system import Dog, Owner, Daycare
+
+
+def build_daycare(dogs_per_owner):
+    daycare = Daycare("Bench Daycare", "1 Bench St")
+    owner = Owner("O001", "Corporate Kennel", "kennel@example.com", "555-000-0000")
+    for i in range(dogs_per_owner):
+        dog = Dog(f"D{i:07d}", f"Dog {i}", "Mixed Breed", 3, 25.0)
+        daycare.add_dog(dog)
+        owner.register_dog(dog)
+    daycare.add_owner(owner)
+    return daycare
+
+
+def bench(dogs_per_owner, rounds=20000):
+    daycare = build_daycare(dogs_per_owner)
+    # Worst case for the old list scan: the most recently registered dog
+    dog_id = f"D{dogs_per_owner - 1:07d}"
+
+    def cycle():
+        daycare.check_in_dog(dog_id, "O001")
+        daycare.check_out_dog(dog_id, "O001")
+
+    seconds = min(timeit.repeat(cycle, number=rounds, repeat=3))
+    return seconds / (rounds * 2) * 1e6
+
+
+def main():
+    print(f"{'dogs/owner':>10} | {'us per check-in/out':>20}")
+    for size in (10, 100, 1000, 10000, 100000):
+        print(f"{size:>10} | {bench(size):>20.3f}")
+
+
+if __name__ == "__main__":
+    main()
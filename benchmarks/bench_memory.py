@@ -0,0 +1,65 @@
+"""
+Bytes per dog record: slotted classes vs the previous __dict__ layout
+"""
+
+import gc
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dog_daycare_management_system import LargeDog, SmallDog
+
+
+class DictDog:
+    # Attribute layout of Dog before __slots__: one instance __dict__ per object
+    def __init__(self, dog_id, name, breed, age, weight, is_checked_in=False):
+        self.__dog_id = dog_id
+        self.__name = name
+        self.__breed = breed
+        self.__age = age
+        self.__weight = weight
+        self.__is_checked_in = is_checked_in
+        self.__status_listeners = ()
+
+
+class DictSmallDog(DictDog):
+    def __init__(self, dog_id, name, breed, age, weight, is_checked_in=False, toy_preference="None"):
+        super().__init__(dog_id, name, breed, age, weight, is_checked_in)
+        self.__toy_preference = toy_preference
+
+
+class DictLargeDog(DictDog):
+    def __init__(self, dog_id, name, breed, age, weight, is_checked_in=False, exercise_needs="Medium"):
+        super().__init__(dog_id, name, breed, age, weight, is_checked_in)
+        self.__exercise_needs = exercise_needs
+
+
+def measure(small_class, large_class, count):
+    # IDs and names are built up front so only the objects themselves are measured
+    ids = [f"D{i:07d}" for i in range(count)]
+    names = [f"Dog {i}" for i in range(count)]
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    dogs = [small_class(ids[i], names[i], "Beagle", 3, 20.5, False, "Balls") if i % 2 else
+            large_class(ids[i], names[i], "Labrador", 5, 70.0, False, "High")
+            for i in range(count)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del dogs
+    return (after - before) / count
+
+
+def main():
+    counts = [int(arg) for arg in sys.argv[1:]] or [10 ** 5, 10 ** 6]
+    print(f"{'records':>10} | {'__dict__ B/dog':>14} | {'__slots__ B/dog':>15}")
+    for count in counts:
+        legacy = measure(DictSmallDog, DictLargeDog, count)
+        slotted = measure(SmallDog, LargeDog, count)
+        print(f"{count:>10} | {legacy:>14.1f} | {slotted:>15.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""
+Sharded check-in and search throughput by shard count
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from daycare_shards import ShardedDaycare
+from dog_daycare_management_system import Dog, Owner
+
+
+def run(shards, dogs, dogs_per_owner=4, searches=200):
+    with ShardedDaycare("Bench Daycare", "1 Bench St", shards=shards) as daycare:
+        pairs = []
+        owners = []
+        batch = []
+        for i in range(0, dogs, dogs_per_owner):
+            owner = Owner(f"O{i:07d}", "Owner", "owner@example.com", "555-000-0000")
+            for j in range(i, min(i + dogs_per_owner, dogs)):
+                dog = Dog(f"D{j:07d}", f"Dog {j}", "Mixed Breed", 3, 25.0)
+                batch.append(dog)
+                owner.register_dog(dog)
+                pairs.append((dog.dog_id, owner.owner_id))
+            owners.append(owner)
+        daycare.add_dogs(batch)
+        daycare.add_owners(owners)
+
+        start = time.perf_counter()
+        daycare.check_in_many(pairs)
+        daycare.check_out_many(pairs)
+        transitions = 2 * len(pairs) / (time.perf_counter() - start)
+
+        start = time.perf_counter()
+        for i in range(searches):
+            daycare.search_dog_by_name(f"dog {i:04d}9")
+        queries = searches / (time.perf_counter() - start)
+    return transitions, queries
+
+
+def main():
+    dogs = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    print(f"cores: {os.cpu_count()}")
+    print(f"{'shards':>6} | {'transitions/s':>13} | {'searches/s':>10}")
+    for shards in (1, 2, 4, 8):
+        transitions, queries = run(shards, dogs)
+        print(f"{shards:>6} | {transitions:>13,.0f} | {queries:>10,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""
+Dog Daycare Management System - billing over visit history
+"""
+
+import datetime
+from array import array
+
+from dog_daycare_management_system import LargeDog
+
+HALF_DAY_RATE = 25.0
+FULL_DAY_RATE = 40.0
+HALF_DAY_HOURS = 5.0
+# Per billed day for LargeDog by exercise needs; half days pay half
+EXERCISE_SURCHARGES = {"Low": 0.0, "Medium": 5.0, "High": 10.0}
+# (minimum registered dogs, discount), largest threshold first
+MULTI_DOG_DISCOUNTS = ((3, 0.15), (2, 0.10))
+
+
+class Rates:
+    def __init__(self, half_day=HALF_DAY_RATE, full_day=FULL_DAY_RATE, half_day_hours=HALF_DAY_HOURS,
+                 surcharges=None, discounts=MULTI_DOG_DISCOUNTS):
+        self.half_day = half_day
+        self.full_day = full_day
+        self.half_day_hours = half_day_hours
+        self.surcharges = dict(EXERCISE_SURCHARGES if surcharges is None else surcharges)
+        self.discounts = tuple(sorted(discounts, reverse=True))
+
+    def surcharge_for(self, dog):
+        if isinstance(dog, LargeDog):
+            return self.surcharges.get(dog.exercise_needs, 0.0)
+        return 0.0
+
+    def discount_for(self, dog_total):
+        for minimum, discount in self.discounts:
+            if dog_total >= minimum: return discount
+        return 0.0
+
+
+class Invoice:
+    def __init__(self, owner_id, discount_rate=0.0):
+        self.owner_id = owner_id
+        self.discount_rate = discount_rate
+        self.visits = 0
+        self.half_days = 0
+        self.full_days = 0
+        self.base = 0.0
+        self.surcharge = 0.0
+
+    @property
+    def subtotal(self): return self.base + self.surcharge
+
+    @property
+    def discount(self): return round(self.subtotal * self.discount_rate, 2)
+
+    @property
+    def total(self): return round(self.subtotal - self.discount, 2)
+
+    def display_info(self):
+        return (f"{self.owner_id} | {self.visits} visits | {self.full_days} full / {self.half_days} half days | "
+                f"Subtotal: ${self.subtotal:.2f} | Discount: ${self.discount:.2f} | Total: ${self.total:.2f}")
+
+
+def month_bounds(year, month):
+    return datetime.datetime(year, month, 1), datetime.datetime(year + month // 12, month % 12 + 1, 1)
+
+
+def visit_columns(visits, start, end):
+    # Closed visits starting in [start, end) as parallel columns
+    dog_ids = []
+    owner_ids = []
+    hours = array('d')
+    for visit in visits:
+        if visit.end is None or not start <= visit.start < end: continue
+        dog_ids.append(visit.dog_id)
+        owner_ids.append(visit.owner_id)
+        hours.append((visit.end - visit.start).total_seconds() / 3600)
+    return dog_ids, owner_ids, hours
+
+
+def compute_invoices(daycare, start, end, rates=None, visits=None):
+    rates = rates or Rates()
+    if visits is None:
+        visits = daycare.visits_overlapping(start, end)
+    dog_ids, owner_ids, hours = visit_columns(visits, start, end)
+
+    # Join indexes, built once per run: per-dog surcharge and fallback payer
+    # (first registered owner) and per-owner discount
+    dogs = daycare.dogs
+    owners = daycare.owners
+    surcharges = {}
+    payers = {}
+    for dog_id in set(dog_ids):
+        dog = dogs.get(dog_id)
+        surcharges[dog_id] = rates.surcharge_for(dog) if dog is not None else 0.0
+    for owner_id, owner in owners.items():
+        for dog_id in owner.iter_dogs():
+            if dog_id in surcharges:
+                payers.setdefault(dog_id, owner_id)
+
+    invoices = {}
+    half_day_hours = rates.half_day_hours
+    half_day = rates.half_day
+    full_day = rates.full_day
+    for dog_id, owner_id, duration in zip(dog_ids, owner_ids, hours):
+        if owner_id is None or owner_id not in owners:
+            owner_id = payers.get(dog_id)
+            if owner_id is None: continue
+
+        invoice = invoices.get(owner_id)
+        if invoice is None:
+            invoice = invoices[owner_id] = Invoice(owner_id, rates.discount_for(len(owners[owner_id].dogs_registered)))
+
+        # Whole days bill as full days; the remainder is a half or full day
+        days, remainder = divmod(duration, 24)
+        full = int(days)
+        half = 0
+        if remainder > half_day_hours:
+            full += 1
+        elif remainder > 0:
+            half = 1
+        invoice.visits += 1
+        invoice.full_days += full
+        invoice.half_days += half
+        invoice.base += full * full_day + half * half_day
+        invoice.surcharge += (full + 0.5 * half) * surcharges[dog_id]
+    return invoices
+
+
+def monthly_invoices(daycare, year, month, rates=None):
+    start, end = month_bounds(year, month)
+    return compute_invoices(daycare, start, end, rates)
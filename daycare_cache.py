@@ -0,0 +1,52 @@
+"""
+Dog Daycare Management System - version-stamped LRU result cache
+"""
+
+import threading
+from collections import OrderedDict
+
+
+class LRUCache:
+    def __init__(self, max_size=1024):
+        # Entries are (version, value); an entry whose version no longer
+        # matches the caller's is stale and counts as a miss
+        self.__entries = OrderedDict()
+        self.__max_size = max_size
+        self.__lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self): return len(self.__entries)
+
+    @property
+    def max_size(self): return self.__max_size
+
+    def get(self, key, version):
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is None or entry[0] != version:
+                self.misses += 1
+                return None
+            self.__entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key, version, value):
+        if self.__max_size <= 0: return
+        with self.__lock:
+            self.__entries[key] = (version, value)
+            self.__entries.move_to_end(key)
+            if len(self.__entries) > self.__max_size:
+                self.__entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self.__lock:
+            self.__entries.clear()
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions,
+                "size": len(self.__entries), "max_size": self.__max_size,
+                "hit_rate": self.hits / lookups if lookups else 0.0}
@@ -0,0 +1,144 @@
+"""
+Dog Daycare Management System - multi-location DaycareChain
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from dog_daycare_management_system import DOG_ADDED, DOG_CHECKED_IN
+
+
+class DaycareChain:
+    def __init__(self, name, max_workers=8):
+        self.__name = name
+        self.__locations = {}
+        self.__listeners = {}
+        # Global dog ID -> location name index and the checked-in dog IDs per
+        # location, both maintained from location events. Events are applied
+        # as set updates, so one seen twice (e.g. racing add_location's
+        # initial read) changes nothing
+        self.__dog_locations = {}
+        self.__present = {}
+        self.__checked_in = 0
+        self.__lock = threading.Lock()
+        self.__max_workers = max_workers
+        self.__executor = None
+
+    @property
+    def name(self): return self.__name
+
+    @property
+    def locations(self): return dict(self.__locations)
+
+    @property
+    def num_locations(self): return len(self.__locations)
+
+    @property
+    def num_dogs(self): return len(self.__dog_locations)
+
+    def add_location(self, daycare):
+        if daycare.name in self.__locations:
+            print(f"Location '{daycare.name}' already exists")
+            return False
+
+        location = daycare.name
+        listener = self.__location_listener(location)
+        with self.__lock:
+            self.__locations[location] = daycare
+            self.__listeners[location] = listener
+            self.__present[location] = set()
+        # Listening starts before the initial read so no event falls between
+        daycare.add_listener(listener)
+        with self.__lock:
+            for dog_id in daycare.dogs:
+                self.__dog_locations.setdefault(dog_id, location)
+            self.__update_present(location, daycare.get_checked_in_dogs(), True)
+        return True
+
+    def remove_location(self, name):
+        daycare = self.__locations.get(name)
+        if daycare is None: return False
+
+        daycare.remove_listener(self.__listeners.pop(name))
+        with self.__lock:
+            del self.__locations[name]
+            for dog_id in daycare.dogs:
+                if self.__dog_locations.get(dog_id) == name:
+                    del self.__dog_locations[dog_id]
+            self.__checked_in -= len(self.__present.pop(name))
+        return True
+
+    def __location_listener(self, location):
+        def listener(event, dog):
+            with self.__lock:
+                if event == DOG_ADDED:
+                    self.__dog_locations.setdefault(dog.dog_id, location)
+                    return
+                self.__update_present(location, (dog.dog_id,), event == DOG_CHECKED_IN)
+        return listener
+
+    def __update_present(self, location, dog_ids, checked_in):
+        present = self.__present.get(location)
+        if present is None: return
+
+        before = len(present)
+        if checked_in:
+            present.update(dog_ids)
+        else:
+            present.difference_update(dog_ids)
+        self.__checked_in += len(present) - before
+
+    def get_location(self, name):
+        return self.__locations.get(name)
+
+    def locate_dog(self, dog_id):
+        location = self.__dog_locations.get(dog_id)
+        return self.__locations[location] if location is not None else None
+
+    def get_dog(self, dog_id):
+        daycare = self.locate_dog(dog_id)
+        return daycare.get_dog(dog_id) if daycare is not None else None
+
+    def get_checked_in_count(self):
+        return self.__checked_in
+
+    def get_occupancy(self):
+        with self.__lock:
+            return {location: len(present) for location, present in self.__present.items()}
+
+    def __search(self, method, query):
+        # Fan out to every location on a shared pool; only locations with
+        # matches appear in the result
+        if self.__executor is None:
+            self.__executor = ThreadPoolExecutor(max_workers=self.__max_workers)
+        locations = list(self.__locations.items())
+        futures = [self.__executor.submit(getattr(daycare, method), query) for _, daycare in locations]
+        results = {}
+        for (location, _), future in zip(locations, futures):
+            matches = future.result()
+            if matches:
+                results[location] = matches
+        return results
+
+    def search_dog_by_name(self, name):
+        if name is None:
+            raise ValueError("Search name cannot be None")
+
+        return self.__search("search_dog_by_name", name)
+
+    def search_dog_by_breed(self, breed):
+        if breed is None:
+            raise ValueError("Search breed cannot be None")
+
+        return self.__search("search_dog_by_breed", breed)
+
+    def close(self):
+        if self.__executor is not None:
+            self.__executor.shutdown()
+            self.__executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -0,0 +1,189 @@
+"""
+Dog Daycare Management System - columnar dog store
+"""
+
+from array import array
+from collections import Counter
+from itertools import compress, repeat
+from operator import eq
+
+from daycare_indexes import text_of
+
+MAX_AGE = 2 ** 63 - 1
+
+
+class DogRow:
+    __slots__ = ("__columns", "__row")
+
+    def __init__(self, columns, row):
+        self.__columns = columns
+        self.__row = row
+
+    @property
+    def row(self): return self.__row
+
+    @property
+    def dog_id(self): return self.__columns.dog_ids[self.__row]
+
+    @property
+    def name(self): return self.__columns.names[self.__row]
+
+    @property
+    def breed(self): return self.__columns.breed_label(self.__columns.breed_ids[self.__row])
+
+    @property
+    def age(self): return self.__columns.ages[self.__row]
+
+    @property
+    def weight(self): return self.__columns.weights[self.__row]
+
+    @property
+    def type_code(self): return chr(self.__columns.type_codes[self.__row])
+
+    @property
+    def is_checked_in(self): return bool(self.__columns.checked_in[self.__row])
+
+    @property
+    def dog(self): return self.__columns.dog(self.__row)
+
+    def display_info(self):
+        # Columns drop subclass fields and coerce weights to float, so the
+        # line comes from the dog itself
+        return self.dog.display_info()
+
+
+class DogColumns:
+    def __init__(self):
+        # One entry per dog in every column, addressed by a dense row index
+        self.dog_ids = []
+        self.names = []
+        self.ages = array('q')
+        self.weights = array('d')
+        self.type_codes = bytearray()
+        self.checked_in = bytearray()
+        self.breed_ids = array('i')
+        self.__rows = {}
+        self.__dogs = []
+        # Dog class per type code, for subclass-aware dog_type filters
+        self.__types = {}
+        self.__breed_labels = []
+        self.__breed_lookup = {}
+
+    def __len__(self): return len(self.dog_ids)
+
+    def row_of(self, dog_id):
+        return self.__rows.get(dog_id)
+
+    def dog(self, row):
+        return self.__dogs[row]
+
+    def breed_label(self, breed_id):
+        return self.__breed_labels[breed_id]
+
+    def breed_id(self, breed):
+        return self.__breed_lookup.get(breed.lower())
+
+    def append(self, dog):
+        return self.__append(dog, self.__checked(dog))
+
+    def extend(self, dogs):
+        # The whole batch is checked before the first row is written
+        dogs = list(dogs)
+        checked = [self.__checked(dog) for dog in dogs]
+        for dog, values in zip(dogs, checked):
+            self.__append(dog, values)
+
+    def __checked(self, dog):
+        # Values are converted and checked before any column grows, so a dog
+        # that doesn't fit leaves every column the same length
+        if not 0 <= dog.age <= MAX_AGE:
+            raise ValueError(f"Age {dog.age} does not fit the ages column")
+        return float(dog.weight), ord(dog.type_code), text_of(dog.breed)
+
+    def __append(self, dog, values):
+        weight, type_code, breed = values
+        row = len(self.dog_ids)
+        self.__rows[dog.dog_id] = row
+        self.dog_ids.append(dog.dog_id)
+        self.__dogs.append(dog)
+        self.__types.setdefault(dog.type_code, type(dog))
+        self.names.append(dog.name)
+        self.ages.append(dog.age)
+        self.weights.append(weight)
+        self.type_codes.append(type_code)
+        self.checked_in.append(1 if dog.is_checked_in else 0)
+        self.breed_ids.append(self.__intern_breed(breed))
+        return row
+
+    def __intern_breed(self, breed):
+        key = breed.lower()
+        breed_id = self.__breed_lookup.get(key)
+        if breed_id is None:
+            breed_id = self.__breed_lookup[key] = len(self.__breed_labels)
+            self.__breed_labels.append(breed)
+        return breed_id
+
+    def set_checked_in(self, dog_id, value):
+        row = self.__rows.get(dog_id)
+        if row is not None:
+            self.checked_in[row] = 1 if value else 0
+
+    def view(self, row):
+        return DogRow(self, row)
+
+    def mask(self, dog_type=None, checked_in=None, breed=None):
+        # Selector of 0/1 bytes per row, built with C-level bytes operations
+        size = len(self.dog_ids)
+        selector = None
+        if dog_type is not None:
+            # Same expansion as Daycare.query().of_type(): subclasses match too
+            table = bytearray(256)
+            for type_code, cls in self.__types.items():
+                if issubclass(cls, dog_type):
+                    table[ord(type_code)] = 1
+            selector = self.type_codes.translate(table)
+        if checked_in is not None:
+            flags = self.checked_in if checked_in else self.checked_in.translate(bytes([1, 0]) + bytes(254))
+            selector = flags if selector is None else _and(selector, flags)
+        if breed is not None:
+            breed_id = self.breed_id(breed)
+            matches = bytes(size) if breed_id is None else bytes(map(eq, self.breed_ids, repeat(breed_id)))
+            selector = matches if selector is None else _and(selector, matches)
+        return b'\x01' * size if selector is None else bytes(selector)
+
+    def count(self, **filters):
+        return self.mask(**filters).count(1)
+
+    def sum_weight(self, **filters):
+        return sum(compress(self.weights, self.mask(**filters)))
+
+    def mean_weight(self, **filters):
+        selector = self.mask(**filters)
+        total = selector.count(1)
+        return sum(compress(self.weights, selector)) / total if total else 0.0
+
+    def mean_age(self, **filters):
+        selector = self.mask(**filters)
+        total = selector.count(1)
+        return sum(compress(self.ages, selector)) / total if total else 0.0
+
+    def age_distribution_by_breed(self, **filters):
+        selector = self.mask(**filters)
+        counts = Counter(zip(compress(self.breed_ids, selector), compress(self.ages, selector)))
+        distribution = {}
+        for (breed_id, age), total in sorted(counts.items()):
+            distribution.setdefault(self.__breed_labels[breed_id], {})[age] = total
+        return distribution
+
+    def filter_rows(self, **filters):
+        return list(compress(range(len(self.dog_ids)), self.mask(**filters)))
+
+    def filter_views(self, **filters):
+        return [DogRow(self, row) for row in self.filter_rows(**filters)]
+
+
+def _and(left, right):
+    # Bitwise AND of two equal-length 0/1 byte strings in one big-int operation
+    size = len(left)
+    value = int.from_bytes(left, "little") & int.from_bytes(right, "little")
+    return value.to_bytes(size, "little")
@@ -0,0 +1,239 @@
+"""
+Dog Daycare Management System - streaming CSV/JSONL import
+"""
+
+import csv
+import json
+import math
+import os
+import sys
+import time
+from itertools import islice
+
+from dog_daycare_management_system import DOG_TYPES, Daycare, Owner
+
+TYPE_ALIASES = {"": "D", "DOG": "D", "SMALL": "S", "SMALLDOG": "S", "LARGE": "L", "LARGEDOG": "L"}
+TRUE_VALUES = {"1", "true", "yes", "y"}
+FALSE_VALUES = {"", "0", "false", "no", "n"}
+
+
+class ImportReport:
+    def __init__(self, kind):
+        self.kind = kind
+        self.loaded = 0
+        self.rejected = []
+        self.elapsed = 0.0
+
+    @property
+    def total_rows(self): return self.loaded + len(self.rejected)
+
+    @property
+    def rows_per_second(self):
+        return self.total_rows / self.elapsed if self.elapsed > 0 else 0.0
+
+    def reject(self, row_number, reason):
+        self.rejected.append((row_number, reason))
+
+    def summary(self):
+        return (f"{self.kind}: {self.loaded} loaded, {len(self.rejected)} rejected "
+                f"in {self.elapsed:.2f}s ({self.rows_per_second:,.0f} rows/s)")
+
+
+def read_records(path):
+    # Yields (row_number, record); record is None for lines that cannot be parsed
+    extension = os.path.splitext(path)[1].lower()
+    with open(path, newline="", encoding="utf-8") as handle:
+        if extension == ".csv":
+            for row_number, record in enumerate(csv.DictReader(handle), 2):
+                yield row_number, record
+        elif extension in (".jsonl", ".ndjson"):
+            for row_number, line in enumerate(handle, 1):
+                if not line.strip(): continue
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    record = None
+                yield row_number, record if isinstance(record, dict) else None
+        else:
+            raise ValueError(f"Unsupported import format: {extension or path}")
+
+
+def iter_records(source):
+    if isinstance(source, (str, os.PathLike)):
+        return read_records(os.fspath(source))
+    return enumerate(source, 1)
+
+
+def chunked(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk: return
+        yield chunk
+
+
+def _field(record, name, default=""):
+    value = record.get(name)
+    if value is None: return default
+    return value.strip() if isinstance(value, str) else value
+
+
+def _as_text(value, label):
+    # JSONL rows may carry numbers where text is expected; anything else is rejected
+    if isinstance(value, str): return value
+    if isinstance(value, (int, float)) and not isinstance(value, bool): return str(value)
+    raise ValueError(f"{label} must be text")
+
+
+def _as_int(value, label):
+    if isinstance(value, int) and not isinstance(value, bool): return value
+    if isinstance(value, str):
+        try:
+            return int(value)
+        except ValueError:
+            pass
+    raise ValueError(f"{label} must be an integer")
+
+
+def _as_float(value, label):
+    # NaN slips past Dog's weight check and infinity breaks weight totals
+    if isinstance(value, (int, float, str)) and not isinstance(value, bool):
+        try:
+            number = float(value)
+        except (ValueError, OverflowError):
+            pass
+        else:
+            if math.isfinite(number): return number
+    raise ValueError(f"{label} must be a number")
+
+
+def _as_bool(value):
+    if isinstance(value, bool): return value
+    text = str(value).strip().lower()
+    if text in TRUE_VALUES: return True
+    if text in FALSE_VALUES: return False
+    raise ValueError(f"Invalid checked-in flag: {value}")
+
+
+def parse_dog(record):
+    dog_id = _as_text(_field(record, "dog_id"), "dog_id")
+    if not dog_id:
+        raise ValueError("Missing dog_id")
+
+    type_code = str(_field(record, "type")).upper()
+    type_code = TYPE_ALIASES.get(type_code, type_code)
+    dog_class = DOG_TYPES.get(type_code)
+    if dog_class is None:
+        raise ValueError(f"Unknown dog type: {_field(record, 'type')}")
+
+    args = (dog_id, _as_text(_field(record, "name"), "Name"), _as_text(_field(record, "breed"), "Breed"),
+            _as_int(_field(record, "age"), "Age"), _as_float(_field(record, "weight"), "Weight"),
+            _as_bool(_field(record, "checked_in", False)))
+    if type_code == "S":
+        return dog_class(*args, _as_text(_field(record, "toy_preference", "None"), "Toy preference") or "None")
+    if type_code == "L":
+        return dog_class(*args, _as_text(_field(record, "exercise_needs", "Medium"), "Exercise needs") or "Medium")
+    return dog_class(*args)
+
+
+def parse_owner(record):
+    # Same text coercion as the owner_id column of dog rows, so the two link up
+    owner_id = _as_text(_field(record, "owner_id"), "owner_id")
+    if not owner_id:
+        raise ValueError("Missing owner_id")
+
+    return Owner(owner_id, _as_text(_field(record, "name"), "Name"), _as_text(_field(record, "email"), "Email"),
+                 _as_text(_field(record, "phone"), "Phone"))
+
+
+def import_owners(daycare, source, chunk_size=10000):
+    report = ImportReport("owners")
+    start = time.perf_counter()
+
+    for chunk in chunked(iter_records(source), chunk_size):
+        owners = []
+        seen = set()
+        for row_number, record in chunk:
+            if record is None:
+                report.reject(row_number, "Malformed record")
+                continue
+            try:
+                owner = parse_owner(record)
+            except ValueError as e:
+                report.reject(row_number, str(e))
+                continue
+            if owner.owner_id in seen or daycare.get_owner(owner.owner_id) is not None:
+                report.reject(row_number, f"Duplicate owner ID {owner.owner_id}")
+                continue
+            seen.add(owner.owner_id)
+            owners.append(owner)
+
+        report.loaded += daycare.add_owners(owners)
+
+    report.elapsed = time.perf_counter() - start
+    return report
+
+
+def import_dogs(daycare, source, chunk_size=10000):
+    # Dogs naming an owner_id are registered to that owner, so load owners first
+    report = ImportReport("dogs")
+    start = time.perf_counter()
+
+    for chunk in chunked(iter_records(source), chunk_size):
+        dogs = []
+        links = []
+        seen = set()
+        for row_number, record in chunk:
+            if record is None:
+                report.reject(row_number, "Malformed record")
+                continue
+            try:
+                dog = parse_dog(record)
+                owner_id = _as_text(_field(record, "owner_id"), "owner_id")
+            except ValueError as e:
+                report.reject(row_number, str(e))
+                continue
+            if dog.dog_id in seen or daycare.get_dog(dog.dog_id) is not None:
+                report.reject(row_number, f"Duplicate dog ID {dog.dog_id}")
+                continue
+
+            if owner_id:
+                owner = daycare.get_owner(owner_id)
+                if owner is None:
+                    report.reject(row_number, f"Owner with ID {owner_id} not found")
+                    continue
+                links.append((owner, dog))
+
+            seen.add(dog.dog_id)
+            dogs.append(dog)
+
+        report.loaded += daycare.add_dogs(dogs)
+        for owner, dog in links:
+            if not owner.has_dog(dog.dog_id):
+                owner.register_dog(dog)
+
+    report.elapsed = time.perf_counter() - start
+    return report
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if not 1 <= len(argv) <= 2:
+        print("Usage: python daycare_import.py DOGS_FILE [OWNERS_FILE]")
+        return 1
+
+    daycare = Daycare("Paws & Play", "456 Park Ave, Dogtown")
+    reports = []
+    if len(argv) == 2:
+        reports.append(import_owners(daycare, argv[1]))
+    reports.append(import_dogs(daycare, argv[0]))
+
+    for report in reports:
+        print(report.summary())
+        for row_number, reason in report.rejected[:10]:
+            print(f"  row {row_number}: {reason}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
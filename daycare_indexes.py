@@ -0,0 +1,556 @@
+"""
+Dog Daycare Management System - search indexes
+"""
+
+import random
+from bisect import bisect_left, bisect_right
+from collections import Counter
+from operator import itemgetter
+
+
+def normalize(text):
+    return text.lower()
+
+
+def text_of(value):
+    # Dogs accept any name or breed; None is indexed as empty text
+    return "" if value is None else str(value)
+
+
+def trigrams(text):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def padded_trigrams(text):
+    # Padding makes word starts and ends count, so short names still have grams
+    return trigrams(f"  {text} ")
+
+
+def levenshtein_matcher(pattern):
+    # Bit-parallel (Myers) edit distance from pattern to any text: one pass
+    # of integer operations per text character
+    size = len(pattern)
+    if size == 0: return len
+    masks = {}
+    for i, char in enumerate(pattern):
+        masks[char] = masks.get(char, 0) | (1 << i)
+    full = (1 << size) - 1
+    last = 1 << (size - 1)
+
+    def distance(text):
+        positive, negative, score = full, 0, size
+        for char in text:
+            match = masks.get(char, 0)
+            vertical = match | negative
+            horizontal = (((match & positive) + positive) ^ positive) | match
+            up = negative | ~(horizontal | positive)
+            down = positive & horizontal
+            if up & last:
+                score += 1
+            elif down & last:
+                score -= 1
+            up = (up << 1) | 1
+            down <<= 1
+            positive = (down | ~(vertical | up)) & full
+            negative = up & vertical & full
+        return score
+    return distance
+
+
+class TrigramIndex:
+    def __init__(self):
+        # Posting lists are dicts used as insertion-ordered sets of keys
+        self.__postings = {}
+        self.__texts = {}
+
+    def __len__(self): return len(self.__texts)
+
+    def add(self, key, text):
+        if key in self.__texts:
+            self.remove(key)
+
+        text = normalize(text)
+        self.__texts[key] = text
+        postings = self.__postings
+        for gram in trigrams(text):
+            posting = postings.get(gram)
+            if posting is None:
+                postings[gram] = {key: None}
+            else:
+                posting[key] = None
+
+    def update(self, pairs):
+        # Bulk add: each distinct text is split into trigrams once, and keys
+        # still go into the postings in the order given
+        texts = self.__texts
+        postings = self.__postings
+        grams_of = {}
+        for key, text in pairs:
+            if key in texts:
+                self.remove(key)
+            text = normalize(text)
+            texts[key] = text
+            grams = grams_of.get(text)
+            if grams is None:
+                grams = grams_of[text] = trigrams(text)
+            for gram in grams:
+                posting = postings.get(gram)
+                if posting is None:
+                    postings[gram] = {key: None}
+                else:
+                    posting[key] = None
+
+    def remove(self, key):
+        text = self.__texts.pop(key, None)
+        if text is None: return False
+
+        for gram in trigrams(text):
+            posting = self.__postings[gram]
+            del posting[key]
+            if not posting:
+                del self.__postings[gram]
+        return True
+
+    def estimate(self, query):
+        # Upper bound on matches: the rarest trigram's posting size
+        grams = trigrams(normalize(query))
+        if not grams: return len(self.__texts)
+        postings = self.__postings
+        return min(len(postings.get(gram, ())) for gram in grams)
+
+    def search(self, query):
+        query = normalize(query)
+        texts = self.__texts
+        grams = trigrams(query)
+
+        # Queries shorter than a trigram fall back to the cached normalized texts.
+        # Containers are snapshotted with tuple() (atomic under the GIL) so
+        # lock-free readers never iterate a dict a writer is growing
+        if not grams:
+            return [key for key, text in tuple(texts.items()) if query in text]
+
+        postings = []
+        for gram in grams:
+            posting = self.__postings.get(gram)
+            if not posting: return []
+            postings.append(posting)
+
+        postings.sort(key=len)
+        smallest, rest = postings[0], postings[1:]
+        # Sharing every trigram does not imply adjacency, so verify each candidate
+        return [key for key in tuple(smallest)
+                if all(key in posting for posting in rest) and query in texts[key]]
+
+
+class FuzzyIndex:
+    def __init__(self, candidate_limit=200):
+        # Padded-trigram postings over distinct normalized texts, split by
+        # text length; each text maps to the keys that share it
+        self.__texts = {}
+        self.__postings = {}
+        self.__candidate_limit = candidate_limit
+
+    def __len__(self): return len(self.__texts)
+
+    def add(self, key, text):
+        text = normalize(text)
+        keys = self.__texts.get(text)
+        if keys is None:
+            keys = self.__texts[text] = {}
+            size = len(text)
+            for gram in padded_trigrams(text):
+                self.__postings.setdefault(gram, {}).setdefault(size, {})[text] = None
+        keys[key] = None
+
+    def update(self, pairs):
+        add = self.add
+        for key, text in pairs:
+            add(key, text)
+
+    def remove(self, key, text):
+        text = normalize(text)
+        keys = self.__texts.get(text)
+        if keys is None or key not in keys: return False
+
+        del keys[key]
+        if not keys:
+            del self.__texts[text]
+            size = len(text)
+            for gram in padded_trigrams(text):
+                by_size = self.__postings[gram]
+                del by_size[size][text]
+                if not by_size[size]:
+                    del by_size[size]
+                if not by_size:
+                    del self.__postings[gram]
+        return True
+
+    def search(self, query, limit=5, max_distance=2):
+        # Texts of a compatible length sharing the most trigrams with the
+        # query are verified by edit distance; returns [(key, distance)]
+        query = normalize(query)
+        sizes = range(max(0, len(query) - max_distance), len(query) + max_distance + 1)
+        shared = Counter()
+        postings = self.__postings
+        for gram in padded_trigrams(query):
+            by_size = postings.get(gram)
+            if not by_size: continue
+            for size in sizes:
+                posting = by_size.get(size)
+                if posting:
+                    shared.update(tuple(posting))
+
+        distance_to = levenshtein_matcher(query)
+        ranked = []
+        for text, common in shared.most_common(self.__candidate_limit):
+            distance = distance_to(text)
+            if distance <= max_distance:
+                ranked.append((distance, -common, text))
+        ranked.sort()
+
+        results = []
+        texts = self.__texts
+        for distance, _, text in ranked:
+            for key in tuple(texts.get(text, ())):
+                results.append((key, distance))
+                if len(results) >= limit: return results
+        return results
+
+
+class PrefixTrie:
+    def __init__(self):
+        # Nested dicts keyed by character; the None key marks a stored word
+        self.__root = {}
+
+    def add(self, word, value=None):
+        node = self.__root
+        for char in word:
+            node = node.setdefault(char, {})
+        node[None] = word if value is None else value
+
+    def remove(self, word):
+        path = []
+        node = self.__root
+        for char in word:
+            path.append((node, char))
+            node = node.get(char)
+            if node is None: return False
+
+        if None not in node: return False
+        del node[None]
+        # Prune branches that no longer lead to any word
+        for parent, char in reversed(path):
+            if parent[char]: break
+            del parent[char]
+        return True
+
+    def starts_with(self, prefix, limit=None):
+        node = self.__root
+        for char in prefix:
+            node = node.get(char)
+            if node is None: return []
+
+        results = []
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            if None in node:
+                results.append(node[None])
+                if limit is not None and len(results) >= limit: break
+            # Reverse-sorted push so words come out in alphabetical order
+            stack.extend(node[char] for char in sorted((c for c in node if c is not None), reverse=True))
+        return results
+
+
+class BreedIndex:
+    def __init__(self):
+        self.__breeds = {}
+        self.__order = {}
+        self.__next_seq = 0
+        self.__trie = PrefixTrie()
+
+    @property
+    def vocabulary_size(self): return len(self.__breeds)
+
+    def add(self, key, breed):
+        normalized = normalize(breed)
+        dogs = self.__breeds.get(normalized)
+        if dogs is None:
+            dogs = self.__breeds[normalized] = {}
+            # First spelling seen is what autocomplete shows
+            self.__trie.add(normalized, breed)
+        dogs[key] = None
+        self.__order[key] = self.__next_seq
+        self.__next_seq += 1
+
+    def update(self, pairs):
+        add = self.add
+        for key, breed in pairs:
+            add(key, breed)
+
+    def remove(self, key, breed):
+        normalized = normalize(breed)
+        dogs = self.__breeds.get(normalized)
+        if dogs is None or key not in dogs: return False
+
+        del dogs[key]
+        del self.__order[key]
+        if not dogs:
+            del self.__breeds[normalized]
+            self.__trie.remove(normalized)
+        return True
+
+    def count(self, query):
+        query = normalize(query)
+        return sum(len(dogs) for breed, dogs in tuple(self.__breeds.items()) if query in breed)
+
+    def search(self, query):
+        query = normalize(query)
+        matches = [dogs for breed, dogs in tuple(self.__breeds.items()) if query in breed]
+        if not matches: return []
+        if len(matches) == 1: return list(matches[0])
+
+        # Keep registration order across the union of several breeds
+        order = self.__order
+        return sorted((key for dogs in matches for key in tuple(dogs)), key=order.__getitem__)
+
+    def starts_with(self, prefix, limit=None):
+        return self.__trie.starts_with(normalize(prefix), limit)
+
+    def dogs_with_breed(self, breed):
+        return list(self.__breeds.get(normalize(breed), ()))
+
+
+class SortedIndex:
+    def __init__(self, bucket_size=512):
+        # Keys kept sorted across bounded buckets so an insert shifts at most one
+        # bucket; maxes holds each bucket's largest key for bisecting to a bucket
+        self.__keys = []
+        self.__values = []
+        self.__maxes = []
+        self.__bucket_size = bucket_size
+        self.__size = 0
+
+    def __len__(self): return self.__size
+
+    def add(self, key, value):
+        self.__size += 1
+        maxes = self.__maxes
+        if not maxes:
+            self.__keys.append([key])
+            self.__values.append([value])
+            maxes.append(key)
+            return
+
+        bucket = min(bisect_right(maxes, key), len(maxes) - 1)
+        keys = self.__keys[bucket]
+        values = self.__values[bucket]
+        position = bisect_right(keys, key)
+        keys.insert(position, key)
+        values.insert(position, value)
+        maxes[bucket] = keys[-1]
+        if len(keys) > 2 * self.__bucket_size:
+            half = len(keys) // 2
+            self.__keys.insert(bucket + 1, keys[half:])
+            self.__values.insert(bucket + 1, values[half:])
+            del keys[half:]
+            del values[half:]
+            maxes[bucket] = keys[-1]
+            maxes.insert(bucket + 1, self.__keys[bucket + 1][-1])
+
+    def update(self, pairs):
+        # Bulk add: batches that are large next to the index are merged with
+        # one stable sort and re-bucketed, smaller ones inserted one by one
+        pairs = list(pairs)
+        if len(pairs) * 4 < self.__size:
+            for key, value in pairs:
+                self.add(key, value)
+            return
+
+        items = [item for keys, values in zip(self.__keys, self.__values) for item in zip(keys, values)]
+        items.extend(pairs)
+        items.sort(key=itemgetter(0))
+        size = self.__bucket_size
+        chunks = [items[start:start + size] for start in range(0, len(items), size)]
+        self.__keys = [[key for key, _ in chunk] for chunk in chunks]
+        self.__values = [[value for _, value in chunk] for chunk in chunks]
+        self.__maxes = [keys[-1] for keys in self.__keys]
+        self.__size = len(items)
+
+    def remove(self, key, value):
+        for bucket in range(bisect_left(self.__maxes, key), len(self.__maxes)):
+            keys = self.__keys[bucket]
+            values = self.__values[bucket]
+            position = bisect_left(keys, key)
+            while position < len(keys) and keys[position] == key:
+                if values[position] == value:
+                    del keys[position]
+                    del values[position]
+                    self.__size -= 1
+                    if keys:
+                        self.__maxes[bucket] = keys[-1]
+                    else:
+                        del self.__keys[bucket]
+                        del self.__values[bucket]
+                        del self.__maxes[bucket]
+                    return True
+                position += 1
+            if position < len(keys): return False
+        return False
+
+    def __spans(self, low, high):
+        # (bucket, start, end) slices holding keys in [low, high]; None is unbounded
+        maxes = self.__maxes
+        first = 0 if low is None else bisect_left(maxes, low)
+        for bucket in range(first, len(maxes)):
+            keys = self.__keys[bucket]
+            start = bisect_left(keys, low) if low is not None and bucket == first else 0
+            if high is not None and keys[-1] > high:
+                yield bucket, start, bisect_right(keys, high)
+                return
+            yield bucket, start, len(keys)
+
+    def between(self, low=None, high=None):
+        if low is not None and high is not None and low > high: return
+        values = self.__values
+        for bucket, start, end in self.__spans(low, high):
+            yield from values[bucket][start:end]
+
+    def count_between(self, low=None, high=None):
+        if low is not None and high is not None and low > high: return 0
+        return sum(end - start for _, start, end in self.__spans(low, high))
+
+
+class _IntervalNode:
+    __slots__ = ("start", "end", "max_end", "priority", "left", "right", "value")
+
+    def __init__(self, start, end, value):
+        self.start = start
+        self.end = end
+        self.max_end = end
+        self.priority = random.random()
+        self.left = None
+        self.right = None
+        self.value = value
+
+
+def _update(node):
+    max_end = node.end
+    if node.left is not None and node.left.max_end > max_end: max_end = node.left.max_end
+    if node.right is not None and node.right.max_end > max_end: max_end = node.right.max_end
+    node.max_end = max_end
+
+
+class IntervalTree:
+    def __init__(self):
+        # Treap ordered by start, each node augmented with the largest end in
+        # its subtree so whole subtrees ending before a query can be skipped
+        self.__root = None
+        self.__size = 0
+
+    def __len__(self): return self.__size
+
+    def add(self, start, end, value):
+        node = _IntervalNode(start, end, value)
+        self.__size += 1
+        if self.__root is None:
+            self.__root = node
+            return
+
+        # Descend to a leaf position, widening max_end on the way down
+        path = []
+        parent = self.__root
+        while parent is not None:
+            path.append(parent)
+            if parent.max_end < end: parent.max_end = end
+            parent = parent.left if start < parent.start else parent.right
+        parent = path[-1]
+        if start < parent.start:
+            parent.left = node
+        else:
+            parent.right = node
+
+        # Rotate the new node up until the heap order on priorities holds
+        while path and path[-1].priority < node.priority:
+            parent = path.pop()
+            if parent.left is node:
+                parent.left = node.right
+                node.right = parent
+            else:
+                parent.right = node.left
+                node.left = parent
+            _update(parent)
+            _update(node)
+            if not path:
+                self.__root = node
+            elif path[-1].left is parent:
+                path[-1].left = node
+            else:
+                path[-1].right = node
+
+    def overlapping(self, low, high):
+        # Values of intervals with start <= high and end >= low, in start order
+        results = []
+        stack = []
+        node = self.__root
+        while stack or node is not None:
+            while node is not None and node.max_end >= low:
+                stack.append(node)
+                node = node.left
+            if not stack: break
+            node = stack.pop()
+            if node.start > high: break
+            if node.end >= low:
+                results.append(node.value)
+            node = node.right
+        return results
+
+    def at(self, point):
+        return self.overlapping(point, point)
+
+
+class TimelineIndex:
+    def __init__(self):
+        # Per key: starts, ends and values sorted by start, plus running totals
+        # of durations in seconds. A key's intervals must not overlap
+        self.__timelines = {}
+
+    def add(self, key, start, end, value=None):
+        timeline = self.__timelines.get(key)
+        if timeline is None:
+            timeline = self.__timelines[key] = ([], [], [], [0.0])
+        starts, ends, values, totals = timeline
+        if not starts or start >= starts[-1]:
+            starts.append(start)
+            ends.append(end)
+            values.append(value)
+            totals.append(totals[-1] + (end - start).total_seconds())
+            return
+
+        # Out-of-order insert: rebuild the running totals from the new position
+        position = bisect_right(starts, start)
+        starts.insert(position, start)
+        ends.insert(position, end)
+        values.insert(position, value)
+        del totals[position + 1:]
+        for i in range(position, len(starts)):
+            totals.append(totals[-1] + (ends[i] - starts[i]).total_seconds())
+
+    def values(self, key):
+        timeline = self.__timelines.get(key)
+        return list(timeline[2]) if timeline is not None else []
+
+    def total_seconds(self, key, low, high):
+        # Time covered by the key's intervals inside [low, high)
+        timeline = self.__timelines.get(key)
+        if timeline is None: return 0.0
+
+        starts, ends, _, totals = timeline
+        first = bisect_left(starts, low)
+        last = bisect_left(starts, high)
+        total = totals[last] - totals[first]
+        if last > first and ends[last - 1] > high:
+            total -= (ends[last - 1] - high).total_seconds()
+        if first > 0 and ends[first - 1] > low:
+            total += (min(ends[first - 1], high) - low).total_seconds()
+        return total
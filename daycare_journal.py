@@ -0,0 +1,308 @@
+"""
+Dog Daycare Management System - append-only journal with snapshots
+"""
+
+import os
+import struct
+import threading
+import time
+import zlib
+
+from dog_daycare_management_system import DOG_TYPES, Daycare, LargeDog, Owner, SmallDog
+
+ADD_DOG = 1
+ADD_OWNER = 2
+REGISTER_DOG = 3
+CHECK_IN = 4
+CHECK_OUT = 5
+
+SNAPSHOT_MAGIC = b"DDSNAP01"
+SNAPSHOT_FILE = "snapshot.bin"
+FRAME_HEADER = struct.Struct("<II")
+STRING_LENGTH = struct.Struct("<I")
+DOG_FIELDS = struct.Struct("<idB")
+GENERATION = struct.Struct("<Q")
+
+
+def _pack_str(parts, text):
+    data = text.encode("utf-8")
+    parts.append(STRING_LENGTH.pack(len(data)))
+    parts.append(data)
+
+
+def _unpack_str(buffer, offset):
+    (length,) = STRING_LENGTH.unpack_from(buffer, offset)
+    offset += STRING_LENGTH.size
+    return buffer[offset:offset + length].decode("utf-8"), offset + length
+
+
+def encode_frame(op, *fields):
+    # Frame: payload length, CRC32 of payload, then op byte and fields
+    parts = [bytes((op,))]
+    for field in fields:
+        if isinstance(field, str):
+            _pack_str(parts, field)
+        else:
+            parts.append(field)
+    payload = b"".join(parts)
+    return FRAME_HEADER.pack(len(payload), zlib.crc32(payload)) + payload
+
+
+def encode_dog(dog):
+    if isinstance(dog, SmallDog):
+        extra = dog.toy_preference
+    elif isinstance(dog, LargeDog):
+        extra = dog.exercise_needs
+    else:
+        extra = ""
+    return encode_frame(ADD_DOG, dog.type_code, dog.dog_id, dog.name, dog.breed,
+                        DOG_FIELDS.pack(dog.age, dog.weight, 1 if dog.is_checked_in else 0), extra)
+
+
+def encode_owner(owner):
+    dog_ids = owner.dogs_registered
+    fields = [owner.owner_id, owner.name, owner.email, owner.phone, STRING_LENGTH.pack(len(dog_ids))]
+    fields.extend(dog_ids)
+    return encode_frame(ADD_OWNER, *fields)
+
+
+def iter_frames(buffer, offset=0):
+    # Yields (op, payload, end_offset); stops at a torn or corrupt tail
+    size = len(buffer)
+    while offset + FRAME_HEADER.size <= size:
+        length, checksum = FRAME_HEADER.unpack_from(buffer, offset)
+        start = offset + FRAME_HEADER.size
+        end = start + length
+        if length == 0 or end > size: return
+        payload = buffer[start:end]
+        if zlib.crc32(payload) != checksum: return
+        yield payload[0], payload, end
+        offset = end
+
+
+def decode_dog(payload):
+    type_code, offset = _unpack_str(payload, 1)
+    dog_id, offset = _unpack_str(payload, offset)
+    name, offset = _unpack_str(payload, offset)
+    breed, offset = _unpack_str(payload, offset)
+    age, weight, checked_in = DOG_FIELDS.unpack_from(payload, offset)
+    extra, _ = _unpack_str(payload, offset + DOG_FIELDS.size)
+    dog_class = DOG_TYPES[type_code]
+    if type_code == "D":
+        return dog_class(dog_id, name, breed, age, weight, bool(checked_in))
+    return dog_class(dog_id, name, breed, age, weight, bool(checked_in), extra)
+
+
+def decode_owner(payload):
+    fields = []
+    offset = 1
+    for _ in range(4):
+        value, offset = _unpack_str(payload, offset)
+        fields.append(value)
+    (count,) = STRING_LENGTH.unpack_from(payload, offset)
+    offset += STRING_LENGTH.size
+    dog_ids = []
+    for _ in range(count):
+        dog_id, offset = _unpack_str(payload, offset)
+        dog_ids.append(dog_id)
+    return Owner(*fields, dog_ids)
+
+
+def decode_ids(payload):
+    first, offset = _unpack_str(payload, 1)
+    if offset == len(payload): return (first,)
+    second, _ = _unpack_str(payload, offset)
+    return first, second
+
+
+class JournaledDaycare(Daycare):
+    # Mutations are group-committed: records are written and fsynced once
+    # group_size of them are buffered or, at the latest, sync_interval seconds
+    # after the first buffered record, from a timer thread when writes go
+    # idle. Records still buffered at a crash are lost; sync() makes a
+    # mutation durable immediately. Snapshots and runs of journaled dogs load
+    # through the bulk add_dogs path; keep journals short with snapshot_every
+
+    def __init__(self, name, address, directory, group_size=256, sync_interval=0.05,
+                 snapshot_every=None, **options):
+        super().__init__(name, address, **options)
+        self.__directory = directory
+        self.__group_size = group_size
+        self.__sync_interval = sync_interval
+        self.__snapshot_every = snapshot_every
+        self.__buffer = bytearray()
+        self.__buffered = 0
+        self.__records_since_snapshot = 0
+        self.__last_sync = time.monotonic()
+        self.__lock = threading.RLock()
+        self.__timer = None
+        self.__replaying = True
+        self.__status_listener = self.__dog_status_changed
+
+        os.makedirs(directory, exist_ok=True)
+        self.__generation = self.__load_snapshot()
+        self.__records_since_snapshot = 0
+        self.__replay_journal()
+        self.__replaying = False
+        self.__journal = open(self.__journal_path(self.__generation), "ab", buffering=0)
+
+    def __journal_path(self, generation):
+        return os.path.join(self.__directory, f"journal.{generation}")
+
+    def __load_snapshot(self):
+        # The snapshot's generation names the journal holding later mutations
+        path = os.path.join(self.__directory, SNAPSHOT_FILE)
+        if not os.path.exists(path): return 0
+
+        with open(path, "rb") as handle:
+            data = handle.read()
+        if data[:len(SNAPSHOT_MAGIC)] != SNAPSHOT_MAGIC:
+            raise ValueError(f"Not a daycare snapshot: {path}")
+
+        (generation,) = GENERATION.unpack_from(data, len(SNAPSHOT_MAGIC))
+        self.__apply_frames(memoryview(data), len(SNAPSHOT_MAGIC) + GENERATION.size)
+        return generation
+
+    def __replay_journal(self):
+        path = self.__journal_path(self.__generation)
+        if not os.path.exists(path): return
+
+        with open(path, "rb") as handle:
+            data = handle.read()
+        end = self.__apply_frames(memoryview(data), 0)
+        if end < len(data):
+            # Drop a torn tail left by a crash mid-write
+            with open(path, "r+b") as handle:
+                handle.truncate(end)
+
+    def __apply_frames(self, buffer, offset):
+        end = offset
+        dogs = []
+        for op, payload, end in iter_frames(buffer, offset):
+            payload = bytes(payload)
+            self.__records_since_snapshot += 1
+            if op == ADD_DOG:
+                dogs.append(decode_dog(payload))
+                continue
+            # Flush pending dogs before any record that may refer to them
+            if dogs:
+                self.add_dogs(dogs)
+                dogs = []
+            if op == ADD_OWNER:
+                self.add_owner(decode_owner(payload))
+            elif op == REGISTER_DOG:
+                self.register_dog(*decode_ids(payload))
+            elif op == CHECK_IN or op == CHECK_OUT:
+                dog = self.get_dog(decode_ids(payload)[0])
+                if dog is not None:
+                    dog.is_checked_in = op == CHECK_IN
+        if dogs:
+            self.add_dogs(dogs)
+        return end
+
+    def __append(self, frame):
+        with self.__lock:
+            self.__buffer += frame
+            self.__buffered += 1
+            self.__records_since_snapshot += 1
+            # Group commit: one write + fsync per batch of records or per interval
+            if self.__buffered >= self.__group_size or time.monotonic() - self.__last_sync >= self.__sync_interval:
+                self.sync()
+            elif self.__timer is None:
+                # Flushes the batch if no further record arrives to do it
+                self.__timer = threading.Timer(self.__sync_interval, self.sync)
+                self.__timer.daemon = True
+                self.__timer.start()
+            if self.__snapshot_every and self.__records_since_snapshot >= self.__snapshot_every:
+                self.snapshot()
+
+    def sync(self):
+        with self.__lock:
+            if self.__timer is not None:
+                self.__timer.cancel()
+                self.__timer = None
+            if self.__buffer and not self.__journal.closed:
+                self.__journal.write(self.__buffer)
+                os.fsync(self.__journal.fileno())
+                self.__buffer = bytearray()
+                self.__buffered = 0
+            self.__last_sync = time.monotonic()
+
+    def snapshot(self):
+        with self.__lock:
+            self.__snapshot()
+
+    def __snapshot(self):
+        self.sync()
+        generation = self.__generation + 1
+        path = os.path.join(self.__directory, SNAPSHOT_FILE)
+        temporary = path + ".tmp"
+        with open(temporary, "wb") as handle:
+            handle.write(SNAPSHOT_MAGIC + GENERATION.pack(generation))
+            handle.write(b"".join(map(encode_dog, self.dogs.values())))
+            handle.write(b"".join(map(encode_owner, self.owners.values())))
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(temporary, path)
+
+        # The new snapshot covers everything journaled so far
+        self.__journal.close()
+        old_journal = self.__journal_path(self.__generation)
+        self.__generation = generation
+        self.__journal = open(self.__journal_path(generation), "ab", buffering=0)
+        if os.path.exists(old_journal):
+            os.remove(old_journal)
+        self.__records_since_snapshot = 0
+
+    def close(self):
+        with self.__lock:
+            self.sync()
+            self.__journal.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def __dog_status_changed(self, dog):
+        if self.__replaying: return
+        self.__append(encode_frame(CHECK_IN if dog.is_checked_in else CHECK_OUT, dog.dog_id))
+
+    def add_dog(self, dog):
+        if not super().add_dog(dog): return False
+
+        dog.add_status_listener(self.__status_listener)
+        if not self.__replaying:
+            self.__append(encode_dog(dog))
+        return True
+
+    def add_dogs(self, dogs):
+        # Replay loads straight into the indexes; live batches are journaled per dog
+        if not self.__replaying:
+            add_dog = self.add_dog
+            return sum(1 for dog in dogs if add_dog(dog))
+
+        dogs = list(dogs)
+        added = super().add_dogs(dogs)
+        for dog in dogs:
+            if self.get_dog(dog.dog_id) is dog:
+                dog.add_status_listener(self.__status_listener)
+        return added
+
+    def add_owner(self, owner):
+        if not super().add_owner(owner): return False
+
+        if not self.__replaying:
+            self.__append(encode_owner(owner))
+        return True
+
+    def register_dog(self, owner_id, dog_id):
+        owner = self.get_owner(owner_id)
+        dog = self.get_dog(dog_id)
+        if owner is None or dog is None or owner.has_dog(dog_id): return False
+
+        owner.register_dog(dog)
+        if not self.__replaying:
+            self.__append(encode_frame(REGISTER_DOG, owner_id, dog_id))
+        return True
@@ -0,0 +1,199 @@
+"""
+Dog Daycare Management System - memory-mapped registry snapshot
+"""
+
+import mmap
+import os
+import struct
+
+from dog_daycare_management_system import DOG_TYPES, LargeDog, Owner, SmallDog
+
+MAGIC = b"DDREG001"
+# magic, dog count, owner count, adjacency count, then table offsets and pool size
+HEADER = struct.Struct("<8s3I5Q")
+# (offset, length) into the string pool for id, name, breed and extra, then
+# age, weight, type code and checked-in flag
+DOG_RECORD = struct.Struct("<8Iid2B6x")
+# (offset, length) for id, name, email and phone, then the adjacency slice
+OWNER_RECORD = struct.Struct("<10I")
+# (offset, length) of one string in the pool
+STRING_REF = struct.Struct("<2I")
+ADJACENCY_RECORD = STRING_REF
+
+
+class _StringPool:
+    def __init__(self):
+        self.__chunks = []
+        self.__offsets = {}
+        self.size = 0
+
+    def add(self, text):
+        data = text.encode("utf-8")
+        offset = self.__offsets.get(data)
+        if offset is None:
+            offset = self.__offsets[data] = self.size
+            self.__chunks.append(data)
+            self.size += len(data)
+        return offset, len(data)
+
+    def to_bytes(self):
+        return b"".join(self.__chunks)
+
+
+def _dog_extra(dog):
+    if isinstance(dog, SmallDog): return dog.toy_preference
+    if isinstance(dog, LargeDog): return dog.exercise_needs
+    return ""
+
+
+def write_registry(daycare, path):
+    # Rows are sorted by encoded ID so readers can binary-search the mapping
+    pool = _StringPool()
+    dogs = sorted(daycare.get_all_dogs().values(), key=lambda dog: dog.dog_id.encode("utf-8"))
+    owners = sorted(daycare.get_all_owners().values(), key=lambda owner: owner.owner_id.encode("utf-8"))
+
+    dog_table = bytearray()
+    for dog in dogs:
+        dog_table += DOG_RECORD.pack(*pool.add(dog.dog_id), *pool.add(dog.name), *pool.add(dog.breed),
+                                     *pool.add(_dog_extra(dog)), dog.age, dog.weight,
+                                     ord(dog.type_code), 1 if dog.is_checked_in else 0)
+
+    owner_table = bytearray()
+    adjacency = bytearray()
+    adjacency_count = 0
+    for owner in owners:
+        dog_ids = owner.dogs_registered
+        owner_table += OWNER_RECORD.pack(*pool.add(owner.owner_id), *pool.add(owner.name), *pool.add(owner.email),
+                                         *pool.add(owner.phone), adjacency_count, len(dog_ids))
+        for dog_id in dog_ids:
+            adjacency += ADJACENCY_RECORD.pack(*pool.add(dog_id))
+        adjacency_count += len(dog_ids)
+
+    dog_offset = HEADER.size
+    owner_offset = dog_offset + len(dog_table)
+    adjacency_offset = owner_offset + len(owner_table)
+    pool_offset = adjacency_offset + len(adjacency)
+    temporary = path + ".tmp"
+    with open(temporary, "wb") as handle:
+        handle.write(HEADER.pack(MAGIC, len(dogs), len(owners), adjacency_count,
+                                 dog_offset, owner_offset, adjacency_offset, pool_offset, pool.size))
+        handle.write(dog_table)
+        handle.write(owner_table)
+        handle.write(adjacency)
+        handle.write(pool.to_bytes())
+        handle.flush()
+        os.fsync(handle.fileno())
+    os.replace(temporary, path)
+
+
+class MappedRegistry:
+    def __init__(self, path):
+        with open(path, "rb") as handle:
+            self.__map = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        self.__view = memoryview(self.__map)
+        (magic, self.__dog_count, self.__owner_count, _, self.__dog_offset, self.__owner_offset,
+         self.__adjacency_offset, self.__pool_offset, _) = HEADER.unpack_from(self.__map, 0)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"Not a daycare registry snapshot: {path}")
+        # Objects are built on first access and then reused
+        self.__dogs = {}
+        self.__owners = {}
+
+    def close(self):
+        # Only whole calls hold views of the mapping, so this cannot hit live
+        # exports; iterators left open fail on their next step instead
+        self.__view.release()
+        self.__map.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def get_dog_count(self): return self.__dog_count
+
+    def get_owner_count(self): return self.__owner_count
+
+    def __string(self, offset, length):
+        start = self.__pool_offset + offset
+        return str(self.__view[start:start + length], "utf-8")
+
+    def __find(self, table_offset, count, record, key):
+        # Binary search over the sorted fixed-size records, comparing the
+        # encoded IDs straight out of the mapped string pool
+        key = key.encode("utf-8")
+        view = self.__view
+        pool = self.__pool_offset
+        low, high = 0, count
+        while low < high:
+            middle = (low + high) // 2
+            offset, length = STRING_REF.unpack_from(self.__map, table_offset + middle * record.size)
+            candidate = view[pool + offset:pool + offset + length]
+            if candidate == key:
+                return record.unpack_from(self.__map, table_offset + middle * record.size)
+            if bytes(candidate) < key:
+                low = middle + 1
+            else:
+                high = middle
+        return None
+
+    def __dog_from_record(self, fields):
+        text = self.__string
+        dog_id, name, breed, extra = (text(fields[i], fields[i + 1]) for i in range(0, 8, 2))
+        age, weight, type_code, checked_in = fields[8:]
+        dog_class = DOG_TYPES[chr(type_code)]
+        if dog_class in (SmallDog, LargeDog):
+            return dog_class(dog_id, name, breed, age, weight, bool(checked_in), extra)
+        return dog_class(dog_id, name, breed, age, weight, bool(checked_in))
+
+    def __dog_from_fields(self, fields):
+        dog_id = self.__string(fields[0], fields[1])
+        dog = self.__dogs.get(dog_id)
+        if dog is None:
+            dog = self.__dogs[dog_id] = self.__dog_from_record(fields)
+        return dog
+
+    def __dog_records(self):
+        # Unpacked one record at a time off the mapping, so a suspended
+        # iterator holds no exported buffer that would block close()
+        unpack_from = DOG_RECORD.unpack_from
+        mapping = self.__map
+        end = self.__dog_offset + self.__dog_count * DOG_RECORD.size
+        for offset in range(self.__dog_offset, end, DOG_RECORD.size):
+            yield unpack_from(mapping, offset)
+
+    def get_dog(self, dog_id):
+        dog = self.__dogs.get(dog_id)
+        if dog is not None: return dog
+
+        fields = self.__find(self.__dog_offset, self.__dog_count, DOG_RECORD, dog_id)
+        return self.__dog_from_fields(fields) if fields is not None else None
+
+    def get_owner(self, owner_id):
+        owner = self.__owners.get(owner_id)
+        if owner is not None: return owner
+
+        fields = self.__find(self.__owner_offset, self.__owner_count, OWNER_RECORD, owner_id)
+        if fields is None: return None
+        text = self.__string
+        start, count = fields[8:]
+        first = self.__adjacency_offset + start * ADJACENCY_RECORD.size
+        adjacency = self.__view[first:first + count * ADJACENCY_RECORD.size]
+        dog_ids = [text(offset, length) for offset, length in ADJACENCY_RECORD.iter_unpack(adjacency)]
+        owner = self.__owners[owner_id] = Owner(*(text(fields[i], fields[i + 1]) for i in range(0, 8, 2)), dog_ids)
+        return owner
+
+    def iter_dog_ids(self):
+        text = self.__string
+        for fields in self.__dog_records():
+            yield text(fields[0], fields[1])
+
+    def get_checked_in_dogs(self):
+        # Scans the fixed-width flag column in place; only matching rows are materialized
+        dog_from_fields = self.__dog_from_fields
+        end = self.__dog_offset + self.__dog_count * DOG_RECORD.size
+        with self.__view[self.__dog_offset:end] as table:
+            records = [fields for fields in DOG_RECORD.iter_unpack(table) if fields[11]]
+        return {dog.dog_id: dog for dog in map(dog_from_fields, records)}
@@ -0,0 +1,48 @@
+"""
+Dog Daycare Management System - composable dog queries
+"""
+
+
+class DogQuery:
+    def __init__(self, daycare):
+        self.__daycare = daycare
+        self.__predicates = {}
+
+    @property
+    def predicates(self): return dict(self.__predicates)
+
+    def name(self, text):
+        if text is None:
+            raise ValueError("Search name cannot be None")
+        self.__predicates["name"] = text
+        return self
+
+    def breed(self, text):
+        if text is None:
+            raise ValueError("Search breed cannot be None")
+        self.__predicates["breed"] = text
+        return self
+
+    def of_type(self, dog_type):
+        self.__predicates["dog_type"] = dog_type
+        return self
+
+    def checked_in(self, value=True):
+        self.__predicates["checked_in"] = bool(value)
+        return self
+
+    def age(self, low=None, high=None):
+        self.__predicates["age"] = (low, high)
+        return self
+
+    def weight(self, low=None, high=None):
+        self.__predicates["weight"] = (low, high)
+        return self
+
+    def explain(self):
+        # Name of the index the planner would drive this query from
+        return self.__daycare._plan_query(self.__predicates)[0]
+
+    def __iter__(self):
+        # Predicates are copied so later builder calls do not affect a running query
+        return self.__daycare._run_query(dict(self.__predicates))
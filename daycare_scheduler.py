@@ -0,0 +1,190 @@
+"""
+Dog Daycare Management System - capacity-aware activity scheduler
+"""
+
+import heapq
+
+from dog_daycare_management_system import DOG_CHECKED_IN, DOG_CHECKED_OUT, LargeDog
+
+WALKING = "Walking"
+DEFAULT_SLOTS = tuple(f"{hour:02d}:00" for hour in range(8, 18))
+DEFAULT_CAPACITIES = {"Play Time": 12, "Walking": 6, "Training": 4, "Socialization": 10, "Resting": 20}
+
+
+def needs_walk(dog):
+    return isinstance(dog, LargeDog) and dog.exercise_needs == "High"
+
+
+class ActivityScheduler:
+    def __init__(self, daycare, slots=DEFAULT_SLOTS, capacities=None):
+        self.__daycare = daycare
+        self.__slots = tuple(slots)
+        self.__activities = tuple(daycare.available_activities)
+        capacities = DEFAULT_CAPACITIES if capacities is None else capacities
+        self.__capacities = {activity: capacities.get(activity, 0) for activity in self.__activities}
+        self.__current_slot = 0
+        # Per slot: groups[activity][size class] is an ordered set of dog IDs;
+        # dogs of different size classes never share a group, but an
+        # activity's capacity counts its dogs across all size classes
+        self.__groups = [{} for _ in self.__slots]
+        self.__loads = [{} for _ in self.__slots]
+        self.__waiting = [{} for _ in self.__slots]
+        self.__placements = {}
+        # Per slot: lazy min-heap of (load, rank, activity)
+        self.__heaps = {}
+        self.__listener = self.__dog_event
+        daycare.add_listener(self.__listener)
+        self.rebuild()
+
+    @property
+    def slots(self): return self.__slots
+
+    @property
+    def current_slot(self): return self.__current_slot
+
+    def close(self):
+        self.__daycare.remove_listener(self.__listener)
+
+    def set_current_slot(self, slot):
+        # Earlier slots are history and are no longer rescheduled
+        if not 0 <= slot <= len(self.__slots):
+            raise ValueError(f"Slot index out of range: {slot}")
+        self.__current_slot = slot
+
+    def rebuild(self):
+        # Walk-priority dogs are placed first so they claim the walks
+        dogs = list(self.__daycare.get_checked_in_dogs().values())
+        dogs.sort(key=lambda dog: not needs_walk(dog))
+        for slot in range(self.__current_slot, len(self.__slots)):
+            for dog_id, placements in self.__placements.items():
+                placements.pop(slot, None)
+            self.__groups[slot] = {activity: {} for activity in self.__activities}
+            self.__loads[slot] = dict.fromkeys(self.__activities, 0)
+            self.__waiting[slot] = {}
+            self.__heaps.pop(slot, None)
+            for dog in dogs:
+                self.__place(slot, dog)
+        self.__placements = {dog_id: placements for dog_id, placements in self.__placements.items() if placements}
+
+    def __dog_event(self, event, dog):
+        if event == DOG_CHECKED_IN:
+            for slot in range(self.__current_slot, len(self.__slots)):
+                self.__place(slot, dog)
+        elif event == DOG_CHECKED_OUT:
+            for slot in range(self.__current_slot, len(self.__slots)):
+                self.__remove(slot, dog.dog_id)
+
+    def __heap(self, slot):
+        heap = self.__heaps.get(slot)
+        if heap is None:
+            # Ranks rotate with the slot so ties spread dogs across activities over the day
+            count = len(self.__activities)
+            heap = self.__heaps[slot] = [(self.__load(slot, activity), (rank + slot) % count, activity)
+                                         for rank, activity in enumerate(self.__activities)]
+            heapq.heapify(heap)
+        return heap
+
+    def __load(self, slot, activity):
+        return self.__loads[slot].get(activity, 0)
+
+    def __push(self, slot, activity):
+        rank = (self.__activities.index(activity) + slot) % len(self.__activities)
+        heapq.heappush(self.__heap(slot), (self.__load(slot, activity), rank, activity))
+
+    def __least_loaded(self, slot, exclude=None):
+        # Pops stale or full entries; the chosen entry is re-pushed by __assign
+        # and a full one is re-pushed by __unassign once it has room again
+        heap = self.__heap(slot)
+        skipped = []
+        chosen = None
+        while heap:
+            load, rank, activity = heapq.heappop(heap)
+            if load != self.__load(slot, activity) or load >= self.__capacities[activity]: continue
+            if activity == exclude:
+                skipped.append((load, rank, activity))
+                continue
+            chosen = activity
+            break
+        for entry in skipped:
+            heapq.heappush(heap, entry)
+        return chosen
+
+    def __assign(self, slot, dog_id, activity, size):
+        self.__groups[slot][activity].setdefault(size, {})[dog_id] = None
+        self.__loads[slot][activity] += 1
+        self.__placements.setdefault(dog_id, {})[slot] = activity
+        self.__push(slot, activity)
+
+    def __unassign(self, slot, dog_id, activity, size):
+        del self.__groups[slot][activity][size][dog_id]
+        self.__loads[slot][activity] -= 1
+        del self.__placements[dog_id][slot]
+        if not self.__placements[dog_id]:
+            del self.__placements[dog_id]
+        self.__push(slot, activity)
+
+    def __place(self, slot, dog):
+        size = dog.type_code
+        if needs_walk(dog):
+            if self.__load(slot, WALKING) >= self.__capacities.get(WALKING, 0):
+                self.__bump_walker(slot)
+            if self.__load(slot, WALKING) < self.__capacities.get(WALKING, 0):
+                self.__assign(slot, dog.dog_id, WALKING, size)
+                return
+        activity = self.__least_loaded(slot)
+        if activity is None:
+            self.__waiting[slot][dog.dog_id] = None
+        else:
+            self.__assign(slot, dog.dog_id, activity, size)
+
+    def __bump_walker(self, slot):
+        # Move the latest non-priority walker elsewhere to free a walk for a priority dog
+        dogs = self.__daycare.dogs
+        for size, walkers in reversed(list(self.__groups[slot][WALKING].items())):
+            for dog_id in reversed(list(walkers)):
+                if needs_walk(dogs[dog_id]): continue
+                activity = self.__least_loaded(slot, exclude=WALKING)
+                self.__unassign(slot, dog_id, WALKING, size)
+                if activity is None:
+                    self.__waiting[slot][dog_id] = None
+                else:
+                    self.__assign(slot, dog_id, activity, size)
+                return
+
+    def __remove(self, slot, dog_id):
+        waiting = self.__waiting[slot]
+        if dog_id in waiting:
+            del waiting[dog_id]
+            return
+
+        activity = self.__placements.get(dog_id, {}).get(slot)
+        if activity is None: return
+        size = self.__daycare.dogs[dog_id].type_code
+        self.__unassign(slot, dog_id, activity, size)
+        # Freed capacity goes to the longest-waiting dog
+        if waiting:
+            waiting_id = next(iter(waiting))
+            del waiting[waiting_id]
+            self.__place(slot, self.__daycare.dogs[waiting_id])
+
+    def assignment(self, dog_id):
+        return dict(self.__placements.get(dog_id, {}))
+
+    def roster(self, slot):
+        groups = self.__groups[slot]
+        return {activity: {size: list(dog_ids) for size, dog_ids in groups[activity].items() if dog_ids}
+                for activity in self.__activities}
+
+    def waiting(self, slot):
+        return list(self.__waiting[slot])
+
+    def display_schedule(self):
+        lines = []
+        for slot, label in enumerate(self.__slots):
+            lines.append(f"{label}:")
+            for activity, sizes in self.roster(slot).items():
+                for size, dog_ids in sizes.items():
+                    lines.append(f"  {activity} [{size}]: {', '.join(dog_ids)}")
+            if self.__waiting[slot]:
+                lines.append(f"  Waiting: {', '.join(self.__waiting[slot])}")
+        return "\n".join(lines)
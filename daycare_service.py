@@ -0,0 +1,254 @@
+"""
+Dog Daycare Management System - asyncio JSON-lines service
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from collections import deque
+
+from daycare_import import parse_dog, parse_owner
+from dog_daycare_management_system import CheckResult, Daycare, LargeDog, SmallDog
+
+LATENCY_WINDOW = 100000
+
+
+def dog_to_dict(dog):
+    record = {"dog_id": dog.dog_id, "type": dog.type_code, "name": dog.name, "breed": dog.breed,
+              "age": dog.age, "weight": dog.weight, "checked_in": bool(dog.is_checked_in)}
+    if isinstance(dog, SmallDog):
+        record["toy_preference"] = dog.toy_preference
+    elif isinstance(dog, LargeDog):
+        record["exercise_needs"] = dog.exercise_needs
+    return record
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values: return 0.0
+    index = min(len(sorted_values) - 1, int(fraction * len(sorted_values)))
+    return sorted_values[index]
+
+
+class DaycareService:
+    def __init__(self, daycare, batch_window=0.002, max_batch=512):
+        # Searches run on executor threads, so the daycare should be thread-safe
+        self.__daycare = daycare
+        self.__batch_window = batch_window
+        self.__max_batch = max_batch
+        self.__pending = []
+        self.__flush_handle = None
+        self.__inflight = {}
+        self.__latencies = deque(maxlen=LATENCY_WINDOW)
+        self.__requests = 0
+        self.__coalesced = 0
+        self.__batches = 0
+        self.__server = None
+        self.__handlers = {
+            "add_dog": self.__add_dog,
+            "add_owner": self.__add_owner,
+            "check_in": self.__check_in,
+            "check_out": self.__check_out,
+            "search_name": self.__search_name,
+            "search_breed": self.__search_breed,
+            "checked_in": self.__checked_in,
+            "list_dogs": self.__list_dogs,
+            "stats": self.__stats,
+        }
+
+    @property
+    def daycare(self): return self.__daycare
+
+    async def start(self, host="127.0.0.1", port=8765):
+        self.__server = await asyncio.start_server(self.__handle_connection, host, port)
+        return self.__server.sockets[0].getsockname()[:2]
+
+    async def serve_forever(self):
+        async with self.__server:
+            await self.__server.serve_forever()
+
+    async def close(self):
+        self.__flush()
+        if self.__server is not None:
+            self.__server.close()
+            await self.__server.wait_closed()
+
+    async def __handle_connection(self, reader, writer):
+        tasks = set()
+        try:
+            while True:
+                line = await reader.readline()
+                if not line: break
+                # Each request runs as its own task so clients can pipeline
+                task = asyncio.ensure_future(self.__respond(line, writer))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.gather(*tasks)
+        except (ConnectionError, ValueError):
+            # Dropped client or a request line over the stream limit
+            pass
+        finally:
+            writer.close()
+
+    async def __respond(self, line, writer):
+        started = time.perf_counter()
+        request_id = None
+        try:
+            request = json.loads(line)
+            request_id = request.get("id")
+            handler = self.__handlers.get(request.get("op"))
+            if handler is None:
+                raise ValueError(f"Unknown operation: {request.get('op')}")
+            response = {"id": request_id, "ok": True, "result": await handler(request)}
+        except Exception as e:
+            # Every request gets a reply, including ones failed by a batch
+            response = {"id": request_id, "ok": False, "error": str(e)}
+
+        if writer.is_closing(): return
+        writer.write(json.dumps(response).encode("utf-8") + b"\n")
+        self.__requests += 1
+        self.__latencies.append(time.perf_counter() - started)
+        await writer.drain()
+
+    async def __add_dog(self, request):
+        return self.__daycare.add_dog(parse_dog(request["dog"]))
+
+    async def __add_owner(self, request):
+        owner = parse_owner(request["owner"])
+        for dog_id in request["owner"].get("dogs", ()):
+            dog = self.__daycare.get_dog(dog_id)
+            if dog is None:
+                raise ValueError(f"Dog with ID {dog_id} not found")
+            if not owner.has_dog(dog_id):
+                owner.register_dog(dog)
+        return self.__daycare.add_owner(owner)
+
+    def __enqueue(self, checking_in, request):
+        dog_id = request["dog_id"]
+        owner_id = request["owner_id"]
+        # Bad IDs are rejected here so they never reach a shared batch
+        if not isinstance(dog_id, str) or not isinstance(owner_id, str):
+            raise ValueError("dog_id and owner_id must be strings")
+        future = asyncio.get_running_loop().create_future()
+        self.__pending.append((checking_in, dog_id, owner_id, future))
+        if len(self.__pending) >= self.__max_batch:
+            self.__flush()
+        elif self.__flush_handle is None:
+            self.__flush_handle = asyncio.get_running_loop().call_later(self.__batch_window, self.__flush)
+        return future
+
+    def __flush(self):
+        # Apply queued transitions in arrival order, one bulk call per run of
+        # same-direction requests
+        if self.__flush_handle is not None:
+            self.__flush_handle.cancel()
+            self.__flush_handle = None
+        pending, self.__pending = self.__pending, []
+        start = 0
+        while start < len(pending):
+            checking_in = pending[start][0]
+            end = start
+            while end < len(pending) and pending[end][0] is checking_in:
+                end += 1
+            run = pending[start:end]
+            pairs = [(dog_id, owner_id) for _, dog_id, owner_id, _ in run]
+            try:
+                if checking_in:
+                    results = self.__daycare.check_in_many(pairs)
+                else:
+                    results = self.__daycare.check_out_many(pairs)
+            except Exception as e:
+                # Runs inside a loop callback: fail the run's requests rather
+                # than leave their clients waiting
+                for _, _, _, future in run:
+                    if not future.done():
+                        future.set_exception(e)
+            else:
+                for (_, _, _, future), code in zip(run, results):
+                    if not future.done():
+                        future.set_result(CheckResult(code).name)
+            self.__batches += 1
+            start = end
+
+    async def __check_in(self, request):
+        return await self.__enqueue(True, request)
+
+    async def __check_out(self, request):
+        return await self.__enqueue(False, request)
+
+    async def __coalesce(self, key, function, *args):
+        # Identical in-flight queries share a single executor call
+        future = self.__inflight.get(key)
+        if future is not None:
+            self.__coalesced += 1
+            return await asyncio.shield(future)
+
+        future = asyncio.get_running_loop().run_in_executor(None, function, *args)
+        self.__inflight[key] = future
+        try:
+            return await asyncio.shield(future)
+        finally:
+            if self.__inflight.get(key) is future:
+                del self.__inflight[key]
+
+    def __search(self, method, query):
+        return [dog_to_dict(dog) for dog in method(query).values()]
+
+    async def __search_name(self, request):
+        query = request["query"]
+        if query is None:
+            raise ValueError("Search name cannot be None")
+        return await self.__coalesce(("name", query.lower()), self.__search, self.__daycare.search_dog_by_name, query)
+
+    async def __search_breed(self, request):
+        query = request["query"]
+        if query is None:
+            raise ValueError("Search breed cannot be None")
+        return await self.__coalesce(("breed", query.lower()), self.__search, self.__daycare.search_dog_by_breed, query)
+
+    async def __checked_in(self, request):
+        return [dog_to_dict(dog) for dog in self.__daycare.get_checked_in_dogs().values()]
+
+    async def __list_dogs(self, request):
+        limit = int(request.get("limit", 50))
+        if limit < 1:
+            raise ValueError("limit must be at least 1")
+        dogs = list(self.__daycare.iter_dogs(after=request.get("after"), limit=limit + 1))
+        return {"dogs": [dog_to_dict(dog) for dog in dogs[:limit]],
+                "next": dogs[limit - 1].dog_id if len(dogs) > limit else None}
+
+    async def __stats(self, request):
+        return self.stats()
+
+    def stats(self):
+        latencies = sorted(self.__latencies)
+        return {"requests": self.__requests, "coalesced": self.__coalesced, "batches": self.__batches,
+                "p50_ms": percentile(latencies, 0.50) * 1000, "p99_ms": percentile(latencies, 0.99) * 1000}
+
+
+async def serve(daycare, host="127.0.0.1", port=8765):
+    service = DaycareService(daycare)
+    address = await service.start(host, port)
+    print(f"Daycare service listening on {address[0]}:{address[1]}")
+    try:
+        await service.serve_forever()
+    finally:
+        await service.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve a Daycare over JSON lines on localhost")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    daycare = Daycare("Paws & Play", "456 Park Ave, Dogtown", thread_safe=True)
+    try:
+        asyncio.run(serve(daycare, args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,300 @@
+"""
+Dog Daycare Management System - hash-sharded Daycare across worker processes
+"""
+
+import multiprocessing
+import zlib
+from array import array
+from types import MappingProxyType
+
+from dog_daycare_management_system import Daycare
+
+
+def shard_of(key, shards):
+    # crc32 rather than hash(): string hashes are randomized per process
+    return zlib.crc32(key.encode("utf-8")) % shards
+
+
+def _register_dog(daycare, owner, dog):
+    existing = daycare.get_owner(owner.owner_id)
+    if existing is None:
+        return daycare.add_owner(owner)
+    if existing.has_dog(dog.dog_id): return False
+    return existing.register_dog(dog)
+
+
+def _home_owners(daycare, index, shards, after=None, limit=None):
+    # Owners are replicated to the shards of their dogs; only the home copy counts
+    owners = []
+    for owner in daycare.iter_owners(after=after):
+        if limit is not None and len(owners) >= limit: break
+        if shard_of(owner.owner_id, shards) == index:
+            owners.append(owner)
+    return owners
+
+
+def _dog_page(daycare, after, limit, filters):
+    return list(daycare.iter_dogs(after=after, limit=limit, **filters))
+
+
+def _counts(daycare, index, shards):
+    return len(daycare.dogs), sum(1 for owner_id in daycare.owners if shard_of(owner_id, shards) == index)
+
+
+COMMANDS = {
+    "register_dog": _register_dog,
+    "home_owners": _home_owners,
+    "dog_page": _dog_page,
+    "counts": _counts,
+}
+
+
+def _serve_shard(connection, name, address, options):
+    daycare = Daycare(name, address, **options)
+    while True:
+        try:
+            request = connection.recv()
+        except EOFError:
+            return
+        if request is None: return
+
+        method, args = request
+        try:
+            command = COMMANDS.get(method)
+            result = command(daycare, *args) if command is not None else getattr(daycare, method)(*args)
+            connection.send((True, result))
+        except Exception as e:
+            connection.send((False, e))
+
+
+class ShardedDaycare:
+    def __init__(self, name, address, shards=None, **options):
+        self.__name = name
+        self.__address = address
+        self.__shard_count = shards or multiprocessing.cpu_count()
+        self.__connections = []
+        self.__processes = []
+        for _ in range(self.__shard_count):
+            parent, child = multiprocessing.Pipe()
+            process = multiprocessing.Process(target=_serve_shard, args=(child, name, address, options), daemon=True)
+            process.start()
+            child.close()
+            self.__connections.append(parent)
+            self.__processes.append(process)
+        self.__available_activities = ["Play Time", "Walking", "Training", "Socialization", "Resting"]
+
+    @property
+    def name(self): return self.__name
+
+    @property
+    def address(self): return self.__address
+
+    @property
+    def available_activities(self): return self.__available_activities.copy()
+
+    @property
+    def shard_count(self): return self.__shard_count
+
+    @property
+    def dogs(self): return MappingProxyType(self.get_all_dogs())
+
+    @property
+    def owners(self): return MappingProxyType(self.get_all_owners())
+
+    def close(self):
+        for connection, process in zip(self.__connections, self.__processes):
+            try:
+                connection.send(None)
+            except (BrokenPipeError, OSError):
+                pass
+            process.join()
+            connection.close()
+        self.__connections = []
+        self.__processes = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def __shard(self, key):
+        return shard_of(key, self.__shard_count)
+
+    def __call(self, index, method, *args):
+        return self.__scatter({index: (method, args)})[index]
+
+    def __scatter(self, requests):
+        # Send every request before waiting on any reply so shards work in parallel
+        connections = self.__connections
+        for index, request in requests.items():
+            connections[index].send(request)
+        results = {}
+        error = None
+        for index in requests:
+            ok, result = connections[index].recv()
+            if ok:
+                results[index] = result
+            elif error is None:
+                error = result
+        if error is not None:
+            raise error
+        return results
+
+    def __broadcast(self, method, *args):
+        return self.__scatter({index: (method, args) for index in range(self.__shard_count)})
+
+    def get_dog_count(self):
+        return sum(counts[0] for counts in self.__counts())
+
+    def get_owner_count(self):
+        return sum(counts[1] for counts in self.__counts())
+
+    def __counts(self):
+        shards = self.__shard_count
+        return self.__scatter({index: ("counts", (index, shards)) for index in range(shards)}).values()
+
+    def add_dog(self, dog):
+        return self.__call(self.__shard(dog.dog_id), "add_dog", dog)
+
+    def add_dogs(self, dogs):
+        groups = {}
+        for dog in dogs:
+            groups.setdefault(self.__shard(dog.dog_id), []).append(dog)
+        return sum(self.__scatter({index: ("add_dogs", (group,)) for index, group in groups.items()}).values())
+
+    def add_owner(self, owner):
+        # The home shard owns the record; dog shards hold a replica for check-in validation
+        # Replicas are only written once the home insert succeeds, so a rejected
+        # duplicate never reaches a dog shard
+        home = self.__shard(owner.owner_id)
+        if not self.__call(home, "add_owner", owner): return False
+        replicas = {self.__shard(dog_id) for dog_id in owner.iter_dogs()} - {home}
+        if replicas:
+            self.__scatter({index: ("add_owner", (owner,)) for index in replicas})
+        return True
+
+    def add_owners(self, owners):
+        add_owner = self.add_owner
+        return sum(1 for owner in owners if add_owner(owner))
+
+    def register_dog(self, owner_id, dog_id):
+        owner = self.get_owner(owner_id)
+        dog = self.get_dog(dog_id)
+        if owner is None or dog is None or owner.has_dog(dog_id): return False
+
+        owner.register_dog(dog)
+        requests = {index: ("register_dog", (owner, dog)) for index in (self.__shard(owner_id), self.__shard(dog_id))}
+        self.__scatter(requests)
+        return True
+
+    def check_in_dog(self, dog_id, owner_id):
+        return self.__call(self.__shard(dog_id), "check_in_dog", dog_id, owner_id)
+
+    def check_out_dog(self, dog_id, owner_id):
+        return self.__call(self.__shard(dog_id), "check_out_dog", dog_id, owner_id)
+
+    def try_check_in(self, dog_id, owner_id):
+        return self.__call(self.__shard(dog_id), "try_check_in", dog_id, owner_id)
+
+    def try_check_out(self, dog_id, owner_id):
+        return self.__call(self.__shard(dog_id), "try_check_out", dog_id, owner_id)
+
+    def check_in_many(self, pairs):
+        return self.__transition_many("check_in_many", pairs)
+
+    def check_out_many(self, pairs):
+        return self.__transition_many("check_out_many", pairs)
+
+    def __transition_many(self, method, pairs):
+        # Split by dog shard, run the sub-batches in parallel and put the
+        # result codes back in request order
+        positions = {}
+        groups = {}
+        count = 0
+        for count, pair in enumerate(pairs, 1):
+            index = self.__shard(pair[0])
+            groups.setdefault(index, []).append(pair)
+            positions.setdefault(index, []).append(count - 1)
+        results = array('B', bytes(count))
+        for index, codes in self.__scatter({index: (method, (group,)) for index, group in groups.items()}).items():
+            for position, code in zip(positions[index], codes):
+                results[position] = code
+        return results
+
+    def get_checked_in_dogs(self):
+        checked_in = {}
+        for dogs in self.__broadcast("get_checked_in_dogs").values():
+            checked_in.update(dogs)
+        return checked_in
+
+    def get_checked_in_count(self):
+        return sum(self.__broadcast("get_checked_in_count").values())
+
+    def search_dog_by_name(self, name):
+        if name is None:
+            raise ValueError("Search name cannot be None")
+
+        matches = {}
+        for dogs in self.__broadcast("search_dog_by_name", name).values():
+            matches.update(dogs)
+        return matches
+
+    def search_dog_by_breed(self, breed):
+        if breed is None:
+            raise ValueError("Search breed cannot be None")
+
+        matches = {}
+        for dogs in self.__broadcast("search_dog_by_breed", breed).values():
+            matches.update(dogs)
+        return matches
+
+    def suggest_breeds(self, prefix, limit=10):
+        if prefix is None:
+            raise ValueError("Breed prefix cannot be None")
+
+        breeds = {}
+        for suggestions in self.__broadcast("suggest_breeds", prefix, limit).values():
+            for breed in suggestions:
+                breeds.setdefault(breed.lower(), breed)
+        return [breeds[key] for key in sorted(breeds)[:limit]]
+
+    def get_dog(self, dog_id):
+        return self.__call(self.__shard(dog_id), "get_dog", dog_id)
+
+    def get_owner(self, owner_id):
+        return self.__call(self.__shard(owner_id), "get_owner", owner_id)
+
+    def get_all_dogs(self):
+        dogs = {}
+        for shard_dogs in self.__broadcast("get_all_dogs").values():
+            dogs.update(shard_dogs)
+        return dogs
+
+    def get_all_owners(self):
+        shards = self.__shard_count
+        owners = {}
+        for shard_owners in self.__scatter({index: ("home_owners", (index, shards)) for index in range(shards)}).values():
+            owners.update((owner.owner_id, owner) for owner in shard_owners)
+        return owners
+
+    def iter_dogs(self, after=None, limit=None, dog_type=None, checked_in=None):
+        # Shards are walked in order; a cursor's hash names the shard to resume in
+        filters = {"dog_type": dog_type, "checked_in": checked_in}
+        first = 0 if after is None else self.__shard(after)
+        remaining = limit
+        for index in range(first, self.__shard_count):
+            if remaining is not None and remaining <= 0: return
+            page = self.__call(index, "dog_page", after if index == first else None, remaining, filters)
+            yield from page
+            if remaining is not None: remaining -= len(page)
+
+    def iter_owners(self, after=None, limit=None):
+        first = 0 if after is None else self.__shard(after)
+        remaining = limit
+        for index in range(first, self.__shard_count):
+            if remaining is not None and remaining <= 0: return
+            page = self.__call(index, "home_owners", index, self.__shard_count,
+                               after if index == first else None, remaining)
+            yield from page
+            if remaining is not None: remaining -= len(page)
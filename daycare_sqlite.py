@@ -0,0 +1,341 @@
+"""
+Dog Daycare Management System - SQLite-backed Daycare
+"""
+
+import sqlite3
+import weakref
+from array import array
+from collections import OrderedDict
+from contextlib import contextmanager
+
+from dog_daycare_management_system import DOG_TYPES, CheckResult, LargeDog, Owner, SmallDog, failure_for
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS dogs (
+    seq INTEGER PRIMARY KEY,
+    dog_id TEXT NOT NULL UNIQUE,
+    type_code TEXT NOT NULL,
+    name TEXT NOT NULL,
+    name_key TEXT NOT NULL,
+    breed TEXT NOT NULL,
+    breed_key TEXT NOT NULL,
+    age INTEGER NOT NULL,
+    weight REAL NOT NULL,
+    extra TEXT,
+    checked_in INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS dogs_name_key ON dogs (name_key);
+CREATE INDEX IF NOT EXISTS dogs_breed_key ON dogs (breed_key);
+CREATE INDEX IF NOT EXISTS dogs_checked_in ON dogs (checked_in) WHERE checked_in = 1;
+CREATE TABLE IF NOT EXISTS owners (
+    seq INTEGER PRIMARY KEY,
+    owner_id TEXT NOT NULL UNIQUE,
+    name TEXT NOT NULL,
+    email TEXT NOT NULL,
+    phone TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS owner_dogs (
+    seq INTEGER PRIMARY KEY,
+    owner_id TEXT NOT NULL,
+    dog_id TEXT NOT NULL,
+    UNIQUE (owner_id, dog_id)
+);
+"""
+
+# Statement texts are module constants so sqlite3's statement cache reuses
+# the prepared statements across calls
+DOG_COLUMNS = "dog_id, type_code, name, breed, age, weight, extra, checked_in"
+INSERT_DOG = ("INSERT OR IGNORE INTO dogs (dog_id, type_code, name, name_key, breed, breed_key, "
+              "age, weight, extra, checked_in) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)")
+INSERT_OWNER = "INSERT OR IGNORE INTO owners (owner_id, name, email, phone) VALUES (?, ?, ?, ?)"
+INSERT_OWNER_DOG = "INSERT OR IGNORE INTO owner_dogs (owner_id, dog_id) VALUES (?, ?)"
+UPDATE_CHECKED_IN = "UPDATE dogs SET checked_in = ? WHERE dog_id = ?"
+SELECT_DOG = f"SELECT {DOG_COLUMNS} FROM dogs WHERE dog_id = ?"
+SELECT_OWNER = "SELECT owner_id, name, email, phone FROM owners WHERE owner_id = ?"
+SELECT_OWNER_EXISTS = "SELECT 1 FROM owners WHERE owner_id = ?"
+SELECT_OWNER_DOGS = "SELECT dog_id FROM owner_dogs WHERE owner_id = ? ORDER BY seq"
+SELECT_REGISTERED = "SELECT 1 FROM owner_dogs WHERE owner_id = ? AND dog_id = ?"
+# Substring search cannot use an index and scans dogs; prefix search is a
+# range over dogs_name_key
+SELECT_BY_NAME = f"SELECT {DOG_COLUMNS} FROM dogs WHERE instr(name_key, ?) > 0 ORDER BY seq"
+SELECT_BY_NAME_PREFIX = f"SELECT {DOG_COLUMNS} FROM dogs WHERE name_key >= ? AND name_key < ? ORDER BY seq"
+SELECT_BY_BREED = (f"SELECT {DOG_COLUMNS} FROM dogs WHERE breed_key IN "
+                   "(SELECT DISTINCT breed_key FROM dogs WHERE instr(breed_key, ?) > 0) ORDER BY seq")
+SELECT_CHECKED_IN = f"SELECT {DOG_COLUMNS} FROM dogs WHERE checked_in = 1 ORDER BY seq"
+SELECT_ALL_DOGS = f"SELECT {DOG_COLUMNS} FROM dogs ORDER BY seq"
+SELECT_ALL_OWNERS = "SELECT owner_id FROM owners ORDER BY seq"
+
+
+class SQLiteDaycare:
+    def __init__(self, name, address, path=":memory:", cache_size=4096, quiet=False, failure_log=None):
+        self.__name = name
+        self.__address = address
+        self.__available_activities = ["Play Time", "Walking", "Training", "Socialization", "Resting"]
+        # Autocommit connection; transaction() groups writes into one commit
+        self.__connection = sqlite3.connect(path, isolation_level=None)
+        self.__connection.execute("PRAGMA journal_mode=WAL")
+        self.__connection.execute("PRAGMA synchronous=NORMAL")
+        self.__connection.executescript(SCHEMA)
+        self.__transaction_depth = 0
+        self.__cache_size = cache_size
+        # The LRU caches pin hot objects; the weak identity maps make sure a
+        # dog or owner still held by a caller is never materialized twice
+        self.__dog_cache = OrderedDict()
+        self.__owner_cache = OrderedDict()
+        self.__live_dogs = weakref.WeakValueDictionary()
+        self.__live_owners = weakref.WeakValueDictionary()
+        self.__status_listener = self.__dog_status_changed
+        # Failed check-ins/outs are reported like Daycare's: to the failure
+        # log if set, else printed unless quiet
+        self.__quiet = quiet
+        self.__failure_log = failure_log
+
+    @property
+    def name(self): return self.__name
+
+    @property
+    def address(self): return self.__address
+
+    @property
+    def available_activities(self): return self.__available_activities.copy()
+
+    def get_dog_count(self):
+        return self.__connection.execute("SELECT COUNT(*) FROM dogs").fetchone()[0]
+
+    def get_owner_count(self):
+        return self.__connection.execute("SELECT COUNT(*) FROM owners").fetchone()[0]
+
+    def close(self):
+        self.__connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    @contextmanager
+    def transaction(self):
+        if self.__transaction_depth:
+            self.__transaction_depth += 1
+            try:
+                yield self
+            finally:
+                self.__transaction_depth -= 1
+            return
+
+        self.__connection.execute("BEGIN")
+        self.__transaction_depth = 1
+        try:
+            yield self
+        except BaseException:
+            self.__connection.execute("ROLLBACK")
+            # Cached objects may hold state that was just rolled back
+            self.__dog_cache.clear()
+            self.__owner_cache.clear()
+            self.__live_dogs.clear()
+            self.__live_owners.clear()
+            raise
+        else:
+            self.__connection.execute("COMMIT")
+        finally:
+            self.__transaction_depth = 0
+
+    def __cache(self, cache, key, value):
+        cache[key] = value
+        if len(cache) > self.__cache_size:
+            cache.popitem(last=False)
+
+    def __cached_dog(self, dog_id):
+        dog = self.__dog_cache.get(dog_id)
+        if dog is not None:
+            self.__dog_cache.move_to_end(dog_id)
+            return dog
+
+        dog = self.__live_dogs.get(dog_id)
+        if dog is not None:
+            self.__cache(self.__dog_cache, dog_id, dog)
+        return dog
+
+    def __remember_dog(self, dog):
+        self.__live_dogs[dog.dog_id] = dog
+        self.__cache(self.__dog_cache, dog.dog_id, dog)
+
+    def __dog_from_row(self, row):
+        dog_id, type_code, name, breed, age, weight, extra, checked_in = row
+        dog = self.__cached_dog(dog_id)
+        if dog is not None: return dog
+
+        dog_class = DOG_TYPES[type_code]
+        if extra is None:
+            dog = dog_class(dog_id, name, breed, age, weight, bool(checked_in))
+        else:
+            dog = dog_class(dog_id, name, breed, age, weight, bool(checked_in), extra)
+        dog.add_status_listener(self.__status_listener)
+        self.__remember_dog(dog)
+        return dog
+
+    def __dog_status_changed(self, dog):
+        self.__connection.execute(UPDATE_CHECKED_IN, (1 if dog.is_checked_in else 0, dog.dog_id))
+
+    def add_dog(self, dog):
+        if isinstance(dog, SmallDog):
+            extra = dog.toy_preference
+        elif isinstance(dog, LargeDog):
+            extra = dog.exercise_needs
+        else:
+            extra = None
+
+        cursor = self.__connection.execute(INSERT_DOG, (
+            dog.dog_id, dog.type_code, dog.name, dog.name.lower(), dog.breed, dog.breed.lower(),
+            dog.age, dog.weight, extra, 1 if dog.is_checked_in else 0))
+        if cursor.rowcount != 1: return False
+
+        dog.add_status_listener(self.__status_listener)
+        self.__remember_dog(dog)
+        return True
+
+    def add_dogs(self, dogs):
+        with self.transaction():
+            add_dog = self.add_dog
+            return sum(1 for dog in dogs if add_dog(dog))
+
+    def add_owner(self, owner):
+        with self.transaction():
+            cursor = self.__connection.execute(INSERT_OWNER, (owner.owner_id, owner.name, owner.email, owner.phone))
+            if cursor.rowcount != 1: return False
+
+            self.__connection.executemany(INSERT_OWNER_DOG, ((owner.owner_id, dog_id) for dog_id in owner.iter_dogs()))
+        self.__remember_owner(owner)
+        return True
+
+    def add_owners(self, owners):
+        with self.transaction():
+            add_owner = self.add_owner
+            return sum(1 for owner in owners if add_owner(owner))
+
+    def register_dog(self, owner_id, dog_id):
+        owner = self.get_owner(owner_id)
+        dog = self.get_dog(dog_id)
+        if owner is None or dog is None: return False
+        if not owner.register_dog(dog): return False
+
+        self.__connection.execute(INSERT_OWNER_DOG, (owner_id, dog_id))
+        return True
+
+    def __transition(self, dog_id, owner_id, checking_in):
+        dog = self.get_dog(dog_id)
+        if dog is None:
+            return CheckResult.DOG_NOT_FOUND, None
+
+        execute = self.__connection.execute
+        if owner_id not in self.__live_owners and execute(SELECT_OWNER_EXISTS, (owner_id,)).fetchone() is None:
+            return CheckResult.OWNER_NOT_FOUND, dog
+        if bool(dog.is_checked_in) is checking_in:
+            return (CheckResult.ALREADY_CHECKED_IN if checking_in else CheckResult.NOT_CHECKED_IN), dog
+        if execute(SELECT_REGISTERED, (owner_id, dog_id)).fetchone() is None:
+            return CheckResult.NOT_REGISTERED, dog
+
+        # The status listener writes the new state through to the dogs table
+        if checking_in:
+            if not dog.check_in(): return CheckResult.ALREADY_CHECKED_IN, dog
+        elif not dog.check_out():
+            return CheckResult.NOT_CHECKED_IN, dog
+        return CheckResult.OK, dog
+
+    def try_check_in(self, dog_id, owner_id):
+        return self.__transition(dog_id, owner_id, True)[0]
+
+    def try_check_out(self, dog_id, owner_id):
+        return self.__transition(dog_id, owner_id, False)[0]
+
+    def check_in_dog(self, dog_id, owner_id):
+        return self.__reported(*self.__transition(dog_id, owner_id, True), dog_id, owner_id)
+
+    def check_out_dog(self, dog_id, owner_id):
+        return self.__reported(*self.__transition(dog_id, owner_id, False), dog_id, owner_id)
+
+    def __reported(self, code, dog, dog_id, owner_id):
+        if code is CheckResult.OK: return True
+
+        dog_name = dog.name if dog is not None else None
+        if self.__failure_log is not None:
+            self.__failure_log.record(code, dog_id, owner_id, dog_name)
+        elif not self.__quiet:
+            print(failure_for(code, dog_id, owner_id, dog_name))
+        return False
+
+    def check_in_many(self, pairs):
+        with self.transaction():
+            return array('B', (self.__transition(dog_id, owner_id, True)[0] for dog_id, owner_id in pairs))
+
+    def check_out_many(self, pairs):
+        with self.transaction():
+            return array('B', (self.__transition(dog_id, owner_id, False)[0] for dog_id, owner_id in pairs))
+
+    def __dogs_from_query(self, sql, parameters=()):
+        dog_from_row = self.__dog_from_row
+        return {row[0]: dog_from_row(row) for row in self.__connection.execute(sql, parameters)}
+
+    def get_checked_in_dogs(self):
+        return self.__dogs_from_query(SELECT_CHECKED_IN)
+
+    def get_checked_in_count(self):
+        return self.__connection.execute("SELECT COUNT(*) FROM dogs WHERE checked_in = 1").fetchone()[0]
+
+    def search_dog_by_name(self, name):
+        if name is None:
+            raise ValueError("Search name cannot be None")
+
+        return self.__dogs_from_query(SELECT_BY_NAME, (name.lower(),))
+
+    def search_dog_by_name_prefix(self, prefix):
+        if prefix is None:
+            raise ValueError("Search prefix cannot be None")
+
+        key = prefix.lower()
+        return self.__dogs_from_query(SELECT_BY_NAME_PREFIX, (key, key + chr(0x10FFFF)))
+
+    def search_dog_by_breed(self, breed):
+        if breed is None:
+            raise ValueError("Search breed cannot be None")
+
+        return self.__dogs_from_query(SELECT_BY_BREED, (breed.lower(),))
+
+    def get_dog(self, dog_id):
+        dog = self.__cached_dog(dog_id)
+        if dog is not None: return dog
+
+        row = self.__connection.execute(SELECT_DOG, (dog_id,)).fetchone()
+        return self.__dog_from_row(row) if row is not None else None
+
+    def __remember_owner(self, owner):
+        self.__live_owners[owner.owner_id] = owner
+        self.__cache(self.__owner_cache, owner.owner_id, owner)
+
+    def get_owner(self, owner_id):
+        owner = self.__owner_cache.get(owner_id)
+        if owner is not None:
+            self.__owner_cache.move_to_end(owner_id)
+            return owner
+
+        owner = self.__live_owners.get(owner_id)
+        if owner is not None:
+            self.__cache(self.__owner_cache, owner_id, owner)
+            return owner
+
+        execute = self.__connection.execute
+        row = execute(SELECT_OWNER, (owner_id,)).fetchone()
+        if row is None: return None
+
+        dog_ids = [dog_id for (dog_id,) in execute(SELECT_OWNER_DOGS, (owner_id,))]
+        owner = Owner(*row, dog_ids)
+        self.__remember_owner(owner)
+        return owner
+
+    def get_all_dogs(self):
+        return self.__dogs_from_query(SELECT_ALL_DOGS)
+
+    def get_all_owners(self):
+        get_owner = self.get_owner
+        return {owner_id: get_owner(owner_id) for (owner_id,) in self.__connection.execute(SELECT_ALL_OWNERS).fetchall()}
@@ -3,16 +3,144 @@ Dog Daycare Management System
 """
 
 import datetime
+import sys
+import threading
+from array import array
+from collections import deque
+from enum import IntEnum
+from types import MappingProxyType
+
+from daycare_cache import LRUCache
+from daycare_columns import DogColumns
+from daycare_indexes import (BreedIndex, FuzzyIndex, IntervalTree, SortedIndex, TimelineIndex, TrigramIndex,
+                             normalize, text_of)
+from daycare_query import DogQuery
+
+
+class CheckResult(IntEnum):
+    OK = 0
+    DOG_NOT_FOUND = 1
+    OWNER_NOT_FOUND = 2
+    ALREADY_CHECKED_IN = 3
+    NOT_CHECKED_IN = 4
+    NOT_REGISTERED = 5
+    ALREADY_REGISTERED = 6
+
+
+class DaycareException(Exception):
+    code = None
+    message = "{dog_id}"
+    
+    def __init__(self, dog_id=None, owner_id=None, dog_name=None):
+        super().__init__(self.message.format(dog_id=dog_id, owner_id=owner_id, dog_name=dog_name))
+        self.dog_id = dog_id
+        self.owner_id = owner_id
+
+
+class DogNotFoundException(DaycareException):
+    code = CheckResult.DOG_NOT_FOUND
+    message = "Dog with ID {dog_id} not found"
+
+
+class OwnerNotFoundException(DaycareException):
+    code = CheckResult.OWNER_NOT_FOUND
+    message = "Owner with ID {owner_id} not found"
+
+
+class DogAlreadyCheckedInException(DaycareException):
+    code = CheckResult.ALREADY_CHECKED_IN
+    message = "Dog '{dog_name}' is already checked in"
+
+
+class DogNotCheckedInException(DaycareException):
+    code = CheckResult.NOT_CHECKED_IN
+    message = "Dog '{dog_name}' is not checked in"
+
+
+class DogNotRegisteredException(DaycareException):
+    code = CheckResult.NOT_REGISTERED
+    message = "Dog '{dog_name}' is not registered to this owner"
+
+
+class DogAlreadyRegisteredException(DaycareException):
+    code = CheckResult.ALREADY_REGISTERED
+    message = "Dog '{dog_name}' is already registered"
+
+
+class InvalidInputException(DaycareException, ValueError):
+    def __init__(self, message):
+        ValueError.__init__(self, message)
+        self.dog_id = None
+        self.owner_id = None
+
+
+FAILURES = {exception.code: exception for exception in (
+    DogNotFoundException, OwnerNotFoundException, DogAlreadyCheckedInException, DogNotCheckedInException,
+    DogNotRegisteredException, DogAlreadyRegisteredException)}
+
+
+def failure_for(code, dog_id=None, owner_id=None, dog_name=None):
+    # The exception for a failed CheckResult; its message is what the print paths show
+    return FAILURES[code](dog_id, owner_id, dog_name)
+
+
+class FailureLog:
+    def __init__(self, stream=None, batch_size=None):
+        # Entries are stored raw and only formatted on flush, so recording does
+        # no I/O; with a batch_size, every batch_size-th record flushes
+        self.__stream = stream
+        self.__batch_size = batch_size
+        self.__pending = []
+    
+    @property
+    def pending(self): return len(self.__pending)
+    
+    def record(self, code, dog_id=None, owner_id=None, dog_name=None):
+        self.__pending.append((code, dog_id, owner_id, dog_name))
+        if self.__batch_size is not None and len(self.__pending) >= self.__batch_size:
+            self.flush()
+    
+    def exceptions(self):
+        return [failure_for(*entry) for entry in self.__pending]
+    
+    def flush(self):
+        pending, self.__pending = self.__pending, []
+        if pending:
+            stream = sys.stdout if self.__stream is None else self.__stream
+            stream.write("".join(f"{failure_for(*entry)}\n" for entry in pending))
+        return len(pending)
+
+
+class _NullLock:
+    # Stand-in for threading.Lock when a Daycare is not in thread-safe mode
+    def __enter__(self): return self
+    
+    def __exit__(self, exc_type, exc, tb): return False
+
+
+NULL_LOCK = _NullLock()
+LOCK_STRIPES = 64
+# Striped by dog: guard each dog's check-in flag, whichever path flips it
+DOG_STATE_LOCKS = [threading.RLock() for _ in range(LOCK_STRIPES)]
+
+# Events passed to Daycare listeners as listener(event, dog)
+DOG_ADDED = "added"
+DOG_CHECKED_IN = "checked_in"
+DOG_CHECKED_OUT = "checked_out"
 
 
 class Dog:
+    __slots__ = ("__dog_id", "__name", "__breed", "__age", "__weight", "__is_checked_in", "__status_listeners",
+                 "__display", "__weakref__")
+    type_code = "D"
+    
     def __init__(self, dog_id, name, breed, age, weight, is_checked_in=False):
         # Basic validation
         if not isinstance(age, int) or age <= 0:
-            raise ValueError("Age must be a positive integer")
+            raise InvalidInputException("Age must be a positive integer")
         
         if not isinstance(weight, (int, float)) or weight <= 0:
-            raise ValueError("Weight must be a positive number")
+            raise InvalidInputException("Weight must be a positive number")
             
         self.__dog_id = dog_id
         self.__name = name
@@ -20,6 +148,8 @@ class Dog:
         self.__age = age
         self.__weight = weight
         self.__is_checked_in = is_checked_in
+        self.__status_listeners = ()
+        self.__display = None
     
     @property
     def dog_id(self): return self.__dog_id
@@ -40,24 +170,60 @@ class Dog:
     def is_checked_in(self): return self.__is_checked_in
     
     @is_checked_in.setter
-    def is_checked_in(self, value): self.__is_checked_in = value
+    def is_checked_in(self, value): self.__set_checked_in(value)
     
-    def check_in(self):
-        if self.__is_checked_in: return False
-        self.__is_checked_in = True
+    def add_status_listener(self, listener):
+        self.__status_listeners = self.__status_listeners + (listener,)
+    
+    def remove_status_listener(self, listener):
+        listeners = list(self.__status_listeners)
+        listeners.remove(listener)
+        self.__status_listeners = tuple(listeners)
+    
+    def __set_checked_in(self, value, required=None):
+        # Check and flip happen under the dog's lock, so Owner.pickup_dog or a
+        # direct check_out racing a Daycare sees exactly one winner
+        with DOG_STATE_LOCKS[hash(self) % LOCK_STRIPES]:
+            if required is not None and bool(self.__is_checked_in) is not required: return False
+            changed = bool(value) != bool(self.__is_checked_in)
+            self.__is_checked_in = value
+            # Listeners (e.g. a Daycare's checked-in index) see every state
+            # change, in order
+            if changed:
+                self.__display = None
+                for listener in self.__status_listeners:
+                    listener(self)
         return True
     
+    def __reduce__(self):
+        # Pickled copies (e.g. sent to another process) start without listeners
+        return type(self), (self.__dog_id, self.__name, self.__breed, self.__age, self.__weight, self.__is_checked_in)
+    
+    def check_in(self):
+        return self.__set_checked_in(True, required=False)
+    
     def check_out(self):
-        if not self.__is_checked_in: return False
-        self.__is_checked_in = False
-        return True
+        return self.__set_checked_in(False, required=True)
     
-    def display_info(self):
+    def _cached_display(self, render):
+        # One cached string per dog: subclasses cache their full line here
+        # rather than keeping the base line as well
+        if self.__display is None:
+            self.__display = render()
+        return self.__display
+    
+    def _basic_info(self):
         status = "Checked In" if self.__is_checked_in else "Not Checked In"
         return f"{self.__dog_id} | {self.__name} ({self.__breed}) | {self.__age} years | {self.__weight} lbs | Status: {status}"
+    
+    def display_info(self):
+        return self._cached_display(self._basic_info)
 
 
 class SmallDog(Dog):
+    __slots__ = ("__toy_preference",)
+    type_code = "S"
+    
     def __init__(self, dog_id, name, breed, age, weight, is_checked_in=False, toy_preference="None"):
         super().__init__(dog_id, name, breed, age, weight, is_checked_in)
         self.__toy_preference = toy_preference
@@ -65,12 +231,21 @@ class SmallDog(Dog):
     @property
     def toy_preference(self): return self.__toy_preference
     
+    def __reduce__(self):
+        return type(self), (self.dog_id, self.name, self.breed, self.age, self.weight, self.is_checked_in,
+                            self.__toy_preference)
+    
+    def __render(self):
+        return f"{self._basic_info()} | Toy Preference: {self.__toy_preference}"
+    
     def display_info(self):
-        basic_info = super().display_info()
-        return f"{basic_info} | Toy Preference: {self.__toy_preference}"
+        return self._cached_display(self.__render)
 
 
 class LargeDog(Dog):
+    __slots__ = ("__exercise_needs",)
+    type_code = "L"
+    
     def __init__(self, dog_id, name, breed, age, weight, is_checked_in=False, exercise_needs="Medium"):
         super().__init__(dog_id, name, breed, age, weight, is_checked_in)
         self.__exercise_needs = exercise_needs
@@ -78,26 +253,36 @@ class LargeDog(Dog):
     @property
     def exercise_needs(self): return self.__exercise_needs
     
+    def __reduce__(self):
+        return type(self), (self.dog_id, self.name, self.breed, self.age, self.weight, self.is_checked_in,
+                            self.__exercise_needs)
+    
+    def __render(self):
+        return f"{self._basic_info()} | Exercise Needs: {self.__exercise_needs}"
+    
     def display_info(self):
-        basic_info = super().display_info()
-        return f"{basic_info} | Exercise Needs: {self.__exercise_needs}"
+        return self._cached_display(self.__render)
 
 
 class Owner:
+    __slots__ = ("__owner_id", "__name", "__email", "__phone", "__dogs_registered", "__display", "__weakref__")
+    
     def __init__(self, owner_id, name, email, phone, dogs_registered=None):
         # Simple email validation
         if not '@' in email or not '.' in email.split('@')[1]:
-            raise ValueError("Invalid email format")
+            raise InvalidInputException("Invalid email format")
         
         # Simple phone validation
         if not self.__is_valid_phone(phone):
-            raise ValueError("Invalid phone format (should be ###-###-####)")
+            raise InvalidInputException("Invalid phone format (should be ###-###-####)")
             
         self.__owner_id = owner_id
         self.__name = name
         self.__email = email
         self.__phone = phone
-        self.__dogs_registered = dogs_registered if dogs_registered is not None else []
+        # Insertion-ordered set of dog IDs (dict keys) for O(1) membership checks
+        self.__dogs_registered = dict.fromkeys(dogs_registered) if dogs_registered is not None else {}
+        self.__display = None
     
     def __is_valid_phone(self, phone):
         # Check if phone is in format ###-###-####
@@ -124,42 +309,135 @@ class Owner:
     def phone(self): return self.__phone
     
     @property
-    def dogs_registered(self): return self.__dogs_registered.copy()
+    def dogs_registered(self): return list(self.__dogs_registered)
     
-    def register_dog(self, dog):
-        if dog.dog_id in self.__dogs_registered:
-            print(f"Dog '{dog.name}' is already registered")
-            return False
+    def has_dog(self, dog_id):
+        return dog_id in self.__dogs_registered
+    
+    def iter_dogs(self):
+        return iter(self.__dogs_registered)
+    
+    def try_register_dog(self, dog):
+        if dog.dog_id in self.__dogs_registered: return CheckResult.ALREADY_REGISTERED
         
-        self.__dogs_registered.append(dog.dog_id)
-        return True
+        self.__dogs_registered[dog.dog_id] = None
+        self.__display = None
+        return CheckResult.OK
+    
+    def register_dog(self, dog):
+        return self.__reported(self.try_register_dog(dog), dog)
+    
+    def try_pickup_dog(self, dog):
+        if dog.dog_id not in self.__dogs_registered: return CheckResult.NOT_REGISTERED
+        if not dog.check_out(): return CheckResult.NOT_CHECKED_IN
+        return CheckResult.OK
     
     def pickup_dog(self, dog):
-        if dog.dog_id not in self.__dogs_registered:
-            print(f"Dog '{dog.name}' is not registered to this owner")
-            return False
-        
-        if not dog.is_checked_in:
-            print(f"Dog '{dog.name}' is not checked in")
-            return False
-        
-        if dog.check_out():
-            return True
+        return self.__reported(self.try_pickup_dog(dog), dog)
+    
+    def __reported(self, code, dog):
+        if code is CheckResult.OK: return True
+        print(failure_for(code, dog.dog_id, self.__owner_id, dog.name))
         return False
     
     def display_info(self):
-        return f"{self.__owner_id} | {self.__name} | {self.__email} | {self.__phone} | Dogs registered: {len(self.__dogs_registered)}"
+        if self.__display is None:
+            self.__display = f"{self.__owner_id} | {self.__name} | {self.__email} | {self.__phone} | Dogs registered: {len(self.__dogs_registered)}"
+        return self.__display
+
+
+class Visit:
+    __slots__ = ("__dog_id", "__owner_id", "__start", "__end")
+    
+    def __init__(self, dog_id, start, owner_id=None, end=None):
+        self.__dog_id = dog_id
+        self.__owner_id = owner_id
+        self.__start = start
+        self.__end = end
+    
+    @property
+    def dog_id(self): return self.__dog_id
+    
+    @property
+    def owner_id(self): return self.__owner_id
+    
+    @owner_id.setter
+    def owner_id(self, value): self.__owner_id = value
+    
+    @property
+    def start(self): return self.__start
+    
+    @property
+    def end(self): return self.__end
+    
+    @property
+    def is_open(self): return self.__end is None
+    
+    def close(self, end):
+        self.__end = end
+    
+    def display_info(self):
+        end = self.__end.strftime("%Y-%m-%d %H:%M") if self.__end is not None else "on site"
+        return f"{self.__dog_id} | {self.__start.strftime('%Y-%m-%d %H:%M')} - {end} | Owner: {self.__owner_id}"
 
 
 class Daycare:
     dog_count = 0
     owner_count = 0
+    __count_lock = threading.Lock()
     
-    def __init__(self, name, address):
+    def __init__(self, name, address, columnar=False, thread_safe=False, clock=datetime.datetime.now,
+                 cache_size=1024, quiet=False, failure_log=None):
         self.__name = name
         self.__address = address
         self.__dogs = {}
         self.__owners = {}
+        # Dense row order backing cursor pagination
+        self.__dog_ids = []
+        self.__dog_rows = {}
+        self.__owner_ids = []
+        self.__owner_rows = {}
+        self.__dogs_view = MappingProxyType(self.__dogs)
+        self.__owners_view = MappingProxyType(self.__owners)
+        self.__name_index = TrigramIndex()
+        self.__fuzzy_index = FuzzyIndex()
+        self.__breed_index = BreedIndex()
+        self.__weight_index = SortedIndex()
+        self.__age_index = SortedIndex()
+        self.__type_index = {}
+        # Every Dog class seen per type code, so of_type() plans cover
+        # subclasses whether or not they define their own code
+        self.__type_classes = {}
+        self.__checked_in = {}
+        # Search results are cached as dog ID tuples stamped with the registry
+        # version, which every successful add_dog bumps
+        self.__registry_version = 0
+        self.__search_cache = LRUCache(cache_size)
+        self.__columns = DogColumns() if columnar else None
+        self.__status_listener = self.__dog_status_changed
+        self.__listeners = ()
+        # Visit history: open visits by dog, closed ones in an interval tree
+        # for point/window queries and per-dog timelines for hour totals.
+        # Closed visits are queued and indexed on the next history query
+        self.__clock = clock
+        self.__open_visits = {}
+        self.__closed_visits = deque()
+        self.__visit_tree = IntervalTree()
+        self.__timelines = TimelineIndex()
+        # Writers serialize registry inserts and lock one stripe per dog for
+        # state transitions; readers never take a lock
+        if thread_safe:
+            self.__registry_lock = threading.Lock()
+            self.__stripes = [threading.Lock() for _ in range(LOCK_STRIPES)]
+            self.__visit_lock = threading.Lock()
+        else:
+            self.__registry_lock = NULL_LOCK
+            self.__stripes = [NULL_LOCK]
+            self.__visit_lock = NULL_LOCK
+        # Failed check-ins/outs go to the failure log if set, else are
+        # printed unless quiet
+        self.__quiet = quiet
+        self.__failure_log = failure_log
         self.__available_activities = ["Play Time", "Walking", "Training", "Socialization", "Resting"]
     
     @property
@@ -171,6 +449,22 @@ class Daycare:
     @property
     def available_activities(self): return self.__available_activities.copy()
     
+    @property
+    def columns(self): return self.__columns
+    
+    @property
+    def dogs(self): return self.__dogs_view
+    
+    @property
+    def owners(self): return self.__owners_view
+    
+    @property
+    def num_dogs(self): return len(self.__dogs)
+    
+    @property
+    def num_owners(self): return len(self.__owners)
+    
+    # Process-wide totals across every Daycare instance
     @staticmethod
     def get_dog_count(): return Daycare.dog_count
     
@@ -178,81 +472,387 @@ class Daycare:
     def get_owner_count(): return Daycare.owner_count
     
     def add_dog(self, dog):
-        if dog.dog_id in self.__dogs: return False
-        
-        self.__dogs[dog.dog_id] = dog
-        Daycare.dog_count += 1
+        with self.__registry_lock:
+            if dog.dog_id in self.__dogs: return False
+            
+            # Everything that can fail is worked out before the first write,
+            # so a rejected dog leaves the registry as it was
+            name = normalize(text_of(dog.name))
+            breed = text_of(dog.breed)
+            visit = Visit(dog.dog_id, self.__clock()) if dog.is_checked_in else None
+            
+            # Check-in paths only take a stripe lock, so everything a state
+            # change touches is in place before the dog becomes visible; the
+            # search indexes follow so their IDs always resolve
+            if self.__columns is not None:
+                self.__columns.append(dog)
+            dog.add_status_listener(self.__status_listener)
+            if visit is not None:
+                self.__checked_in[dog.dog_id] = dog
+                self.__open_visits[dog.dog_id] = visit
+            self.__dogs[dog.dog_id] = dog
+            self.__dog_rows[dog.dog_id] = len(self.__dog_ids)
+            self.__dog_ids.append(dog.dog_id)
+            self.__name_index.add(dog.dog_id, name)
+            self.__fuzzy_index.add(dog.dog_id, name)
+            self.__breed_index.add(dog.dog_id, breed)
+            self.__weight_index.add(dog.weight, dog.dog_id)
+            self.__age_index.add(dog.age, dog.dog_id)
+            self.__type_index.setdefault(dog.type_code, {})[dog.dog_id] = None
+            self.__type_classes.setdefault(dog.type_code, {})[type(dog)] = None
+            self.__registry_version += 1
+        with Daycare.__count_lock:
+            Daycare.dog_count += 1
+        self.__announce((dog,))
         return True
     
+    def add_dogs(self, dogs):
+        # Bulk add_dog: the batch is keyed up front the same way, then each
+        # index is built in one pass over it instead of one insert per dog
+        with self.__registry_lock:
+            batch = {}
+            for dog in dogs:
+                if dog.dog_id not in self.__dogs and dog.dog_id not in batch:
+                    batch[dog.dog_id] = dog
+            if not batch: return 0
+            
+            added = list(batch.values())
+            names = [normalize(text_of(dog.name)) for dog in added]
+            breeds = [text_of(dog.breed) for dog in added]
+            arrived = self.__clock() if any(dog.is_checked_in for dog in added) else None
+            
+            if self.__columns is not None:
+                self.__columns.extend(added)
+            status_listener = self.__status_listener
+            for dog_id, dog in batch.items():
+                dog.add_status_listener(status_listener)
+                if dog.is_checked_in:
+                    self.__checked_in[dog_id] = dog
+                    self.__open_visits[dog_id] = Visit(dog_id, arrived)
+            self.__dogs.update(batch)
+            first_row = len(self.__dog_ids)
+            self.__dog_rows.update(zip(batch, range(first_row, first_row + len(added))))
+            self.__dog_ids.extend(batch)
+            self.__name_index.update(zip(batch, names))
+            self.__fuzzy_index.update(zip(batch, names))
+            self.__breed_index.update(zip(batch, breeds))
+            self.__weight_index.update((dog.weight, dog_id) for dog_id, dog in batch.items())
+            self.__age_index.update((dog.age, dog_id) for dog_id, dog in batch.items())
+            type_index = self.__type_index
+            type_classes = self.__type_classes
+            for dog_id, dog in batch.items():
+                type_index.setdefault(dog.type_code, {})[dog_id] = None
+                type_classes.setdefault(dog.type_code, {})[type(dog)] = None
+            self.__registry_version += 1
+        with Daycare.__count_lock:
+            Daycare.dog_count += len(added)
+        self.__announce(added)
+        return len(added)
+    
+    def __announce(self, dogs):
+        listeners = self.__listeners
+        for dog in dogs:
+            for listener in listeners:
+                listener(DOG_ADDED, dog)
+            # A dog added while already checked in is reported as checking in
+            # too, so listeners that count check-ins see it before its check-out
+            if dog.is_checked_in:
+                for listener in listeners:
+                    listener(DOG_CHECKED_IN, dog)
+    
     def add_owner(self, owner):
-        if owner.owner_id in self.__owners: return False
-        
-        self.__owners[owner.owner_id] = owner
-        Daycare.owner_count += 1
+        with self.__registry_lock:
+            if owner.owner_id in self.__owners: return False
+            
+            self.__owners[owner.owner_id] = owner
+            self.__owner_rows[owner.owner_id] = len(self.__owner_ids)
+            self.__owner_ids.append(owner.owner_id)
+        with Daycare.__count_lock:
+            Daycare.owner_count += 1
         return True
     
-    def check_in_dog(self, dog_id, owner_id):
-        if dog_id not in self.__dogs:
-            print(f"Dog with ID {dog_id} not found")
-            return False
-        
-        if owner_id not in self.__owners:
-            print(f"Owner with ID {owner_id} not found")
-            return False
-        
-        dog = self.__dogs[dog_id]
-        owner = self.__owners[owner_id]
-        
-        if dog.is_checked_in:
-            print(f"Dog '{dog.name}' is already checked in")
-            return False
+    def add_owners(self, owners):
+        add_owner = self.add_owner
+        return sum(1 for owner in owners if add_owner(owner))
+    
+    def add_listener(self, listener):
+        self.__listeners = self.__listeners + (listener,)
+    
+    def remove_listener(self, listener):
+        listeners = list(self.__listeners)
+        listeners.remove(listener)
+        self.__listeners = tuple(listeners)
+    
+    def __lock_for(self, dog_id):
+        stripes = self.__stripes
+        return stripes[hash(dog_id) % len(stripes)]
+    
+    def try_check_in(self, dog_id, owner_id):
+        with self.__lock_for(dog_id):
+            dog = self.__dogs.get(dog_id)
+            if dog is None: return CheckResult.DOG_NOT_FOUND
+            owner = self.__owners.get(owner_id)
+            if owner is None: return CheckResult.OWNER_NOT_FOUND
+            if dog.is_checked_in: return CheckResult.ALREADY_CHECKED_IN
+            if not owner.has_dog(dog_id): return CheckResult.NOT_REGISTERED
             
-        if dog_id not in owner.dogs_registered:
-            print(f"Dog '{dog.name}' is not registered to this owner")
-            return False
-        
-        return dog.check_in()
+            # The dog's own lock settles a race with a direct Dog/Owner call
+            if not dog.check_in(): return CheckResult.ALREADY_CHECKED_IN
+            self.__open_visits[dog_id].owner_id = owner_id
+            return CheckResult.OK
+    
+    def try_check_out(self, dog_id, owner_id):
+        with self.__lock_for(dog_id):
+            dog = self.__dogs.get(dog_id)
+            if dog is None: return CheckResult.DOG_NOT_FOUND
+            owner = self.__owners.get(owner_id)
+            if owner is None: return CheckResult.OWNER_NOT_FOUND
+            if not dog.is_checked_in: return CheckResult.NOT_CHECKED_IN
+            if not owner.has_dog(dog_id): return CheckResult.NOT_REGISTERED
+            
+            if not dog.check_out(): return CheckResult.NOT_CHECKED_IN
+            return CheckResult.OK
+    
+    def check_in_dog(self, dog_id, owner_id):
+        return self.__reported(self.try_check_in(dog_id, owner_id), dog_id, owner_id)
     
     def check_out_dog(self, dog_id, owner_id):
-        if dog_id not in self.__dogs:
-            print(f"Dog with ID {dog_id} not found")
-            return False
+        return self.__reported(self.try_check_out(dog_id, owner_id), dog_id, owner_id)
+    
+    def __reported(self, code, dog_id, owner_id):
+        if code is CheckResult.OK: return True
         
-        if owner_id not in self.__owners:
-            print(f"Owner with ID {owner_id} not found")
-            return False
+        dog = self.__dogs.get(dog_id)
+        dog_name = dog.name if dog is not None else None
+        if self.__failure_log is not None:
+            self.__failure_log.record(code, dog_id, owner_id, dog_name)
+        elif not self.__quiet:
+            print(failure_for(code, dog_id, owner_id, dog_name))
+        return False
+    
+    def check_in_many(self, pairs):
+        return self.__transition_many(pairs, True)
+    
+    def check_out_many(self, pairs):
+        return self.__transition_many(pairs, False)
+    
+    def __transition_many(self, pairs, checking_in):
+        # One pass over (dog_id, owner_id) pairs with no per-item output; each
+        # item sees the effect of earlier items in the same batch
+        results = array('B')
+        append = results.append
+        get_dog = self.__dogs.get
+        get_owner = self.__owners.get
+        ok = CheckResult.OK.value
+        dog_not_found = CheckResult.DOG_NOT_FOUND.value
+        owner_not_found = CheckResult.OWNER_NOT_FOUND.value
+        wrong_state = (CheckResult.ALREADY_CHECKED_IN if checking_in else CheckResult.NOT_CHECKED_IN).value
+        not_registered = CheckResult.NOT_REGISTERED.value
         
-        dog = self.__dogs[dog_id]
-        owner = self.__owners[owner_id]
+        lock_for = self.__lock_for
+        open_visits = self.__open_visits
         
-        if not dog.is_checked_in:
-            print(f"Dog '{dog.name}' is not checked in")
-            return False
+        for dog_id, owner_id in pairs:
+            dog = get_dog(dog_id)
+            if dog is None:
+                append(dog_not_found)
+                continue
             
-        if dog_id not in owner.dogs_registered:
-            print(f"Dog '{dog.name}' is not registered to this owner")
-            return False
+            owner = get_owner(owner_id)
+            if owner is None:
+                append(owner_not_found)
+                continue
+            
+            with lock_for(dog_id):
+                if bool(dog.is_checked_in) is checking_in:
+                    append(wrong_state)
+                elif not owner.has_dog(dog_id):
+                    append(not_registered)
+                elif checking_in:
+                    if dog.check_in():
+                        open_visits[dog_id].owner_id = owner_id
+                        append(ok)
+                    else:
+                        append(wrong_state)
+                else:
+                    append(ok if dog.check_out() else wrong_state)
+        return results
+    
+    def __dog_status_changed(self, dog):
+        if dog.is_checked_in:
+            self.__checked_in[dog.dog_id] = dog
+            self.__open_visits[dog.dog_id] = Visit(dog.dog_id, self.__clock())
+        else:
+            self.__checked_in.pop(dog.dog_id, None)
+            self.__close_visit(dog.dog_id)
+        if self.__columns is not None:
+            self.__columns.set_checked_in(dog.dog_id, dog.is_checked_in)
+        event = DOG_CHECKED_IN if dog.is_checked_in else DOG_CHECKED_OUT
+        for listener in self.__listeners:
+            listener(event, dog)
+    
+    def __close_visit(self, dog_id):
+        visit = self.__open_visits.pop(dog_id, None)
+        if visit is None: return
         
-        return dog.check_out()
+        visit.close(self.__clock())
+        self.__closed_visits.append(visit)
+    
+    def __index_visits(self):
+        closed = self.__closed_visits
+        tree = self.__visit_tree
+        timelines = self.__timelines
+        while closed:
+            visit = closed.popleft()
+            tree.add(visit.start, visit.end, visit)
+            timelines.add(visit.dog_id, visit.start, visit.end, visit)
+    
+    def get_visits(self, dog_id):
+        with self.__visit_lock:
+            self.__index_visits()
+            visits = self.__timelines.values(dog_id)
+        visit = self.__open_visits.get(dog_id)
+        if visit is not None:
+            visits.append(visit)
+        return visits
+    
+    def visits_overlapping(self, start, end):
+        with self.__visit_lock:
+            self.__index_visits()
+            visits = self.__visit_tree.overlapping(start, end)
+        visits.extend(visit for visit in tuple(self.__open_visits.values()) if visit.start <= end)
+        return visits
+    
+    def dogs_present_at(self, when):
+        dogs = self.__dogs
+        return {visit.dog_id: dogs[visit.dog_id] for visit in self.visits_overlapping(when, when)}
+    
+    def hours_on_site(self, dog_id, start, end):
+        with self.__visit_lock:
+            self.__index_visits()
+            seconds = self.__timelines.total_seconds(dog_id, start, end)
+        visit = self.__open_visits.get(dog_id)
+        if visit is not None:
+            # The open visit counts up to now
+            seconds += max(0.0, (min(self.__clock(), end) - max(visit.start, start)).total_seconds())
+        return seconds / 3600
+    
+    def monthly_hours(self, dog_id, year, month):
+        start = datetime.datetime(year, month, 1)
+        end = datetime.datetime(year + month // 12, month % 12 + 1, 1)
+        return self.hours_on_site(dog_id, start, end)
     
     def get_checked_in_dogs(self):
-        return {dog_id: dog for dog_id, dog in self.__dogs.items() if dog.is_checked_in}
+        return dict(self.__checked_in)
+    
+    def get_checked_in_count(self):
+        return len(self.__checked_in)
     
     def search_dog_by_name(self, name):
         if name is None:
             raise ValueError("Search name cannot be None")
             
-        name = name.lower()
-        return {dog_id: dog for dog_id, dog in self.__dogs.items() 
-                if name in dog.name.lower()}
+        dogs = self.__dogs
+        matches = self.__cached(("name", normalize(name)), self.__name_index.search, name)
+        return {dog_id: dogs[dog_id] for dog_id in matches}
+    
+    def search_dog_by_name_fuzzy(self, name, limit=5, max_distance=2):
+        if name is None:
+            raise ValueError("Search name cannot be None")
+        
+        dogs = self.__dogs
+        matches = self.__cached(("fuzzy", normalize(name), limit, max_distance),
+                                self.__fuzzy_index.search, name, limit, max_distance)
+        return [(dogs[dog_id], distance) for dog_id, distance in matches]
     
     def search_dog_by_breed(self, breed):
         if breed is None:
             raise ValueError("Search breed cannot be None")
         
-        breed = breed.lower()
-        return {dog_id: dog for dog_id, dog in self.__dogs.items() 
-                if breed in dog.breed.lower()}
+        dogs = self.__dogs
+        matches = self.__cached(("breed", normalize(breed)), self.__breed_index.search, breed)
+        return {dog_id: dogs[dog_id] for dog_id in matches}
+    
+    def __cached(self, key, search, *args):
+        # The version is read before searching so a concurrent add_dog leaves
+        # the stored entry stale rather than wrong
+        version = self.__registry_version
+        result = self.__search_cache.get(key, version)
+        if result is None:
+            result = tuple(search(*args))
+            self.__search_cache.put(key, version, result)
+        return result
+    
+    def cache_stats(self):
+        return self.__search_cache.stats()
+    
+    def suggest_breeds(self, prefix, limit=10):
+        if prefix is None:
+            raise ValueError("Breed prefix cannot be None")
+        
+        return self.__breed_index.starts_with(prefix, limit)
+    
+    def find_dogs_by_weight(self, low, high):
+        # Inclusive range in weight order; None leaves that end open
+        dogs = self.__dogs
+        return {dog_id: dogs[dog_id] for dog_id in self.__weight_index.between(low, high)}
+    
+    def find_dogs_by_age(self, low, high):
+        dogs = self.__dogs
+        return {dog_id: dogs[dog_id] for dog_id in self.__age_index.between(low, high)}
+    
+    def query(self):
+        return DogQuery(self)
+    
+    def _plan_query(self, predicates):
+        # Returns (index name, dog ID iterable) for the most selective index
+        # among the predicates given; the rest are applied as filters
+        plans = []
+        if "name" in predicates:
+            name = predicates["name"]
+            plans.append((self.__name_index.estimate(name), "name", lambda: self.__name_index.search(name)))
+        if "breed" in predicates:
+            breed = predicates["breed"]
+            plans.append((self.__breed_index.count(breed), "breed", lambda: self.__breed_index.search(breed)))
+        if predicates.get("checked_in"):
+            plans.append((len(self.__checked_in), "checked_in", lambda: tuple(self.__checked_in)))
+        if "dog_type" in predicates:
+            dog_type = predicates["dog_type"]
+            # A code shared with other classes is filtered by isinstance later
+            codes = [code for code, classes in tuple(self.__type_classes.items())
+                     if any(issubclass(cls, dog_type) for cls in tuple(classes))]
+            buckets = [self.__type_index.get(code, {}) for code in codes]
+            plans.append((sum(map(len, buckets)), "type",
+                          lambda: [dog_id for bucket in buckets for dog_id in tuple(bucket)]))
+        for field, index in (("age", self.__age_index), ("weight", self.__weight_index)):
+            if field in predicates:
+                low, high = predicates[field]
+                plans.append((index.count_between(low, high), field,
+                              lambda index=index, low=low, high=high: index.between(low, high)))
+        if not plans:
+            return "scan", tuple(self.__dog_ids)
+        
+        _, label, source = min(plans, key=lambda plan: plan[0])
+        return label, source()
+    
+    def _run_query(self, predicates):
+        _, source = self._plan_query(predicates)
+        name = normalize(predicates["name"]) if "name" in predicates else None
+        breed = normalize(predicates["breed"]) if "breed" in predicates else None
+        dog_type = predicates.get("dog_type")
+        checked_in = predicates.get("checked_in")
+        age = predicates.get("age")
+        weight = predicates.get("weight")
+        dogs = self.__dogs
+        for dog_id in source:
+            dog = dogs[dog_id]
+            if name is not None and name not in normalize(text_of(dog.name)): continue
+            if breed is not None and breed not in normalize(text_of(dog.breed)): continue
+            if dog_type is not None and not isinstance(dog, dog_type): continue
+            if checked_in is not None and bool(dog.is_checked_in) is not checked_in: continue
+            if age is not None and not _in_range(dog.age, *age): continue
+            if weight is not None and not _in_range(dog.weight, *weight): continue
+            yield dog
     
     def get_dog(self, dog_id): 
         return self.__dogs.get(dog_id)
@@ -265,6 +865,70 @@ class Daycare:
     
     def get_all_owners(self): 
         return self.__owners.copy()
+    
+    def iter_dogs(self, after=None, limit=None, dog_type=None, checked_in=None):
+        start = self.__start_row(self.__dog_rows, after)
+        ids = self.__dog_ids
+        dogs = self.__dogs
+        remaining = limit
+        for row in range(start, len(ids)):
+            if remaining is not None and remaining <= 0: return
+            dog = dogs[ids[row]]
+            if dog_type is not None and not isinstance(dog, dog_type): continue
+            if checked_in is not None and bool(dog.is_checked_in) is not checked_in: continue
+            yield dog
+            if remaining is not None: remaining -= 1
+    
+    def iter_owners(self, after=None, limit=None):
+        start = self.__start_row(self.__owner_rows, after)
+        end = len(self.__owner_ids) if limit is None else min(start + limit, len(self.__owner_ids))
+        owners = self.__owners
+        for owner_id in self.__owner_ids[start:end]:
+            yield owners[owner_id]
+    
+    @staticmethod
+    def __start_row(rows, after):
+        if after is None: return 0
+        if after not in rows:
+            raise ValueError(f"Unknown cursor: {after}")
+        return rows[after] + 1
+
+
+def _in_range(value, low, high):
+    return (low is None or value >= low) and (high is None or value <= high)
+
+
+DOG_TYPES = {cls.type_code: cls for cls in (Dog, SmallDog, LargeDog)}
+PAGE_SIZE = 20
+
+
+def _render(items, stream):
+    # Same bytes as one print() per item, in a single write
+    lines = [item.display_info() for item in items]
+    if lines:
+        (sys.stdout if stream is None else stream).write("\n".join(lines) + "\n")
+    return len(lines)
+
+
+def render_dogs(dogs, stream=None):
+    return _render(dogs, stream)
+
+
+def render_owners(owners, stream=None):
+    return _render(owners, stream)
+
+
+def print_pages(fetch_page, cursor_of, page_size=PAGE_SIZE):
+    # Fetch one extra item per page to know whether another page follows
+    cursor = None
+    while True:
+        page = list(fetch_page(after=cursor, limit=page_size + 1))
+        _render(page[:page_size], None)
+        if len(page) <= page_size:
+            return
+        if input("Press Enter for more, or q to stop: ").strip().lower() == 'q':
+            return
+        cursor = cursor_of(page[page_size - 1])
 
 
 def main():
@@ -292,8 +956,8 @@ def main():
         print("\n===== DOG DAYCARE MANAGEMENT SYSTEM =====")
         print(f"Daycare Name: {daycare.name}")
         print(f"Address: {daycare.address}")
-        print(f"Total Dogs: {Daycare.get_dog_count()}")
-        print(f"Total Owners: {Daycare.get_owner_count()}")
+        print(f"Total Dogs: {daycare.num_dogs}")
+        print(f"Total Owners: {daycare.num_owners}")
         print("\nMenu:")
         print("1. Add New Dog")
         print("2. Add New Owner")
@@ -351,9 +1015,7 @@ def main():
                     register_dogs = input("Do you want to register dogs to this owner? (y/n): ").lower()
                     if register_dogs == 'y':
                         print("\nAvailable Dogs:")
-                        all_dogs = daycare.get_all_dogs()
-                        for dog in all_dogs.values():
-                            print(dog.display_info())
+                        print_pages(daycare.iter_dogs, lambda dog: dog.dog_id)
                         
                         dog_ids = input("Enter dog IDs to register (comma-separated): ").split(',')
                         for dog_id in dog_ids:
@@ -394,23 +1056,17 @@ def main():
             
             elif choice == 5:
                 # Display all dogs
-                dogs = daycare.get_all_dogs()
-                
-                if dogs:
+                if daycare.dogs:
                     print("\nAll Dogs:")
-                    for dog in dogs.values():
-                        print(dog.display_info())
+                    print_pages(daycare.iter_dogs, lambda dog: dog.dog_id)
                 else:
                     print("No dogs found.")
             
             elif choice == 6:
                 # Display all owners
-                owners = daycare.get_all_owners()
-                
-                if owners:
+                if daycare.owners:
                     print("\nAll Owners:")
-                    for owner in owners.values():
-                        print(owner.display_info())
+                    print_pages(daycare.iter_owners, lambda owner: owner.owner_id)
                 else:
                     print("No owners found.")
             
@@ -437,8 +1093,7 @@ def main():
                 
                 if dogs:
                     print("\nSearch Results:")
-                    for dog in dogs.values():
-                        print(dog.display_info())
+                    render_dogs(dogs.values())
                 else:
                     print("No matching dogs found.")
             
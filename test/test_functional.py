@@ -1,6 +1,6 @@
 import pytest
 from test.TestUtils import TestUtils
-from dog_daycare_management_system import Dog, SmallDog, LargeDog, Owner, Daycare
+from dog_daycare_management_system import Dog, SmallDog, LargeDog, Owner, Daycare, CheckResult
 import datetime
 
 class TestFunctional:
@@ -239,4 +239,1223 @@ class TestFunctional:
             TestUtils.yakshaAssert("test_integrated_daycare_functions", True, "functional")
         except Exception as e:
             TestUtils.yakshaAssert("test_integrated_daycare_functions", False, "functional")
+            raise e
+    
+    def test_owner_registration_store(self):
+        """Test set-backed owner registration lookups and ordering."""
+        try:
+            owner = Owner("O201", "Kennel Owner", "kennel@example.com", "555-222-3333", ["D203", "D201"])
+            dog = Dog("D202", "Scout", "Beagle", 2, 20.0)
+            assert owner.register_dog(dog) == True
+            
+            assert owner.has_dog("D201")
+            assert owner.has_dog("D202")
+            assert not owner.has_dog("D999")
+            assert list(owner.iter_dogs()) == ["D203", "D201", "D202"]
+            assert owner.dogs_registered == ["D203", "D201", "D202"]
+            
+            TestUtils.yakshaAssert("test_owner_registration_store", True, "functional")
+        except Exception as e:
+            TestUtils.yakshaAssert("test_owner_registration_store", False, "functional")
+            raise e
+    
+    def test_name_search_index(self):
+        """Test indexed name search keeps case-insensitive substring semantics."""
+        try:
+            daycare = Daycare("Index Daycare", "Index St")
+            for dog in [
+                Dog("D211", "Rocky", "Boxer", 3, 60.0),
+                Dog("D212", "Brock", "Boxer", 4, 62.0),
+                Dog("D213", "Roxy", "Poodle", 2, 30.0),
+                Dog("D214", "BROCCOLI", "Pug", 5, 18.0)
+            ]:
+                daycare.add_dog(dog)
+            
+            assert list(daycare.search_dog_by_name("roc")) == ["D211", "D212", "D214"]
+            assert list(daycare.search_dog_by_name("ock")) == ["D211", "D212"]
+            assert list(daycare.search_dog_by_name("ro")) == ["D211", "D212", "D213", "D214"]
+            assert daycare.search_dog_by_name("rocks") == {}
+            assert len(daycare.search_dog_by_name("")) == 4
+            
+            # A dog without a name is accepted and matches only the empty query
+            assert daycare.add_dog(Dog("D215", None, "Pug", 2, 3.0)) == True
+            assert "D215" not in daycare.search_dog_by_name("no")
+            assert "D215" in daycare.search_dog_by_name("")
+            assert [dog.dog_id for dog in daycare.query().breed("pug")] == ["D214", "D215"]
+            assert [dog.dog_id for dog in daycare.query().breed("pug").name("o")] == ["D214"]
+            
+            # A failed insert leaves nothing behind
+            def broken_clock():
+                raise RuntimeError("clock unavailable")
+            strict = Daycare("Strict Daycare", "Index St", columnar=True, clock=broken_clock)
+            with pytest.raises(RuntimeError):
+                strict.add_dog(Dog("D216", "Rocky", "Boxer", 3, 60.0, True))
+            assert strict.num_dogs == 0 and strict.get_checked_in_count() == 0
+            assert strict.search_dog_by_name("rock") == {} and len(strict.columns) == 0
+            assert strict.add_dog(Dog("D216", "Rocky", "Boxer", 3, 60.0)) == True
+            
+            TestUtils.yakshaAssert("test_name_search_index", True, "functional")
+        except Exception as e:
+            TestUtils.yakshaAssert("test_name_search_index", False, "functional")
+            raise e
+    
+    def test_breed_index_and_autocomplete(self):
+        """Test breed vocabulary search and prefix suggestions."""
+        try:
+            daycare = Daycare("Breed Daycare", "Breed St")
+            for dog in [
+                Dog("D221", "Sunny", "Golden Retriever", 3, 65.0),
+                Dog("D222", "Pip", "Bull Terrier", 4, 50.0),
+                Dog("D223", "Ace", "Labrador Retriever", 2, 70.0),
+                Dog("D224", "Dot", "Beagle", 5, 22.0),
+                Dog("D225", "Gus", "golden retriever", 6, 68.0)
+            ]:
+                daycare.add_dog(dog)
+            
+            assert list(daycare.search_dog_by_breed("RETRIEVER")) == ["D221", "D223", "D225"]
+            assert list(daycare.search_dog_by_breed("golden")) == ["D221", "D225"]
+            assert daycare.suggest_breeds("b") == ["Beagle", "Bull Terrier"]
+            assert daycare.suggest_breeds("GOL") == ["Golden Retriever"]
+            assert daycare.suggest_breeds("z") == []
+            
+            TestUtils.yakshaAssert("test_breed_index_and_autocomplete", True, "functional")
+        except Exception as e:
+            TestUtils.yakshaAssert("test_breed_index_and_autocomplete", False, "functional")
+            raise e
+    
+    def test_checked_in_index(self):
+        """Test the occupancy index follows every check-in state change."""
+        try:
+            daycare = Daycare("Occupancy Daycare", "Occupancy St")
+            dog1 = Dog("D231", "Benny", "Boxer", 3, 60.0)
+            dog2 = Dog("D232", "Molly", "Pug", 4, 18.0, True)
+            owner = Owner("O231", "Owner", "owner@example.com", "555-123-4567")
+            daycare.add_dog(dog1)
+            daycare.add_dog(dog2)
+            daycare.add_owner(owner)
+            owner.register_dog(dog1)
+            owner.register_dog(dog2)
+            
+            assert list(daycare.get_checked_in_dogs()) == ["D232"]
+            assert daycare.check_in_dog("D231", "O231") is True
+            assert daycare.get_checked_in_count() == 2
+            
+            assert owner.pickup_dog(dog2) == True
+            assert list(daycare.get_checked_in_dogs()) == ["D231"]
+            
+            dog2.is_checked_in = True
+            dog1.is_checked_in = False
+            assert list(daycare.get_checked_in_dogs()) == ["D232"]
+            assert daycare.get_checked_in_count() == 1
+            
+            TestUtils.yakshaAssert("test_checked_in_index", True, "functional")
+        except Exception as e:
+            TestUtils.yakshaAssert("test_checked_in_index", False, "functional")
+            raise e
+
+    
+    def test_bulk_check_in_and_out(self):
+        """Test bulk check-in/check-out status codes and applied transitions."""
+        try:
+            daycare = Daycare("Bulk Daycare", "Bulk St")
+            dog1 = Dog("D241", "Ziggy", "Boxer", 3, 60.0)
+            dog2 = Dog("D242", "Nala", "Pug", 4, 18.0)
+            owner = Owner("O241", "Owner", "owner@example.com", "555-123-4567")
+            daycare.add_dog(dog1)
+            daycare.add_dog(dog2)
+            daycare.add_owner(owner)
+            owner.register_dog(dog1)
+            
+            results = daycare.check_in_many([
+                ("D241", "O241"),
+                ("D241", "O241"),
+                ("D999", "O241"),
+                ("D242", "O999"),
+                ("D242", "O241")
+            ])
+            assert list(results) == [
+                CheckResult.OK,
+                CheckResult.ALREADY_CHECKED_IN,
+                CheckResult.DOG_NOT_FOUND,
+                CheckResult.OWNER_NOT_FOUND,
+                CheckResult.NOT_REGISTERED
+            ]
+            assert dog1.is_checked_in
+            assert list(daycare.get_checked_in_dogs()) == ["D241"]
+            
+            results = daycare.check_out_many([("D241", "O241"), ("D241", "O241")])
+            assert list(results) == [CheckResult.OK, CheckResult.NOT_CHECKED_IN]
+            assert daycare.get_checked_in_count() == 0
+            
+            TestUtils.yakshaAssert("test_bulk_check_in_and_out", True, "functional")
+        except Exception as e:
+            TestUtils.yakshaAssert("test_bulk_check_in_and_out", False, "functional")
+            raise e
+    
+    def test_streaming_import(self):
+        """Test record import dispatches dog types, links owners and rejects bad rows."""
+        try:
+            from daycare_import import import_dogs, import_owners
+            daycare = Daycare("Import Daycare", "Import St")
+            
+            owners = import_owners(daycare, [
+                {"owner_id": "O251", "name": "Ann", "email": "ann@example.com", "phone": "555-111-2222"},
+                {"owner_id": "O252", "name": "Bad", "email": "bad-email", "phone": "555-111-2222"}
+            ])
+            assert owners.loaded == 1
+            assert owners.rejected == [(2, "Invalid email format")]
+            
+            dogs = import_dogs(daycare, [
+                {"dog_id": "D251", "type": "S", "name": "Pip", "breed": "Pug", "age": "2", "weight": "14.5",
+                 "toy_preference": "Rope", "owner_id": "O251"},
+                {"dog_id": "D252", "type": "L", "name": "Tank", "breed": "Mastiff", "age": 5, "weight": 150},
+                {"dog_id": "D253", "type": "X", "name": "Odd", "breed": "Mutt", "age": 3, "weight": 30},
+                {"dog_id": "D254", "type": "D", "name": "Zero", "breed": "Mutt", "age": 0, "weight": 30},
+                {"dog_id": "D251", "type": "D", "name": "Copy", "breed": "Mutt", "age": 3, "weight": 30}
+            ], chunk_size=2)
+            assert dogs.loaded == 2
+            assert [row for row, reason in dogs.rejected] == [3, 4, 5]
+            assert isinstance(daycare.get_dog("D251"), SmallDog)
+            assert daycare.get_dog("D251").toy_preference == "Rope"
+            assert isinstance(daycare.get_dog("D252"), LargeDog)
+            assert daycare.get_owner("O251").dogs_registered == ["D251"]
+            
+            typed = import_dogs(daycare, [
+                {"dog_id": "D255", "name": 123, "breed": "Mutt", "age": 3, "weight": 30},
+                {"dog_id": "D256", "name": ["Rex"], "breed": "Mutt", "age": 3, "weight": 30},
+                {"dog_id": "D257", "name": "Flag", "breed": {"kind": "Mutt"}, "age": 3, "weight": 30},
+                {"dog_id": "D258", "name": "Link", "breed": "Mutt", "age": 3, "weight": 30, "owner_id": ["O251"]},
+                {"dog_id": "D259", "name": "Last", "breed": "Mutt", "age": 3, "weight": 30}
+            ])
+            assert typed.loaded == 2
+            assert typed.rejected == [(2, "Name must be text"), (3, "Breed must be text"), (4, "owner_id must be text")]
+            assert daycare.get_dog("D255").name == "123"
+            assert list(daycare.search_dog_by_name("123")) == ["D255"]
+            assert daycare.get_dog("D256") is None and daycare.get_dog("D259") is not None
+            
+            numeric = import_owners(daycare, [
+                {"owner_id": 253, "name": "Num", "email": "num@example.com", "phone": "555-111-2223"},
+                {"owner_id": ["O254"], "name": "List", "email": "list@example.com", "phone": "555-111-2224"},
+                {"owner_id": "O255", "name": "Last", "email": "last@example.com", "phone": "555-111-2225"}
+            ])
+            assert numeric.loaded == 2 and numeric.rejected == [(2, "owner_id must be text")]
+            linked = import_dogs(daycare, [
+                {"dog_id": "D260", "name": "Nums", "breed": "Mutt", "age": 3, "weight": 30, "owner_id": 253},
+                {"dog_id": "D261", "name": "Nan", "breed": "Mutt", "age": 3, "weight": "nan"},
+                {"dog_id": "D262", "name": "Inf", "breed": "Mutt", "age": 3, "weight": "inf"},
+                {"dog_id": "D263", "name": "Huge", "breed": "Mutt", "age": 3, "weight": 10 ** 400}
+            ])
+            assert linked.loaded == 1 and [row for row, reason in linked.rejected] == [2, 3, 4]
+            assert daycare.get_owner("253").dogs_registered == ["D260"]
+            
+            TestUtils.yakshaAssert("test_streaming_import", True, "functional")
+        except Exception as e:
+            TestUtils.yakshaAssert("test_streaming_import", False, "functional")
+            raise e
+    
+    def test_columnar_aggregates(self):
+        """Test columnar store aggregates and row views stay in sync with dogs."""
+        try:
+            daycare = Daycare("Column Daycare", "Column St", columnar=True)
+            dogs = [
+                LargeDog("D261", "Bruno", "Labrador", 4, 70.0, True, "High"),
+                LargeDog("D262", "Titan", "Labrador", 6, 90.0, False, "Low"),
+                LargeDog("D263", "Duke", "Boxer", 4, 60.0, True, "Medium"),
+                SmallDog("D264", "Pixie", "Pug", 2, 15.0, True, "Rope")
+            ]
+            for dog in dogs:
+                daycare.add_dog(dog)
+            columns = daycare.columns
+            
+            assert columns.count(dog_type=LargeDog, checked_in=True) == 2
+            assert columns.mean_weight(dog_type=LargeDog, checked_in=True) == 65.0
+            assert columns.age_distribution_by_breed(dog_type=LargeDog) == {"Labrador": {4: 1, 6: 1}, "Boxer": {4: 1}}
+            
+            dogs[0].check_out()
+            assert columns.mean_weight(dog_type=LargeDog, checked_in=True) == 60.0
+            assert columns.filter_rows(breed="labrador") == [0, 1]
+            
+            row = columns.view(columns.row_of("D263"))
+            assert row.name == "Duke"
+            assert row.is_checked_in
+            assert row.dog is dogs[2] and row.display_info() == dogs[2].display_info()
+            assert columns.count(dog_type=Dog) == 4 and columns.count(dog_type=SmallDog) == 1
+            assert columns.count(dog_type=Dog) == len(list(daycare.query().of_type(Dog)))
+            
+            # Ages beyond 32 bits fit; one beyond the column is rejected with no row written
+            assert daycare.add_dog(Dog("D265", "Elder", "Tortoise", 2 ** 40, 40.0)) == True
+            assert columns.mean_age(breed="tortoise") == 2 ** 40
+            with pytest.raises(ValueError):
+                daycare.add_dog(Dog("D266", "Ancient", "Tortoise", 2 ** 64, 40.0))
+            assert len(columns) == 5 and len(columns.ages) == len(columns.names) == 5
+            assert daycare.get_dog("D266") is None and daycare.add_dog(Dog("D266", "Ancient", "Tortoise", 9, 40.0))
+            assert Daycare("Plain", "Plain St").columns is None
+            
+            TestUtils.yakshaAssert("test_columnar_aggregates", True, "functional")
+        except Exception as e:
+            TestUtils.yakshaAssert("test_columnar_aggregates", False, "functional")
+            raise e
+    
+    def test_slotted_representation(self):
+        """Test dogs and owners are slotted while keeping properties and output."""
+        try:
+            small_dog = SmallDog("D271", "Coco", "Maltese", 2, 6.0, False, "Squeaky toys")
+            large_dog = LargeDog("D272", "Atlas", "Great Dane", 3, 140.0, True, "High")
+            owner = Owner("O271", "Slot Owner", "slot@example.com", "555-222-1111")
+            
+            for obj in (small_dog, large_dog, owner):
+                assert not hasattr(obj, "__dict__")
+            
+            assert small_dog.display_info() == "D271 | Coco (Maltese) | 2 years | 6.0 lbs | Status: Not Checked In | Toy Preference: Squeaky toys"
+            assert large_dog.display_info() == "D272 | Atlas (Great Dane) | 3 years | 140.0 lbs | Status: Checked In | Exercise Needs: High"
+            assert owner.display_info() == "O271 | Slot Owner | slot@example.com | 555-222-1111 | Dogs registered: 0"
+            
+            TestUtils.yakshaAssert("test_slotted_representation", True, "functional")
+        except Exception as e:
+            TestUtils.yakshaAssert("test_slotted_representation", False, "functional")
+            raise e
+    
+    def test_sqlite_daycare_persistence(self):
+        """Test the SQLite-backed daycare persists dogs, owners and check-ins."""
+        try:
+            import os
+            import tempfile
+            from daycare_sqlite import SQLiteDaycare
+            
+            with tempfile.TemporaryDirectory() as directory:
+                path = os.path.join(directory, "daycare.db")
+                with SQLiteDaycare("SQL Daycare", "SQL St", path) as daycare:
+                    dog1 = SmallDog("D281", "Lulu", "Shih Tzu", 3, 9.0, False, "Rope")
+                    dog2 = LargeDog("D282", "Hank", "Rottweiler", 5, 95.0, False, "High")
+                    owner = Owner("O281", "Sam", "sam@example.com", "555-321-9876")
+                    owner.register_dog(dog1)
+                    
+                    assert daycare.add_dogs([dog1, dog2, dog1]) == 2
+                    assert daycare.add_owner(owner) == True
+                    assert daycare.register_dog("O281", "D282") == True
+                    assert daycare.check_in_dog("D281", "O281") is True
+                    assert daycare.check_in_dog("D999", "O281") is False
+                    assert list(daycare.check_in_many([("D282", "O281"), ("D282", "O281")])) == [
+                        CheckResult.OK, CheckResult.ALREADY_CHECKED_IN]
+                    assert dog2.check_out() == True
+                
+                with SQLiteDaycare("SQL Daycare", "SQL St", path) as daycare:
+                    assert daycare.get_dog_count() == 2
+                    assert list(daycare.get_checked_in_dogs()) == ["D281"]
+                    assert daycare.get_dog("D282").exercise_needs == "High"
+                    assert daycare.get_owner("O281").dogs_registered == ["D281", "D282"]
+                    assert list(daycare.search_dog_by_name("LU")) == ["D281"]
+                    assert list(daycare.search_dog_by_name_prefix("lu")) == ["D281"]
+                    assert daycare.search_dog_by_name_prefix("ulu") == {}
+                    assert list(daycare.search_dog_by_name_prefix("")) == ["D281", "D282"]
+                    assert list(daycare.search_dog_by_breed("rott")) == ["D282"]
+            
+            TestUtils.yakshaAssert("test_sqlite_daycare_persistence", True, "functional")
+        except Exception as e:
+            TestUtils.yakshaAssert("test_sqlite_daycare_persistence", False, "functional")
+            raise e
+    
+    def test_journal_snapshot_and_replay(self):
+        """Test journaled mutations survive restart through snapshot plus journal tail."""
+        try:
+            import os
+            import tempfile
+            import time
+            from daycare_journal import JournaledDaycare
+            
+            with tempfile.TemporaryDirectory() as directory:
+                with JournaledDaycare("Journal Daycare", "Journal St", directory) as daycare:
+                    daycare.add_dog(SmallDog("D291", "Kiwi", "Papillon", 2, 8.0, False, "Feathers"))
+                    daycare.add_dog(LargeDog("D292", "Moose", "Newfoundland", 6, 130.0, False, "Low"))
+                    daycare.add_owner(Owner("O291", "Kim", "kim@example.com", "555-444-3333", ["D291"]))
+                    assert daycare.check_in_dog("D291", "O291") is True
+                    daycare.snapshot()
+                    
+                    assert daycare.register_dog("O291", "D292") == True
+                    assert daycare.check_in_dog("D292", "O291") is True
+                    assert daycare.check_out_dog("D291", "O291") is True
+                
+                with JournaledDaycare("Journal Daycare", "Journal St", directory) as daycare:
+                    assert len(daycare.get_all_dogs()) == 2
+                    assert list(daycare.get_checked_in_dogs()) == ["D292"]
+                    assert daycare.get_owner("O291").dogs_registered == ["D291", "D292"]
+                    assert daycare.get_dog("D291").toy_preference == "Feathers"
+                    assert daycare.get_dog("D292").exercise_needs == "Low"
+            
+            # A bulk snapshot load builds every index a dog-by-dog load would
+            with tempfile.TemporaryDirectory() as directory:
+                with JournaledDaycare("Bulk Daycare", "Journal St", directory) as daycare:
+                    daycare.add_dogs(Dog(f"D{2940 + i}", f"Pup{i % 7}", "Beagle" if i % 2 else "Pug", 1 + i % 9,
+                                         10.0 + i, i % 3 == 0) for i in range(60))
+                    daycare.snapshot()
+                with JournaledDaycare("Bulk Daycare", "Journal St", directory, columnar=True) as daycare:
+                    reference = Daycare("Reference", "Journal St")
+                    for i in range(60):
+                        reference.add_dog(Dog(f"D{2940 + i}", f"Pup{i % 7}", "Beagle" if i % 2 else "Pug", 1 + i % 9,
+                                              10.0 + i, i % 3 == 0))
+                    assert list(daycare.dogs) == list(reference.dogs)
+                    assert list(daycare.search_dog_by_name("pup3")) == list(reference.search_dog_by_name("pup3"))
+                    assert list(daycare.search_dog_by_breed("pug")) == list(reference.search_dog_by_breed("pug"))
+                    assert list(daycare.find_dogs_by_weight(20, 40)) == list(reference.find_dogs_by_weight(20, 40))
+                    assert list(daycare.find_dogs_by_age(3, 4)) == list(reference.find_dogs_by_age(3, 4))
+                    assert list(daycare.get_checked_in_dogs()) == list(reference.get_checked_in_dogs())
+                    assert daycare.columns.count(checked_in=True) == 20
+                    assert daycare.add_dogs([daycare.get_dog("D2941"), Dog("D3000", "New", "Pug", 2, 9.0)]) == 1
+                    assert daycare.get_dog("D2941").check_in() is True
+                with JournaledDaycare("Bulk Daycare", "Journal St", directory) as daycare:
+                    assert daycare.get_dog("D2941").is_checked_in and daycare.get_dog("D3000") is not None
+            
+            with tempfile.TemporaryDirectory() as directory:
+                with JournaledDaycare("Idle Daycare", "Journal St", directory, sync_interval=0.02) as daycare:
+                    daycare.add_dog(Dog("D293", "Idle", "Beagle", 3, 20.0))
+                    journal = os.path.join(directory, "journal.0")
+                    deadline = time.monotonic() + 2
+                    while os.path.getsize(journal) == 0 and time.monotonic() < deadline:
+                        time.sleep(0.01)
+                    assert os.path.getsize(journal) > 0
+            
+            TestUtils.yakshaAssert("test_journal_snapshot_and_replay", True, "functional")
+        except Exception as e:
+            TestUtils.yakshaAssert("test_journal_snapshot_and_replay", False, "functional")
+            raise e
+    
+    def test_mapped_registry_snapshot(self):
+        """Test the memory-mapped registry lazily materializes dogs and owners."""
+        try:
+            import os
+            import tempfile
+            from daycare_mmap import MappedRegistry, write_registry
+            
+            daycare = Daycare("Mapped Daycare", "Mapped St")
+            daycare.add_dog(SmallDog("D302", "Bijou", "Bichon Frise", 4, 11.0, True, "Plush"))
+            daycare.add_dog(LargeDog("D301", "Otto", "Bernese", 3, 105.0, False, "Medium"))
+            daycare.add_dog(Dog("D303", "Mutt", "Mixed", 2, 35.0))
+            daycare.add_owner(Owner("O301", "Lee", "lee@example.com", "555-909-8080", ["D302", "D301"]))
+            
+            with tempfile.TemporaryDirectory() as directory:
+                path = os.path.join(directory, "registry.bin")
+                write_registry(daycare, path)
+                with MappedRegistry(path) as registry:
+                    assert registry.get_dog_count() == 3
+                    assert registry.get_owner_count() == 1
+                    for dog_id in ("D301", "D302", "D303"):
+                        assert registry.get_dog(dog_id).display_info() == daycare.get_dog(dog_id).display_info()
+                    assert registry.get_dog("D301") is registry.get_dog("D301")
+                    assert registry.get_dog("D999") is None
+                    assert registry.get_owner("O301").dogs_registered == ["D302", "D301"]
+                    assert list(registry.get_checked_in_dogs()) == ["D302"]
+                    assert list(registry.iter_dog_ids()) == ["D301", "D302", "D303"]
+                
+                registry = MappedRegistry(path)
+                dog_ids = registry.iter_dog_ids()
+                assert next(dog_ids) == "D301"
+                registry.close()
+                with pytest.raises(ValueError):
+                    next(dog_ids)
+            
+            TestUtils.yakshaAssert("test_mapped_registry_snapshot", True, "functional")
+        except Exception as e:
+            TestUtils.yakshaAssert("test_mapped_registry_snapshot", False, "functional")
+            raise e
+    
+    def test_paginated_iteration_and_views(self):
+        """Test cursor pagination, filters and read-only registry views."""
+        try:
+            daycare = Daycare("Paging Daycare", "Paging St")
+            for i in range(1, 8):
+                dog_class = SmallDog if i % 2 else LargeDog
+                daycare.add_dog(dog_class(f"D31{i}", f"Pager {i}", "Mixed", 2, 20.0 + i, i <= 2))
+            daycare.add_owner(Owner("O311", "Pat", "pat@example.com", "555-777-1212"))
+            daycare.add_owner(Owner("O312", "Quinn", "quinn@example.com", "555-777-3434"))
+            
+            first = [dog.dog_id for dog in daycare.iter_dogs(limit=3)]
+            second = [dog.dog_id for dog in daycare.iter_dogs(after=first[-1], limit=3)]
+            last = [dog.dog_id for dog in daycare.iter_dogs(after=second[-1], limit=3)]
+            assert first == ["D311", "D312", "D313"]
+            assert second == ["D314", "D315", "D316"]
+            assert last == ["D317"]
+            
+            assert [dog.dog_id for dog in daycare.iter_dogs(dog_type=LargeDog, limit=2)] == ["D312", "D314"]
+            assert [dog.dog_id for dog in daycare.iter_dogs(checked_in=True)] == ["D311", "D312"]
+            assert [owner.owner_id for owner in daycare.iter_owners(after="O311")] == ["O312"]
+            
+            assert len(daycare.dogs) == 7
+            assert daycare.dogs["D313"].name == "Pager 3"
+            assert "O312" in daycare.owners
+            try:
+                daycare.dogs["D999"] = None
+                assert False, "Registry view should be read-only"
+            except TypeError:
+                pass
+            
+            try:
+                list(daycare.iter_dogs(after="D999"))
+                assert False, "Unknown cursor should be rejected"
+            except ValueError:
+                pass
+            
+            TestUtils.yakshaAssert("test_paginated_iteration_and_views", True, "functional")
+        except Exception as e:
+            TestUtils.yakshaAssert("test_paginated_iteration_and_views", False, "functional")
+            raise e
+    
+    def test_thread_safe_stress(self):
+        """Test concurrent check-ins, check-outs and inserts lose no updates."""
+        try:
+            import sys
+            import threading
+            from concurrent.futures import ThreadPoolExecutor
+            
+            daycare = Daycare("Kiosk Daycare", "Kiosk St", thread_safe=True)
+            owner = Owner("O321", "Kiosk Owner", "kiosk@example.com", "555-646-4646")
+            dogs = [Dog(f"D32{i:02d}", f"Kiosk {i}", "Mixed", 3, 30.0) for i in range(8)]
+            for dog in dogs:
+                daycare.add_dog(dog)
+                owner.register_dog(dog)
+            daycare.add_owner(owner)
+            
+            successes = {dog.dog_id: [0, 0] for dog in dogs}
+            tally_lock = threading.Lock()
+            
+            def kiosk(worker):
+                checked_in = checked_out = 0
+                local = {dog.dog_id: [0, 0] for dog in dogs}
+                for step in range(400):
+                    dog = dogs[(worker + step) % len(dogs)]
+                    dog_id = dog.dog_id
+                    if daycare.check_in_many([(dog_id, "O321")])[0] == CheckResult.OK:
+                        local[dog_id][0] += 1
+                    # Direct pickups race the Daycare path on the dog's own lock
+                    if step % 2:
+                        picked_up = daycare.check_out_many([(dog_id, "O321")])[0]
+                    else:
+                        picked_up = owner.try_pickup_dog(dog)
+                    if picked_up == CheckResult.OK:
+                        local[dog_id][1] += 1
+                    daycare.search_dog_by_name("kiosk")
+                    daycare.get_checked_in_dogs()
+                with tally_lock:
+                    for dog_id, (ins, outs) in local.items():
+                        successes[dog_id][0] += ins
+                        successes[dog_id][1] += outs
+            
+            def register(batch):
+                return sum(daycare.add_dog(Dog(f"N{i:04d}", "New", "Mixed", 1, 10.0)) for i in range(batch, batch + 50))
+            
+            interval = sys.getswitchinterval()
+            sys.setswitchinterval(1e-6)
+            try:
+                initial_count = Daycare.dog_count
+                with ThreadPoolExecutor(max_workers=16) as pool:
+                    kiosks = [pool.submit(kiosk, worker) for worker in range(16)]
+                    inserts = [pool.submit(register, batch) for batch in (0, 0, 25, 25, 50, 50)]
+                    for future in kiosks:
+                        future.result()
+                    inserted = sum(future.result() for future in inserts)
+            finally:
+                sys.setswitchinterval(interval)
+            
+            for dog in dogs:
+                ins, outs = successes[dog.dog_id]
+                assert ins - outs == (1 if dog.is_checked_in else 0)
+            assert sorted(daycare.get_checked_in_dogs()) == sorted(dog.dog_id for dog in dogs if dog.is_checked_in)
+            assert inserted == 100
+            assert Daycare.dog_count == initial_count + 100
+            assert len(daycare.dogs) == 108
+            
+            TestUtils.yakshaAssert("test_thread_safe_stress", True, "functional")
+        except Exception as e:
+            TestUtils.yakshaAssert("test_thread_safe_stress", False, "functional")
+            raise e
+    
+    def test_add_dog_visible_only_when_ready(self):
+        """Test a check-in racing add_dog never sees a half-added dog."""
+        try:
+            import threading
+            
+            daycare = Daycare("Race Daycare", "Interleave Ave", thread_safe=True)
+            owner = Owner("O1601", "Rae", "rae@example.com", "555-555-1601", ["D1601"])
+            daycare.add_owner(owner)
+            
+            reached = threading.Event()
+            release = threading.Event()
+            breed_index = daycare._Daycare__breed_index
+            
+            class SlowBreedIndex:
+                def __getattr__(self, name):
+                    return getattr(breed_index, name)
+                
+                def add(self, dog_id, breed):
+                    reached.set()
+                    release.wait(5)
+                    breed_index.add(dog_id, breed)
+            
+            daycare._Daycare__breed_index = SlowBreedIndex()
+            adder = threading.Thread(target=daycare.add_dog, args=(Dog("D1601", "Racer", "Whippet", 2, 30.0),))
+            adder.start()
+            try:
+                assert reached.wait(5)
+                assert daycare.check_in_dog("D1601", "O1601") is True
+            finally:
+                release.set()
+                adder.join()
+            
+            assert daycare.get_checked_in_count() == 1
+            assert list(daycare.search_dog_by_breed("whippet")) == ["D1601"]
+            
+            TestUtils.yakshaAssert("test_add_dog_visible_only_when_ready", True, "functional")
+        except Exception as e:
+            TestUtils.yakshaAssert("test_add_dog_visible_only_when_ready", False, "functional")
+            raise e
+    
+    def test_async_service_batching_and_coalescing(self):
+        """Test the JSON-lines service batches check-ins and coalesces identical searches."""
+        try:
+            import asyncio
+            import json
+            from daycare_service import DaycareService
+            
+            daycare = Daycare("Service Daycare", "Socket St", thread_safe=True)
+            
+            async def scenario():
+                service = DaycareService(daycare, batch_window=0.01, max_batch=64)
+                host, port = await service.start(port=0)
+                reader, writer = await asyncio.open_connection(host, port)
+                
+                async def call(requests):
+                    for request_id, request in enumerate(requests):
+                        writer.write(json.dumps(dict(request, id=request_id)).encode("utf-8") + b"\n")
+                    await writer.drain()
+                    responses = {}
+                    for _ in requests:
+                        response = json.loads(await reader.readline())
+                        responses[response["id"]] = response
+                    return [responses[i] for i in range(len(requests))]
+                
+                added = await call([{"op": "add_dog", "dog": {"dog_id": f"D41{i:02d}", "type": "small" if i % 2 else "dog",
+                                                              "name": f"Socket {i}", "breed": "Terrier", "age": 2, "weight": 12.0}}
+                                    for i in range(10)])
+                assert all(response["ok"] and response["result"] is True for response in added)
+                owner_response = (await call([{"op": "add_owner", "owner": {
+                    "owner_id": "O414", "name": "Service Owner", "email": "service@example.com",
+                    "phone": "555-414-4141", "dogs": [f"D41{i:02d}" for i in range(10)]}}]))[0]
+                assert owner_response["ok"]
+                
+                statuses = await call([{"op": "check_in", "dog_id": f"D41{i:02d}", "owner_id": "O414"} for i in range(10)] +
+                                      [{"op": "check_in", "dog_id": "D4100", "owner_id": "O414"},
+                                       {"op": "check_out", "dog_id": "D4101", "owner_id": "O414"},
+                                       {"op": "check_in", "dog_id": "D9999", "owner_id": "O414"}])
+                assert [response["result"] for response in statuses] == ["OK"] * 10 + [
+                    "ALREADY_CHECKED_IN", "OK", "DOG_NOT_FOUND"]
+                
+                searches = await call([{"op": "search_name", "query": "SOCKET"}] * 20 + [{"op": "search_breed", "query": "terr"}])
+                assert all(len(response["result"]) == 10 for response in searches)
+                assert searches[0]["result"][0]["dog_id"] == "D4100"
+                
+                checked_in = (await call([{"op": "checked_in"}]))[0]["result"]
+                assert len(checked_in) == 9 and "D4101" not in {dog["dog_id"] for dog in checked_in}
+                first_page, = await call([{"op": "list_dogs", "limit": 4}])
+                assert [dog["dog_id"] for dog in first_page["result"]["dogs"]] == ["D4100", "D4101", "D4102", "D4103"]
+                assert first_page["result"]["dogs"][1]["toy_preference"] == "None"
+                last_page, = await call([{"op": "list_dogs", "after": "D4107", "limit": 4}])
+                assert len(last_page["result"]["dogs"]) == 2 and last_page["result"]["next"] is None
+                bad, = await call([{"op": "fly"}])
+                assert not bad["ok"]
+                mixed = await call([{"op": "check_out", "dog_id": "D4102", "owner_id": "O414"},
+                                    {"op": "check_out", "dog_id": ["x"], "owner_id": "O414"},
+                                    {"op": "list_dogs", "limit": 0}])
+                assert mixed[0]["result"] == "OK" and not mixed[1]["ok"] and not mixed[2]["ok"]
+                await call([{"op": "check_in", "dog_id": "D4102", "owner_id": "O414"}])
+                
+                stats, = await call([{"op": "stats"}])
+                assert stats["result"]["batches"] < 15
+                assert stats["result"]["coalesced"] > 0
+                assert stats["result"]["p99_ms"] >= stats["result"]["p50_ms"] > 0
+                
+                writer.close()
+                await service.close()
+            
+            asyncio.run(scenario())
+            assert daycare.get_owner("O414").has_dog("D4109")
+            assert daycare.get_checked_in_count() == 9
+            
+            TestUtils.yakshaAssert("test_async_service_batching_and_coalescing", True, "functional")
+        except Exception as e:
+            TestUtils.yakshaAssert("test_async_service_batching_and_coalescing", False, "functional")
+            raise e
+    
+    def test_sharded_daycare_routing(self):
+        """Test the sharded router partitions by ID and scatter-gathers queries."""
+        try:
+            import pickle
+            from daycare_shards import ShardedDaycare, shard_of
+            
+            listened = Dog("D5000", "Pickle", "Pug", 2, 15.0)
+            listened.add_status_listener(lambda dog: None)
+            copy = pickle.loads(pickle.dumps(LargeDog("D5001", "Copy", "Husky", 4, 55.0, True, "High")))
+            assert copy.exercise_needs == "High" and copy.is_checked_in
+            assert pickle.loads(pickle.dumps(listened)).name == "Pickle"
+            
+            with ShardedDaycare("Sharded Daycare", "Shard Rd", shards=3) as daycare:
+                dogs = [SmallDog(f"D51{i:02d}", f"Shard {i}", "Beagle" if i % 2 else "Boxer", 2, 20.0) for i in range(30)]
+                assert daycare.add_dogs(dogs) == 30
+                assert daycare.add_dog(dogs[0]) is False
+                assert len({shard_of(dog.dog_id, 3) for dog in dogs}) == 3
+                owner = Owner("O510", "Shard Owner", "shard@example.com", "555-510-5100", [dog.dog_id for dog in dogs[:20]])
+                assert daycare.add_owner(owner)
+                assert daycare.register_dog("O510", "D5125")
+                assert daycare.register_dog("O510", "D5125") is False
+                assert daycare.add_owner(Owner("O520", "Real Owner", "real@example.com", "555-520-5200"))
+                stray = next(dog.dog_id for dog in dogs[26:] if shard_of(dog.dog_id, 3) != shard_of("O520", 3))
+                assert daycare.add_owner(Owner("O520", "Impostor", "fake@example.com", "555-520-5201", [stray])) is False
+                assert daycare.check_in_dog(stray, "O520") is False
+                assert daycare.get_dog_count() == 30 and daycare.get_owner_count() == 2
+                assert sorted(daycare.get_all_owners()) == ["O510", "O520"]
+                
+                pairs = [(dog.dog_id, "O510") for dog in dogs[:26]] + [("D9999", "O510"), ("D5100", "O999")]
+                results = daycare.check_in_many(pairs)
+                assert list(results) == [CheckResult.OK] * 20 + [CheckResult.NOT_REGISTERED] * 5 + [
+                    CheckResult.OK, CheckResult.DOG_NOT_FOUND, CheckResult.OWNER_NOT_FOUND]
+                assert daycare.check_out_dog("D5100", "O510")
+                assert daycare.get_checked_in_count() == 20
+                assert "D5100" not in daycare.get_checked_in_dogs()
+                
+                assert len(daycare.search_dog_by_name("shard")) == 30
+                assert set(daycare.search_dog_by_breed("beagle")) == {dog.dog_id for dog in dogs[1::2]}
+                assert daycare.suggest_breeds("b") == ["Beagle", "Boxer"]
+                assert daycare.get_dog("D5101").is_checked_in
+                
+                pages = []
+                cursor = None
+                while True:
+                    page = list(daycare.iter_dogs(after=cursor, limit=7))
+                    pages.extend(dog.dog_id for dog in page)
+                    if len(page) < 7: break
+                    cursor = page[-1].dog_id
+                assert sorted(pages) == sorted(dog.dog_id for dog in dogs)
+                assert len(list(daycare.iter_dogs(checked_in=True))) == 20
+            
+            TestUtils.yakshaAssert("test_sharded_daycare_routing", True, "functional")
+        except Exception as e:
+            TestUtils.yakshaAssert("test_sharded_daycare_routing", False, "functional")
+            raise e
+    
+    def test_instance_counts_and_chain(self):
+        """Test per-instance counts, Daycare events and chain-wide aggregation."""
+        try:
+            from daycare_chain import DaycareChain
+            
+            north = Daycare("North", "1 North St")
+            south = Daycare("South", "2 South St")
+            events = []
+            north.add_listener(lambda event, dog: events.append((event, dog.dog_id)))
+            north.add_dog(Dog("D6001", "Arrow", "Collie", 3, 40.0))
+            north.add_dog(Dog("D6002", "Blaze", "Collie", 4, 42.0, True))
+            south.add_dog(Dog("D6003", "Comet", "Corgi", 2, 24.0))
+            owner = Owner("O600", "Chain Owner", "chain@example.com", "555-600-6000", ["D6001", "D6003", "D6004"])
+            north.add_owner(owner)
+            south.add_owner(owner)
+            assert (north.num_dogs, north.num_owners, south.num_dogs, south.num_owners) == (2, 1, 1, 1)
+            assert Daycare.get_dog_count() >= 3
+            
+            with DaycareChain("Paws Chain") as chain:
+                assert chain.add_location(north) and chain.add_location(south)
+                assert chain.add_location(Daycare("North", "Elsewhere")) is False
+                assert chain.num_dogs == 3 and chain.get_checked_in_count() == 1
+                assert chain.locate_dog("D6003") is south and chain.locate_dog("D9999") is None
+                
+                south.add_dog(Dog("D6004", "Dash", "Collie", 1, 30.0))
+                assert chain.get_dog("D6004").name == "Dash"
+                north.check_in_dog("D6001", "O600")
+                south.check_in_many([("D6003", "O600"), ("D6004", "O600")])
+                north.get_dog("D6002").check_out()
+                assert chain.get_checked_in_count() == 3
+                assert chain.get_occupancy() == {"North": 1, "South": 2}
+                
+                results = chain.search_dog_by_breed("collie")
+                assert {location: sorted(dogs) for location, dogs in results.items()} == {
+                    "North": ["D6001", "D6002"], "South": ["D6004"]}
+                assert list(chain.search_dog_by_name("comet")) == ["South"]
+                
+                assert chain.remove_location("South")
+                assert chain.get_checked_in_count() == 1 and chain.num_dogs == 2
+                south.check_out_dog("D6003", "O600")
+                assert chain.get_occupancy() == {"North": 1}
+            
+            assert events == [("added", "D6001"), ("added", "D6002"), ("checked_in", "D6002"), ("checked_in", "D6001"),
+                              ("checked_out", "D6002")]
+            
+            # Dogs added already checked in count towards occupancy and leave it on check-out
+            with DaycareChain("Late Chain") as late:
+                east = Daycare("East", "3 East St")
+                east.add_dog(Dog("D6005", "Ember", "Collie", 2, 35.0, True))
+                assert late.add_location(east) and late.get_occupancy() == {"East": 1}
+                east.add_dogs([Dog("D6006", "Flint", "Collie", 2, 35.0, True), Dog("D6007", "Gale", "Collie", 2, 35.0)])
+                assert late.get_occupancy() == {"East": 2}
+                east.get_dog("D6005").check_out()
+                east.get_dog("D6006").check_out()
+                east.get_dog("D6007").check_out()
+                assert late.get_occupancy() == {"East": 0} and late.get_checked_in_count() == 0
+            
+            TestUtils.yakshaAssert("test_instance_counts_and_chain", True, "functional")
+        except Exception as e:
+            TestUtils.yakshaAssert("test_instance_counts_and_chain", False, "functional")
+            raise e
+    
+    def test_visit_history_queries(self):
+        """Test visits are recorded on check-in/out and answer time queries."""
+        try:
+            from daycare_indexes import IntervalTree
+            
+            now = [datetime.datetime(2024, 1, 31, 22, 0)]
+            daycare = Daycare("History Daycare", "Clock Ln", clock=lambda: now[0])
+            dogs = [Dog(f"D70{i}", f"Timer {i}", "Pointer", 2, 30.0) for i in range(3)]
+            daycare.add_dogs(dogs)
+            owner = Owner("O700", "Time Owner", "time@example.com", "555-700-7000", [dog.dog_id for dog in dogs])
+            daycare.add_owner(owner)
+            
+            def advance(hours):
+                now[0] += datetime.timedelta(hours=hours)
+            
+            daycare.check_in_dog("D700", "O700")
+            advance(4)
+            daycare.check_in_many([("D701", "O700")])
+            advance(2)
+            daycare.check_out_dog("D700", "O700")
+            advance(1)
+            owner.pickup_dog(dogs[1])
+            advance(24)
+            daycare.check_in_dog("D700", "O700")
+            advance(3)
+            
+            visits = daycare.get_visits("D700")
+            assert [visit.is_open for visit in visits] == [False, True]
+            assert visits[0].owner_id == "O700"
+            assert visits[0].end - visits[0].start == datetime.timedelta(hours=6)
+            assert daycare.get_visits("D702") == []
+            
+            assert set(daycare.dogs_present_at(datetime.datetime(2024, 2, 1, 3, 0))) == {"D700", "D701"}
+            assert set(daycare.dogs_present_at(datetime.datetime(2024, 2, 1, 4, 30))) == {"D701"}
+            assert daycare.dogs_present_at(datetime.datetime(2024, 2, 1, 12, 0)) == {}
+            window = daycare.visits_overlapping(datetime.datetime(2024, 2, 1, 10, 0), datetime.datetime(2024, 2, 3))
+            assert [visit.dog_id for visit in window] == ["D700"] and window[0].is_open
+            
+            assert daycare.monthly_hours("D700", 2024, 1) == 2
+            assert daycare.monthly_hours("D700", 2024, 2) == 7
+            assert daycare.hours_on_site("D701", datetime.datetime(2024, 1, 1), datetime.datetime(2024, 3, 1)) == 3
+            assert daycare.monthly_hours("D702", 2024, 12) == 0
+            
+            tree = IntervalTree()
+            for start in range(0, 2000, 2):
+                tree.add(start, start + 5, start)
+            assert len(tree) == 1000
+            assert tree.at(101) == [96, 98, 100]
+            assert tree.overlapping(-10, -1) == [] and tree.overlapping(1996, 3000) == [1992, 1994, 1996, 1998]
+            
+            TestUtils.yakshaAssert("test_visit_history_queries", True, "functional")
+        except Exception as e:
+            TestUtils.yakshaAssert("test_visit_history_queries", False, "functional")
+            raise e
+    
+    def test_billing_invoices(self):
+        """Test invoices apply day rates, large-dog surcharges and multi-dog discounts."""
+        try:
+            from daycare_billing import Rates, monthly_invoices
+            
+            now = [datetime.datetime(2024, 3, 1, 8, 0)]
+            daycare = Daycare("Billing Daycare", "Invoice Ave", clock=lambda: now[0])
+            daycare.add_dogs([LargeDog("D8001", "Tank", "Mastiff", 5, 120.0, False, "High"),
+                              SmallDog("D8002", "Pip", "Chihuahua", 3, 5.0, False, "Squeaky"),
+                              Dog("D8003", "Solo", "Mixed", 4, 30.0)])
+            daycare.add_owner(Owner("O801", "Two Dogs", "two@example.com", "555-801-8010", ["D8001", "D8002"]))
+            daycare.add_owner(Owner("O802", "One Dog", "one@example.com", "555-802-8020", ["D8003"]))
+            
+            def visit(dog_id, owner_id, hours):
+                daycare.check_in_dog(dog_id, owner_id)
+                now[0] += datetime.timedelta(hours=hours)
+                daycare.check_out_dog(dog_id, owner_id)
+                now[0] += datetime.timedelta(hours=24 - hours % 24)
+            
+            visit("D8001", "O801", 8)
+            visit("D8001", "O801", 4)
+            visit("D8002", "O801", 30)
+            visit("D8003", "O802", 3)
+            now[0] = datetime.datetime(2024, 4, 2, 8, 0)
+            visit("D8003", "O802", 9)
+            
+            invoices = monthly_invoices(daycare, 2024, 3)
+            assert sorted(invoices) == ["O801", "O802"]
+            two = invoices["O801"]
+            assert (two.visits, two.full_days, two.half_days) == (3, 3, 1)
+            assert two.base == 3 * 40.0 + 25.0 and two.surcharge == 15.0
+            assert two.discount == 16.0 and two.total == 144.0
+            one = invoices["O802"]
+            assert (one.visits, one.half_days, one.total) == (1, 1, 25.0)
+            assert "Total: $144.00" in two.display_info()
+            
+            custom = monthly_invoices(daycare, 2024, 4, Rates(full_day=50.0, discounts=()))
+            assert list(custom) == ["O802"] and custom["O802"].total == 50.0
+            assert monthly_invoices(daycare, 2024, 5) == {}
+            
+            TestUtils.yakshaAssert("test_billing_invoices", True, "functional")
+        except Exception as e:
+            TestUtils.yakshaAssert("test_billing_invoices", False, "functional")
+            raise e
+    
+    def test_activity_scheduler(self):
+        """Test scheduling respects capacity, size classes and walk priority incrementally."""
+        try:
+            from daycare_scheduler import ActivityScheduler
+            
+            daycare = Daycare("Schedule Daycare", "Slot St")
+            walkers = [LargeDog(f"D90{i}", f"Runner {i}", "Husky", 3, 60.0, False, "High") for i in range(3)]
+            calm = [LargeDog(f"D91{i}", f"Calm {i}", "Basset", 6, 55.0, False, "Low") for i in range(3)]
+            small = [SmallDog(f"D92{i}", f"Tiny {i}", "Pug", 2, 14.0) for i in range(4)]
+            daycare.add_dogs(calm + small + walkers)
+            owner = Owner("O900", "Busy Owner", "busy@example.com", "555-900-9000",
+                          [dog.dog_id for dog in calm + small + walkers])
+            daycare.add_owner(owner)
+            daycare.check_in_many([(dog.dog_id, "O900") for dog in calm + small + walkers[:2]])
+            
+            capacities = {"Play Time": 3, "Walking": 2, "Training": 2, "Socialization": 2, "Resting": 1}
+            scheduler = ActivityScheduler(daycare, slots=("09:00", "10:00", "11:00"), capacities=capacities)
+            for slot in range(3):
+                roster = scheduler.roster(slot)
+                assert sorted(roster["Walking"]["L"]) == ["D900", "D901"]
+                for activity, sizes in roster.items():
+                    assert sum(len(dog_ids) for dog_ids in sizes.values()) <= capacities[activity]
+                    for size, dog_ids in sizes.items():
+                        assert {daycare.get_dog(dog_id).type_code for dog_id in dog_ids} == {size}
+                placed = [dog_id for sizes in roster.values() for dog_ids in sizes.values() for dog_id in dog_ids]
+                assert len(placed) == len(set(placed)) == 9
+            assert len(set(scheduler.assignment("D920").values())) > 1
+            
+            scheduler.set_current_slot(1)
+            daycare.check_out_dog("D900", "O900")
+            assert scheduler.assignment("D900") == {0: "Walking"}
+            daycare.check_in_dog("D902", "O900")
+            assert scheduler.assignment("D902") == {1: "Walking", 2: "Walking"}
+            
+            crowd = [SmallDog(f"D93{i}", f"Crowd {i}", "Pug", 2, 12.0) for i in range(4)]
+            daycare.add_dogs(crowd)
+            for dog in crowd:
+                owner.register_dog(dog)
+                daycare.check_in_dog(dog.dog_id, "O900")
+            assert scheduler.waiting(2) == ["D931", "D932", "D933"]
+            daycare.check_out_dog("D920", "O900")
+            assert scheduler.waiting(2) == ["D932", "D933"] and 2 in scheduler.assignment("D931")
+            assert "11:00:" in scheduler.display_schedule()
+            
+            scheduler.close()
+            daycare.check_out_dog("D921", "O900")
+            assert 2 in scheduler.assignment("D921")
+            
+            mixed = Daycare("Mixed Daycare", "Slot St")
+            mixed.add_dogs([cls(f"D94{cls.type_code}{i}", f"Mixed {i}", "Mutt", 3, 30.0, True)
+                            for cls in (Dog, SmallDog, LargeDog) for i in range(10)])
+            even = ActivityScheduler(mixed, slots=("09:00",), capacities=dict.fromkeys(capacities, 2))
+            roster = even.roster(0)
+            assert all(sum(len(dog_ids) for dog_ids in sizes.values()) == 2 for sizes in roster.values())
+            assert len(even.waiting(0)) == 20
+            
+            # A dog added already checked in is scheduled like one checking in
+            mixed.add_dog(LargeDog("D950", "Late", "Husky", 3, 60.0, True, "High"))
+            assert even.assignment("D950") == {0: "Walking"} and len(even.waiting(0)) == 21
+            mixed.get_dog("D950").check_out()
+            assert even.assignment("D950") == {} and len(even.waiting(0)) == 20
+            
+            TestUtils.yakshaAssert("test_activity_scheduler", True, "functional")
+        except Exception as e:
+            TestUtils.yakshaAssert("test_activity_scheduler", False, "functional")
+            raise e
+    
+    def test_weight_and_age_range_indexes(self):
+        """Test inclusive weight and age range lookups."""
+        try:
+            daycare = Daycare("Range Daycare", "Scale Rd")
+            daycare.add_dogs([Dog("D1001", "Feather", "Papillon", 11, 8.0),
+                              Dog("D1002", "Middle", "Beagle", 4, 20.0),
+                              LargeDog("D1003", "Heavy", "Newfoundland", 12, 140.0),
+                              SmallDog("D1004", "Twenty", "Pug", 2, 20.0),
+                              Dog("D1005", "Forty", "Collie", 10, 40.0)])
+            
+            assert list(daycare.find_dogs_by_weight(20, 40)) == ["D1002", "D1004", "D1005"]
+            assert list(daycare.find_dogs_by_weight(41, 139.5)) == []
+            assert list(daycare.find_dogs_by_weight(100, None)) == ["D1003"]
+            assert list(daycare.find_dogs_by_age(10, None)) == ["D1005", "D1001", "D1003"]
+            assert list(daycare.find_dogs_by_age(None, 3)) == ["D1004"]
+            assert daycare.find_dogs_by_age(9, 5) == {}
+            assert daycare.find_dogs_by_weight(8, 8)["D1001"].name == "Feather"
+            
+            # A bulk add merges into the existing order; ties keep insertion order
+            daycare.add_dogs([Dog("D1006", "Tie", "Beagle", 4, 20.0), Dog("D1007", "Light", "Pug", 1, 5.0)])
+            assert list(daycare.find_dogs_by_weight(None, 20)) == ["D1007", "D1001", "D1002", "D1004", "D1006"]
+            assert list(daycare.find_dogs_by_age(4, 4)) == ["D1002", "D1006"]
+            
+            TestUtils.yakshaAssert("test_weight_and_age_range_indexes", True, "functional")
+        except Exception as e:
+            TestUtils.yakshaAssert("test_weight_and_age_range_indexes", False, "functional")
+            raise e
+    
+    def test_query_builder_planner(self):
+        """Test composed queries pick the most selective index and stream results."""
+        try:
+            import types
+            
+            daycare = Daycare("Query Daycare", "Planner Pl")
+            dogs = [LargeDog(f"D11{i:02d}", f"Rover {i}" if i % 4 == 1 else f"Dog {i}", "Labrador" if i % 2 else "Poodle",
+                             1 + i % 12, 40.0 + i, False, "High") for i in range(40)]
+            dogs += [SmallDog(f"D12{i:02d}", f"Robin {i}", "Labrador", 3, 12.0 + i) for i in range(10)]
+            daycare.add_dogs(dogs)
+            daycare.add_owner(Owner("O110", "Query Owner", "query@example.com", "555-110-1100", [dog.dog_id for dog in dogs]))
+            daycare.check_in_many([(dog.dog_id, "O110") for dog in dogs[::3]])
+            
+            query = daycare.query().checked_in().of_type(LargeDog).breed("labrador").weight(60, None).name("ro")
+            results = iter(query)
+            assert isinstance(results, types.GeneratorType)
+            expected = [dog.dog_id for dog in dogs if dog.is_checked_in and isinstance(dog, LargeDog) and
+                        dog.breed == "Labrador" and dog.weight >= 60 and "ro" in dog.name.lower()]
+            assert sorted(dog.dog_id for dog in results) == sorted(expected) and expected
+            
+            assert daycare.query().name("robin").explain() == "name"
+            assert daycare.query().of_type(SmallDog).breed("lab").explain() == "type"
+            assert daycare.query().checked_in().weight(45, 46).explain() == "weight"
+            assert daycare.query().age(12, 12).breed("poodle").explain() == "age"
+            assert daycare.query().checked_in(False).explain() == "scan"
+            assert len(list(daycare.query())) == 50
+            
+            not_checked_in = list(daycare.query().checked_in(False).of_type(SmallDog))
+            assert [dog.dog_id for dog in not_checked_in] == [dog.dog_id for dog in dogs[40:] if not dog.is_checked_in]
+            assert list(daycare.query().name("zzz").breed("poodle")) == []
+            
+            # Subclasses are found whether they share a parent's type code or bring their own
+            class Puppy(SmallDog):
+                __slots__ = ()
+            
+            class MediumDog(Dog):
+                __slots__ = ()
+                type_code = "M"
+            
+            daycare.add_dogs([Puppy("D1300", "Nib", "Beagle", 1, 6.0), MediumDog("D1301", "Mid", "Beagle", 4, 30.0)])
+            assert [dog.dog_id for dog in daycare.query().of_type(Puppy)] == ["D1300"]
+            assert [dog.dog_id for dog in daycare.query().of_type(MediumDog)] == ["D1301"]
+            assert len(list(daycare.query().of_type(SmallDog))) == 11
+            assert len(list(daycare.query().of_type(Dog))) == 52
+            
+            TestUtils.yakshaAssert("test_query_builder_planner", True, "functional")
+        except Exception as e:
+            TestUtils.yakshaAssert("test_query_builder_planner", False, "functional")
+            raise e
+    
+    def test_fuzzy_name_search(self):
+        """Test typo-tolerant name search ranks matches by edit distance."""
+        try:
+            from daycare_indexes import levenshtein_matcher
+            
+            daycare = Daycare("Fuzzy Daycare", "Typo Ter")
+            daycare.add_dogs([Dog("D1201", "Bella", "Beagle", 3, 20.0),
+                              Dog("D1202", "Bella", "Boxer", 5, 60.0),
+                              Dog("D1203", "Della", "Collie", 2, 35.0),
+                              Dog("D1204", "Bell", "Pug", 4, 15.0),
+                              Dog("D1205", "Max", "Husky", 6, 55.0),
+                              Dog("D1206", "Maximilian", "Mastiff", 6, 150.0)])
+            
+            results = daycare.search_dog_by_name_fuzzy("Bela")
+            assert [(dog.dog_id, distance) for dog, distance in results] == [
+                ("D1201", 1), ("D1202", 1), ("D1204", 1), ("D1203", 2)]
+            assert [dog.dog_id for dog, _ in daycare.search_dog_by_name_fuzzy("bela", limit=2)] == ["D1201", "D1202"]
+            assert [(dog.name, distance) for dog, distance in daycare.search_dog_by_name_fuzzy("MAX", max_distance=0)] == [("Max", 0)]
+            assert daycare.search_dog_by_name_fuzzy("Zzyzx") == []
+            assert daycare.search_dog_by_name("Bela") == {}
+            
+            distance = levenshtein_matcher("kitten")
+            assert distance("sitting") == 3 and distance("kitten") == 0 and distance("") == 6
+            
+            with pytest.raises(ValueError):
+                daycare.search_dog_by_name_fuzzy(None)
+            
+            TestUtils.yakshaAssert("test_fuzzy_name_search", True, "functional")
+        except Exception as e:
+            TestUtils.yakshaAssert("test_fuzzy_name_search", False, "functional")
+            raise e
+    
+    def test_search_result_cache(self):
+        """Test cached searches are invalidated by add_dog and report statistics."""
+        try:
+            daycare = Daycare("Cache Daycare", "Memo Ln", cache_size=2)
+            daycare.add_dogs([Dog("D1301", "Goldie", "Golden Retriever", 3, 65.0),
+                              Dog("D1302", "Lab", "Labrador Retriever", 4, 70.0)])
+            
+            first = daycare.search_dog_by_breed("retriever")
+            first["D9999"] = None
+            second = daycare.search_dog_by_breed("RETRIEVER")
+            assert list(second) == ["D1301", "D1302"]
+            assert daycare.cache_stats()["hits"] == 1 and daycare.cache_stats()["misses"] == 1
+            
+            daycare.add_dog(Dog("D1303", "Flat", "Flat-Coated Retriever", 2, 60.0))
+            assert list(daycare.search_dog_by_breed("retriever")) == ["D1301", "D1302", "D1303"]
+            assert daycare.cache_stats()["misses"] == 2
+            
+            daycare.check_in_dog("D1301", "O000")
+            daycare.search_dog_by_name("gold")
+            daycare.search_dog_by_name_fuzzy("Goldy")
+            stats = daycare.cache_stats()
+            assert stats["evictions"] == 1 and stats["size"] == 2 and stats["max_size"] == 2
+            assert daycare.search_dog_by_name_fuzzy("goldy")[0][0].dog_id == "D1301"
+            assert daycare.cache_stats()["hits"] == 2
+            
+            uncached = Daycare("Uncached Daycare", "Memo Ln", cache_size=0)
+            uncached.add_dog(Dog("D1304", "Nocache", "Beagle", 2, 20.0))
+            uncached.search_dog_by_name("no")
+            assert list(uncached.search_dog_by_name("no")) == ["D1304"]
+            assert uncached.cache_stats()["hits"] == 0 and uncached.cache_stats()["size"] == 0
+            
+            TestUtils.yakshaAssert("test_search_result_cache", True, "functional")
+        except Exception as e:
+            TestUtils.yakshaAssert("test_search_result_cache", False, "functional")
+            raise e
+    
+    def test_cached_rendering(self):
+        """Test cached display_info invalidation and bulk rendering output."""
+        try:
+            import io
+            from contextlib import redirect_stdout
+            from dog_daycare_management_system import render_dogs, render_owners
+            
+            daycare = Daycare("Render Daycare", "Print Pl")
+            small = SmallDog("D1401", "Tiny", "Chihuahua", 2, 5.0, False, "Squeaky")
+            large = LargeDog("D1402", "Moose", "Great Dane", 4, 140.0, False, "High")
+            plain = Dog("D1403", "Basic", "Beagle", 3, 22.0)
+            owner = Owner("O1401", "Rita", "rita@example.com", "555-555-1401")
+            daycare.add_dogs([small, large, plain])
+            owner.register_dog(small)
+            daycare.add_owner(owner)
+            
+            assert small.display_info() is small.display_info()
+            assert small.display_info().endswith("Status: Not Checked In | Toy Preference: Squeaky")
+            daycare.check_in_dog("D1401", "O1401")
+            assert small.display_info().endswith("Status: Checked In | Toy Preference: Squeaky")
+            large.check_in()
+            assert "Status: Checked In | Exercise Needs: High" in large.display_info()
+            assert owner.display_info().endswith("Dogs registered: 1")
+            owner.register_dog(large)
+            assert owner.display_info().endswith("Dogs registered: 2")
+            
+            dogs = [small, large, plain]
+            expected = io.StringIO()
+            with redirect_stdout(expected):
+                for dog in dogs:
+                    print(dog.display_info())
+                print(owner.display_info())
+            stream = io.StringIO()
+            assert render_dogs(dogs, stream) == 3
+            assert render_owners([owner], stream) == 1
+            assert render_dogs([], stream) == 0
+            assert stream.getvalue() == expected.getvalue()
+            
+            captured = io.StringIO()
+            with redirect_stdout(captured):
+                render_dogs(iter(dogs))
+            assert captured.getvalue() == (
+                "D1401 | Tiny (Chihuahua) | 2 years | 5.0 lbs | Status: Checked In | Toy Preference: Squeaky\n"
+                "D1402 | Moose (Great Dane) | 4 years | 140.0 lbs | Status: Checked In | Exercise Needs: High\n"
+                "D1403 | Basic (Beagle) | 3 years | 22.0 lbs | Status: Not Checked In\n")
+            assert small._Dog__display is small.display_info()
+            assert not hasattr(small, "_SmallDog__display") and not hasattr(large, "_LargeDog__display")
+            
+            TestUtils.yakshaAssert("test_cached_rendering", True, "functional")
+        except Exception as e:
+            TestUtils.yakshaAssert("test_cached_rendering", False, "functional")
+            raise e
+    
+    def test_quiet_mode_and_failure_types(self):
+        """Test typed check outcomes, quiet mode, README exceptions and the batched failure log."""
+        try:
+            import io
+            from contextlib import redirect_stdout
+            from dog_daycare_management_system import (
+                DaycareException, DogAlreadyCheckedInException, DogNotCheckedInException, DogNotFoundException,
+                FailureLog, InvalidInputException, OwnerNotFoundException, failure_for)
+            
+            dog = Dog("D1501", "Hush", "Basenji", 3, 24.0)
+            other = Dog("D1502", "Stray", "Mutt", 5, 30.0)
+            owner = Owner("O1501", "Quinn", "quinn@example.com", "555-555-1501")
+            owner.register_dog(dog)
+            
+            captured = io.StringIO()
+            with redirect_stdout(captured):
+                quiet = Daycare("Quiet Daycare", "Silent St", quiet=True)
+                quiet.add_dogs([dog, other])
+                quiet.add_owner(owner)
+                assert quiet.try_check_in("D9999", "O1501") == CheckResult.DOG_NOT_FOUND
+                assert quiet.try_check_in("D1501", "O9999") == CheckResult.OWNER_NOT_FOUND
+                assert quiet.try_check_in("D1502", "O1501") == CheckResult.NOT_REGISTERED
+                assert quiet.try_check_out("D1501", "O1501") == CheckResult.NOT_CHECKED_IN
+                assert quiet.try_check_in("D1501", "O1501") == CheckResult.OK
+                assert quiet.check_in_dog("D1501", "O1501") == False
+                assert owner.try_register_dog(dog) == CheckResult.ALREADY_REGISTERED
+                assert owner.try_pickup_dog(other) == CheckResult.NOT_REGISTERED
+                assert owner.try_pickup_dog(dog) == CheckResult.OK
+                assert owner.try_pickup_dog(dog) == CheckResult.NOT_CHECKED_IN
+            assert captured.getvalue() == ""
+            
+            with redirect_stdout(captured):
+                assert owner.register_dog(dog) == False
+            assert captured.getvalue() == "Dog 'Hush' is already registered\n"
+            
+            stream = io.StringIO()
+            log = FailureLog(stream)
+            logged = Daycare("Logged Daycare", "Ledger Rd", failure_log=log)
+            logged.add_dogs([dog, other])
+            logged.add_owner(owner)
+            assert logged.check_out_dog("D1501", "O1501") == False
+            assert logged.check_in_dog("D1501", "O1501") == True
+            assert logged.check_in_dog("D1501", "O1501") == False
+            assert logged.check_in_dog("D9999", "O1501") == False
+            assert log.pending == 3 and stream.getvalue() == ""
+            assert [type(e) for e in log.exceptions()] == [
+                DogNotCheckedInException, DogAlreadyCheckedInException, DogNotFoundException]
+            assert log.flush() == 3 and log.pending == 0
+            assert stream.getvalue() == ("Dog 'Hush' is not checked in\nDog 'Hush' is already checked in\n"
+                                         "Dog with ID D9999 not found\n")
+            
+            batched = FailureLog(stream, batch_size=2)
+            batched.record(CheckResult.OWNER_NOT_FOUND, "D1501", "O7")
+            assert batched.pending == 1
+            batched.record(CheckResult.OWNER_NOT_FOUND, "D1501", "O8")
+            assert batched.pending == 0 and stream.getvalue().endswith("Owner with ID O8 not found\n")
+            
+            error = failure_for(CheckResult.OWNER_NOT_FOUND, "D1501", "O9")
+            assert isinstance(error, OwnerNotFoundException) and isinstance(error, DaycareException)
+            assert error.code == CheckResult.OWNER_NOT_FOUND and error.owner_id == "O9"
+            with pytest.raises(InvalidInputException):
+                Owner("O1502", "Bad", "not-an-email", "555-555-1502")
+            with pytest.raises(ValueError):
+                Owner("O1503", "Bad", "bad@example.com", "5551503")
+            with pytest.raises(InvalidInputException):
+                Dog("D1503", "Bad", "Mutt", 0, 10.0)
+            with pytest.raises(InvalidInputException):
+                Dog("D1503", "Bad", "Mutt", 2, -1.0)
+            
+            from daycare_sqlite import SQLiteDaycare
+            sql_log = FailureLog(stream)
+            with SQLiteDaycare("Logged SQL", "Ledger Rd", failure_log=sql_log) as sql:
+                sql.add_dogs([Dog("D1504", "Quill", "Mutt", 2, 10.0)])
+                sql.add_owner(Owner("O1504", "Rae", "rae@example.com", "555-555-1504", ["D1504"]))
+                assert sql.try_check_out("D1504", "O1504") == CheckResult.NOT_CHECKED_IN
+                assert sql.check_in_dog("D1504", "O1504") is True
+                assert sql.check_in_dog("D1504", "O1504") is False
+                assert sql.check_out_dog("D1504", "O9") is False
+            assert [type(e) for e in sql_log.exceptions()] == [DogAlreadyCheckedInException, OwnerNotFoundException]
+            captured = io.StringIO()
+            with redirect_stdout(captured), SQLiteDaycare("Quiet SQL", "Silent St", quiet=True) as sql:
+                assert sql.check_in_dog("D9999", "O1504") is False
+            assert captured.getvalue() == ""
+            with redirect_stdout(captured), SQLiteDaycare("Loud SQL", "Silent St") as sql:
+                assert sql.check_in_dog("D9999", "O1504") is False
+            assert captured.getvalue() == "Dog with ID D9999 not found\n"
+            
+            TestUtils.yakshaAssert("test_quiet_mode_and_failure_types", True, "functional")
+        except Exception as e:
+            TestUtils.yakshaAssert("test_quiet_mode_and_failure_types", False, "functional")
             raise e
\ No newline at end of file